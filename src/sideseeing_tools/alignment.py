@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import constants, frames, sensor_types, utils
+
+
+METHODS = ['linear', 'nearest', 'previous']
+
+
+def timeline(instance, target='video') -> np.ndarray:
+    '''
+    Builds a target timeline, in seconds since the media start.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        target: 'video' for one point per video frame (see frames.video_timing), a number
+            for a fixed rate in Hz over the media duration, or explicit times (seconds since
+            the media start, or datetimes).
+    '''
+    if isinstance(target, str):
+        if target != 'video':
+            raise ValueError(f"Unknown timeline '{target}'. Use 'video', a rate in Hz or explicit times.")
+        fps, frame_count = frames.video_timing(instance)
+        return np.arange(frame_count) / fps
+
+    if np.isscalar(target):
+        return np.arange(0, instance.media_total_time, 1 / float(target))
+
+    times = np.asarray(target)
+    if np.issubdtype(times.dtype, np.number):
+        return times.astype('float64')
+    return (pd.to_datetime(pd.Series(times)) - pd.Timestamp(instance.media_start_time)).dt.total_seconds().to_numpy()
+
+
+def select_streams(instance, streams=None, attributes: list = None, strict: bool = True) -> list:
+    '''
+    Resolves stream selectors into (label, DataFrame, columns) tuples. A selector is a modality
+    ('sensors3', 'geolocation_points', ...), a raw sensor name or a canonical sensor type.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        streams (str or list, optional): The selectors. Defaults to every stream.
+        attributes (list, optional): The modalities searched. Defaults to the sensors, the GPS track and the consumption.
+        strict (bool): If True, a selector that matches no stream raises a KeyError.
+    '''
+    attributes = constants.SENSOR_ATTRIBUTES + constants.TABLE_ATTRIBUTES if attributes is None else attributes
+
+    available = []
+    for attr in attributes:
+        if attr in constants.SENSOR_ATTRIBUTES:
+            for name, df in (getattr(instance, attr, None) or {}).items():
+                available.append((attr, name, df))
+        else:
+            df = getattr(instance, attr, None)
+            if df is not None and not df.empty:
+                available.append((attr, attr, df))
+
+    if streams is None:
+        selected = available
+    else:
+        selected = []
+        for selector in ([streams] if isinstance(streams, str) else streams):
+            matches = [
+                s for s in available
+                if selector in (s[0], s[1]) or (s[0] in constants.SENSOR_ATTRIBUTES and sensor_types.sensor_type(s[1]) == selector)
+            ]
+            if not matches and strict:
+                raise KeyError(f"No stream matches '{selector}' in {instance.name}.")
+            selected.extend(m for m in matches if m not in selected)
+
+    return [(label, df, constants.CHANNELS[attr]) for attr, label, df in selected]
+
+
+def bracket(source_times, times) -> tuple:
+    '''
+    Locates `times` among the sorted `source_times` with one binary search.
+
+    Returns:
+        tuple: `left` and `right`, the positions of the samples around each time (outside the
+        stream both are its first or last sample), and `weight`, the linear interpolation weight
+        of the right sample, in [0, 1].
+    '''
+    n = len(source_times)
+    right = np.searchsorted(source_times, times, side='left')
+    left = np.clip(right - 1, 0, n - 1)
+    right = np.clip(right, 0, n - 1)
+
+    span = source_times[right] - source_times[left]
+    weight = np.where(span > 0, (times - source_times[left]) / np.where(span > 0, span, 1), 0.0)
+    return left, right, np.clip(weight, 0, 1)
+
+
+def interpolate(times, source_times, values, method: str = 'linear', tolerance: float = None) -> np.ndarray:
+    '''
+    Maps a (samples, columns) array sampled at the sorted `source_times` onto `times`.
+
+    Args:
+        method (str): 'linear' (NaN outside the stream), 'nearest' or 'previous' (the last sample at
+            or before each time, NaN before the first one).
+        tolerance (float, optional): Maximum distance, in seconds, to the nearest sample used.
+
+    Returns:
+        np.ndarray: A (len(times), columns) array with NaN where no sample is close enough.
+    '''
+    out = np.full((len(times), values.shape[1]), np.nan)
+    if len(source_times) == 0:
+        return out
+
+    if method == 'previous':
+        index = np.searchsorted(source_times, times, side='right') - 1
+        valid = index >= 0
+        index = np.maximum(index, 0)
+        distance = times - source_times[index]
+        out[:] = values[index]
+    elif method == 'nearest':
+        left, right, _ = bracket(source_times, times)
+        use_right = np.abs(source_times[right] - times) < np.abs(times - source_times[left])
+        index = np.where(use_right, right, left)
+        distance = np.abs(source_times[index] - times)
+        valid = np.ones(len(times), dtype=bool)
+        out[:] = values[index]
+    elif method == 'linear':
+        left, right, weight = bracket(source_times, times)
+        weight = weight[:, None]
+        out[:] = values[left] * (1 - weight) + values[right] * weight
+        distance = np.minimum(np.abs(times - source_times[left]), np.abs(source_times[right] - times))
+        valid = (times >= source_times[0]) & (times <= source_times[-1])
+    else:
+        raise ValueError(f"Unknown method '{method}'. Use one of {METHODS}.")
+
+    if tolerance is not None:
+        valid &= distance <= tolerance
+    out[~valid] = np.nan
+    return out
+
+
+def align(instance, streams=None, target='video', method='linear', tolerance=None, as_array=False):
+    '''
+    Aligns several streams of an instance onto a common timeline.
+
+    Every stream is put on the media clock (see utils.seconds_since) and mapped onto the
+    target times with one vectorized pass per stream: linear interpolation, nearest sample
+    or the last sample at or before each time (as-of). Times that fall outside a stream,
+    or farther than `tolerance` seconds from its samples, become NaN.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        streams (str or list, optional): Modalities, raw sensor names or canonical sensor types. Defaults to every stream.
+        target: The timeline; see `timeline`.
+        method (str or dict): 'linear', 'nearest' or 'previous', or a dict mapping stream labels (sensor names, 'geolocation_points', 'consumption') to methods, with the key 'default' for the rest.
+        tolerance (float, optional): Maximum distance, in seconds, to the nearest sample used.
+        as_array (bool): If True, returns `(times, values, columns)` with `values` a contiguous float64 array.
+
+    Returns:
+        pd.DataFrame: A `time` column (seconds since the media start) and one column per stream axis, named `<stream>:<column>`.
+    '''
+    times = timeline(instance, target)
+    selected = select_streams(instance, streams)
+
+    columns = [f'{label}:{col}' for label, _, cols in selected for col in cols]
+    values = np.empty((len(times), len(columns)), dtype='float64')
+
+    position = 0
+    for label, df, cols in selected:
+        stream_method = method.get(label, method.get('default', 'linear')) if isinstance(method, dict) else method
+
+        source_times = utils.seconds_since(df, instance.media_start_time)
+        source_values = df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+        if len(source_times) > 1 and np.any(np.diff(source_times) < 0):
+            order = np.argsort(source_times, kind='stable')
+            source_times, source_values = source_times[order], source_values[order]
+
+        values[:, position:position + len(cols)] = interpolate(times, source_times, source_values, stream_method, tolerance)
+        position += len(cols)
+
+    if as_array:
+        return times, values, columns
+
+    df = pd.DataFrame(values, columns=columns, copy=False)
+    df.insert(0, 'time', times)
+    return df
@@ -139,3 +139,32 @@ WIFI_SNIPPET_HEADER = [
   'frequency',
   'standard',
 ]
+
+NUMERIC_COLUMNS = {
+  'sensors1': ['Time (s)', 'x'],
+  'sensors3': ['Time (s)', 'x', 'y', 'z'],
+  'sensors6': ['Time (s)', 'x', 'y', 'z', 'dx', 'dy', 'dz'],
+  'geolocation_points': ['Time (s)', 'gps_interval', 'accuracy', 'latitude', 'longitude'],
+  'consumption': ['Time (s)', 'battery_microamperes'],
+}
+
+# The value columns of every modality in NUMERIC_COLUMNS (all but the time).
+CHANNELS = {attr: [c for c in columns if c != 'Time (s)'] for attr, columns in NUMERIC_COLUMNS.items()}
+
+SENSOR_ATTRIBUTES = ['sensors1', 'sensors3', 'sensors6']
+
+TABLE_ATTRIBUTES = ['geolocation_points', 'consumption']
+
+RADIO_ATTRIBUTES = ['wifi_networks', 'cell_networks']
+
+MODALITY_FILE_TYPES = {
+  'sensors1': 'sensors1',
+  'sensors3': 'sensors3',
+  'sensors6': 'sensors6',
+  'geolocation_points': 'gps',
+  'consumption': 'consumption',
+  'wifi_networks': 'wifi',
+  'cell_networks': 'cell',
+  'label': 'label',
+  'metadata': 'metadata',
+}
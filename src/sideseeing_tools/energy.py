@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import shared, trajectory, utils
+
+
+# The consumption files only have the current; energies use this battery voltage.
+NOMINAL_VOLTAGE_V = 3.85
+
+SEGMENT_M = 100.0
+
+ENERGY_COLUMNS = [
+    'device', 'duration', 'charge_mah', 'energy_wh', 'mean_current_ma', 'distance_km', 'mah_per_km', 'wh_per_km',
+]
+
+SEGMENT_COLUMNS = [
+    'instance', 'segment', 'start_distance', 'end_distance', 'start_time', 'end_time', 'duration',
+    'charge_mah', 'energy_wh', 'mean_current_ma',
+]
+
+
+class ChargeIntegral:
+    '''
+    The cumulative charge drawn from the battery over an instance, for window lookups without
+    re-scanning the consumption readings.
+
+    The current is linearly interpolated between readings, so the cumulative charge is the
+    trapezoidal integral, computed once; the charge between any two times is the difference of
+    two cumulative values, each found with a binary search (O(log n) in the number of readings). Times are
+    clipped to the readings, so windows that extend past them only count the covered part.
+
+    Discharge is counted as positive: when the median reading is negative, as most devices
+    report discharge, the readings are negated.
+
+    Args:
+        consumption (pd.DataFrame): The consumption DataFrame of an instance.
+        origin (datetime): Times are seconds since `origin`, usually the media start.
+        voltage (float): Battery voltage used to convert charge to energy.
+
+    Example:
+        integral = instance.charge_integral()
+        integral.charge(10, 40)                    # mAh between 10 s and 40 s
+        integral.energy([0, 10, 20], [10, 20, 30])   # Wh per window
+    '''
+    def __init__(self, consumption: pd.DataFrame, origin, voltage: float = NOMINAL_VOLTAGE_V):
+        self.voltage = voltage
+        self.times = utils.seconds_since(consumption, origin)
+        current = np.empty(0) if consumption is None or consumption.empty else \
+            pd.to_numeric(consumption['battery_microamperes'], errors='coerce').to_numpy(dtype='float64') / 1000
+
+        keep = ~(np.isnan(self.times) | np.isnan(current))
+        order = np.argsort(self.times[keep], kind='stable')
+        self.times = self.times[keep][order]
+        current = current[keep][order]
+        if len(current) and np.median(current) < 0:
+            current = -current
+        self.current = current
+
+        steps = np.diff(self.times) * (current[1:] + current[:-1]) / 2 / 3600
+        self.cumulative = np.concatenate([[0.0], np.cumsum(steps)]) if len(current) else np.empty(0)
+
+    def cumulative_charge(self, times) -> np.ndarray:
+        '''
+        Returns the charge in mAh drawn from the first reading up to `times` (seconds since the origin).
+        '''
+        times = np.asarray(times, dtype='float64')
+        if len(self.times) < 2:
+            return np.zeros_like(times)
+
+        times = np.clip(times, self.times[0], self.times[-1])
+        right = np.clip(np.searchsorted(self.times, times, side='right'), 1, len(self.times) - 1)
+        left = right - 1
+        elapsed = times - self.times[left]
+        span = self.times[right] - self.times[left]
+        slope = np.where(span > 0, (self.current[right] - self.current[left]) / np.where(span > 0, span, 1), 0.0)
+        current = self.current[left] + slope * elapsed
+        return self.cumulative[left] + elapsed * (self.current[left] + current) / 2 / 3600
+
+    def charge(self, start, stop):
+        '''
+        Returns the charge in mAh drawn between `start` and `stop` (seconds since the origin, scalars or arrays).
+        '''
+        return self.cumulative_charge(stop) - self.cumulative_charge(start)
+
+    def energy(self, start, stop):
+        '''
+        Returns the energy in Wh drawn between `start` and `stop`, at the nominal voltage.
+        '''
+        return self.charge(start, stop) * self.voltage / 1000
+
+    def mean_current(self, start, stop):
+        '''
+        Returns the mean current in mA between `start` and `stop`.
+        '''
+        start, stop = np.asarray(start, dtype='float64'), np.asarray(stop, dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(stop > start, self.charge(start, stop) * 3600 / (stop - start), np.nan)
+
+    @property
+    def duration(self) -> float:
+        '''
+        Seconds between the first and the last reading.
+        '''
+        return float(self.times[-1] - self.times[0]) if len(self.times) else 0.0
+
+    @property
+    def total_charge(self) -> float:
+        return float(self.cumulative[-1]) if len(self.cumulative) else 0.0
+
+    def __str__(self):
+        return f'SSChargeIntegral[readings: {len(self.times)}, duration: {self.duration:.1f}, charge: {self.total_charge:.3f} mAh]'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _integral(instance, voltage):
+    if voltage == NOMINAL_VOLTAGE_V and hasattr(instance, 'charge_integral'):
+        return instance.charge_integral()
+    return ChargeIntegral(instance.consumption, instance.media_start_time, voltage)
+
+
+def _device(instance) -> str:
+    device = (getattr(instance, 'metadata', None) or {}).get('device', {})
+    return f"{device.get('manufacturer', '')} {device.get('model', '')}".strip().lower()
+
+
+def segment_energy(instance, segment_m: float = SEGMENT_M, voltage: float = NOMINAL_VOLTAGE_V) -> pd.DataFrame:
+    '''
+    Splits the GPS track of an instance every `segment_m` meters traveled (see
+    trajectory.segment_boundaries) and returns the charge and energy spent in each segment, from
+    the times at which the track crosses the segment boundaries (interpolated between fixes) and
+    `ChargeIntegral` lookups.
+
+    Returns:
+        pd.DataFrame: One row per segment with the columns of SEGMENT_COLUMNS (times in seconds since the media start).
+    '''
+    integral = _integral(instance, voltage)
+    track = trajectory.trajectory(instance.geolocation_points)
+    if len(track) < 2 or len(integral.times) < 2:
+        return pd.DataFrame(columns=SEGMENT_COLUMNS)
+
+    fix_times = utils.seconds_since(track, instance.media_start_time)
+    distance = track['cumulative_distance'].to_numpy()
+    boundaries = trajectory.segment_boundaries(track, segment_m)
+    # The first time each boundary distance is reached (the cumulative distance is non-decreasing).
+    crossing = np.clip(np.searchsorted(distance, boundaries, side='left'), 1, len(distance) - 1)
+    before = crossing - 1
+    span = distance[crossing] - distance[before]
+    weight = np.where(span > 0, (boundaries - distance[before]) / np.where(span > 0, span, 1), 0.0)
+    times = fix_times[before] + np.clip(weight, 0, 1) * (fix_times[crossing] - fix_times[before])
+    times[0], times[-1] = fix_times[0], fix_times[-1]
+
+    start, stop = times[:-1], times[1:]
+    charge = integral.charge(start, stop)
+    return pd.DataFrame({
+        'instance': instance.name,
+        'segment': np.arange(len(start)),
+        'start_distance': boundaries[:-1],
+        'end_distance': boundaries[1:],
+        'start_time': start,
+        'end_time': stop,
+        'duration': stop - start,
+        'charge_mah': charge,
+        'energy_wh': charge * voltage / 1000,
+        'mean_current_ma': integral.mean_current(start, stop),
+    }, columns=SEGMENT_COLUMNS)
+
+
+def dataset_segment_energy(dataset, segment_m: float = SEGMENT_M, voltage: float = NOMINAL_VOLTAGE_V,
+                           max_workers: int = 1, progress_callback=None) -> pd.DataFrame:
+    '''
+    Runs `segment_energy` on every instance of a dataset and returns one table. With `max_workers` > 1
+    instances are processed in worker processes through shared memory (see shared.map_shared).
+
+    Example:
+        segments = dataset_segment_energy(ds, segment_m=50)
+        segments.groupby('instance')['charge_mah'].describe()
+    '''
+    tables = shared.map_shared(
+        segment_energy, dataset.iterator, segment_m, voltage,
+        max_workers=max_workers, progress_callback=progress_callback,
+    )
+    tables = [t for t in tables if len(t)]
+    if not tables:
+        return pd.DataFrame(columns=SEGMENT_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
+
+
+def dataset_energy(dataset, voltage: float = NOMINAL_VOLTAGE_V) -> pd.DataFrame:
+    '''
+    Returns the charge and energy spent by every instance of a dataset over its consumption
+    readings, joined with the distance traveled (see trajectory.dataset_metrics).
+
+    Returns:
+        pd.DataFrame: One row per instance (indexed by name) with the columns of ENERGY_COLUMNS.
+
+    Example:
+        energy = dataset_energy(ds)
+        energy.sort_values('mah_per_km')
+    '''
+    distances = trajectory.dataset_metrics(dataset)['distance_km']
+
+    names, rows = [], []
+    for instance in dataset.iterator:
+        integral = _integral(instance, voltage)
+        names.append(instance.name)
+        rows.append({
+            'device': _device(instance),
+            'duration': integral.duration,
+            'charge_mah': integral.total_charge,
+            'energy_wh': integral.total_charge * voltage / 1000,
+            'distance_km': distances.get(instance.name, 0.0),
+        })
+
+    result = pd.DataFrame(rows, index=pd.Index(names, name='instance'), columns=ENERGY_COLUMNS)
+    return _rates(result)
+
+
+def device_energy(dataset, voltage: float = NOMINAL_VOLTAGE_V) -> pd.DataFrame:
+    '''
+    Sums `dataset_energy` per device (manufacturer and model).
+
+    Returns:
+        pd.DataFrame: One row per device with an `instances` count and the columns of ENERGY_COLUMNS.
+    '''
+    energy = dataset_energy(dataset, voltage)
+    result = energy.groupby('device').agg(
+        instances=('duration', 'size'),
+        duration=('duration', 'sum'),
+        charge_mah=('charge_mah', 'sum'),
+        energy_wh=('energy_wh', 'sum'),
+        distance_km=('distance_km', 'sum'),
+    )
+    return _rates(result)
+
+
+def _rates(table: pd.DataFrame) -> pd.DataFrame:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['mean_current_ma'] = np.where(table['duration'] > 0, table['charge_mah'] * 3600 / table['duration'], np.nan)
+        table['mah_per_km'] = np.where(table['distance_km'] > 0, table['charge_mah'] / table['distance_km'], np.nan)
+        table['wh_per_km'] = np.where(table['distance_km'] > 0, table['energy_wh'] / table['distance_km'], np.nan)
+    return table
@@ -5,22 +5,41 @@ from typing import List, Dict, Optional
 import argparse
 import importlib.resources
 import json
+import logging
 import os
 import pandas as pd
 import shutil
 
-from . import sideseeing, utils
+from . import constants, progress, roughness, sensor_types, sideseeing, trajectory, utils
+
+
+logger = logging.getLogger(__name__)
 
 
 class Report:
 
     DEFAULT_TEMPLATE_PACKAGE = "sideseeing_tools.templates"
     DEFAULT_TEMPLATE_NAME = "report.html"
-
-    def __init__(self):
+    # GPS tracks are simplified (see simplify.py) before being written to the geo JSONs:
+    # 'path' keeps the track within GEO_TOLERANCE_M meters and 'levels' holds coarser
+    # versions that the map switches to when zoomed out.
+    GEO_TOLERANCE_M = 1.0
+    GEO_LEVELS_M = [5.0, 20.0, 100.0]
+    # Length, in meters, of the track segments of the sidewalk assessment (see roughness.py).
+    SIDEWALK_SEGMENT_M = 10.0
+
+    def __init__(self, progress_callback=None, max_workers=1):
         """
         Initialize Report class.
+
+        Args:
+            progress_callback (callable, optional): Receives progress dicts (items done, throughput, ETA)
+                while the dataset is loaded and each report section is exported. See progress.ProgressTracker.
+            max_workers (int, optional): Worker processes for the sidewalk assessment (see shared.map_shared).
+                None uses every CPU.
         """
+        self.progress_callback = progress_callback
+        self.max_workers = max_workers
         env = Environment(
             loader=PackageLoader(self.DEFAULT_TEMPLATE_PACKAGE.split('.')[0], 
                                  self.DEFAULT_TEMPLATE_PACKAGE.split('.', 1)[1])
@@ -38,7 +57,8 @@ class Report:
         return sideseeing.SideSeeingDS(
             root_dir=input_dir, 
             generate_metadata=generate_metadata,
-            google_api_key=google_api_key
+            google_api_key=google_api_key,
+            progress_callback=self.progress_callback,
         )
 
     def _create_summary(self, ds: sideseeing.SideSeeingDS, data_dir_path: str) -> Dict:
@@ -52,12 +72,12 @@ class Report:
         Returns:
             Dict: A dictionary containing summary data.
         """
-        print("Summarizing the dataset...")
+        logger.info('Summarizing the dataset...')
         summary_data = {}
         metadata_df = ds.metadata(save=True)
         
         if metadata_df.empty:
-            print("WARNING: metadata.csv is empty or could not be found.")
+            logger.warning('metadata.csv is empty or could not be found.')
             return {
                 'total_instances': 0, 'total_duration_human': '0s', 
                 'total_size_gb': 0, 'total_distance_km': 0,
@@ -73,12 +93,13 @@ class Report:
         geo_centers_map = [] 
         sample_details = []
         total_distance_km = 0.0 
+        trajectories = trajectory.dataset_metrics(ds)
         sample_id_counter = 1
 
-        print("Processing sample details...")
-        for instance in ds.iterator:
+        logger.info('Processing sample details...')
+        for instance in progress.track(ds.iterator, 'summary', ds.size, self.progress_callback):
             if instance.name not in metadata_df.index:
-                print(f"WARNING: Skipping sample '{instance.name}' as it's not in metadata.csv.")
+                logger.warning("Skipping sample '%s' as it's not in metadata.csv.", instance.name)
                 continue
             
             meta = metadata_df.loc[instance.name]
@@ -100,7 +121,7 @@ class Report:
             details['device_manufacturer'] = meta.get('manufacturer', 'N/A')
             details['device_model'] = meta.get('model', '')
 
-            sample_dist_km = instance.calculate_sample_distance_traveled()
+            sample_dist_km = float(trajectories.loc[instance.name, 'distance_km'])
             details['distance_km'] = sample_dist_km
             total_distance_km += sample_dist_km
             
@@ -118,13 +139,9 @@ class Report:
                     'name': instance.name
                 })
 
-            available_sensors_count = 0
-            for axis in ['sensors1', 'sensors3', 'sensors6']:
-                sensor_dict = getattr(instance, axis, {})
-                if sensor_dict:
-                    available_sensors_count += len(sensor_dict)
-            
-            details['sensors'] = available_sensors_count
+            details['sensors'] = sum(
+                len(getattr(instance, attr, None) or {}) for attr in constants.SENSOR_ATTRIBUTES
+            )
             sample_details.append(details)
             sample_id_counter += 1
         
@@ -132,39 +149,20 @@ class Report:
         summary_data['geo_centers_map'] = geo_centers_map
         summary_data['sample_details'] = sorted(sample_details, key=lambda x: x['name'])
         
-        print("Summary generated successfully.")
+        logger.info('Summary generated successfully.')
         return summary_data
     
     def _get_sensor_unit(self, sensor_name: str) -> str:
         """
         Returns the unit for a given sensor name.
         """
-        sensor_name_lower = sensor_name.lower()
-        if 'acc' in sensor_name_lower:
-            return 'm/s²'
-        if 'gyr' in sensor_name_lower:
-            return 'rad/s'
-        if 'mag' in sensor_name_lower:
-            return 'μT'
-        if 'light' in sensor_name_lower or 'lux' in sensor_name_lower:
-            return 'lx'
-        if 'pressure' in sensor_name_lower:
-            return 'hPa'
-        if 'proximity' in sensor_name_lower:
-            return 'cm'
-        if 'humidity' in sensor_name_lower:
-            return '%'
-        if 'temp' in sensor_name_lower:
-            return '°C'
-        if 'gravity' in sensor_name_lower:
-            return 'm/s²'
-        return ''
+        return sensor_types.sensor_unit(sensor_name)
 
     def _process_sensors_data(self, ds: sideseeing.SideSeeingDS, output_data_dir: str) -> Optional[Dict[str, str]]:
         """
         Prepares sensor data, saving one JSON per sample in the 'output_data_dir'.
         """
-        print("Exporting sensors data to JSONs...")
+        logger.info('Exporting sensors data to JSONs...')
         
         charts_by_instance: Dict[str, List[Dict]] = {}
         sensors_axis = {
@@ -173,7 +171,7 @@ class Report:
             'sensors6': ['x', 'y', 'z', 'dx', 'dy', 'dz']
         }
 
-        for instance in ds.iterator:
+        for instance in progress.track(ds.iterator, 'sensors', ds.size, self.progress_callback):
             charts_list = []
             for axis, columns in sensors_axis.items():
                 sensor_data_dict = getattr(instance, axis, {})
@@ -294,12 +292,12 @@ class Report:
         """
         Prepares Wi-Fi signal data, saving one JSON per sample in 'output_data_dir'.
         """
-        print("Exporting Wi-Fi data to JSONs...")
+        logger.info('Exporting Wi-Fi data to JSONs...')
         os.makedirs(output_data_dir, exist_ok=True)
         
         instance_json_map: Dict[str, str] = {}
 
-        for sample in ds.iterator:
+        for sample in progress.track(ds.iterator, 'wifi', ds.size, self.progress_callback):
             df_wifi_raw = sample.wifi_networks
             df_gps_raw = sample.geolocation_points
 
@@ -317,7 +315,7 @@ class Report:
                 df_gps = df_gps[["unix_ms", "latitude", "longitude"]]
             
             except Exception as e:
-                print(f"Error when preparing DFs for {sample.name}: {e}")
+                logger.error('Error when preparing DFs for %s: %s', sample.name, e)
                 continue
 
             merged_data = self._join_wifi_gps(df_wifi, df_gps)
@@ -336,21 +334,22 @@ class Report:
                 
                 instance_json_map[sample.name] = json_relative_path
             except Exception as e:
-                print(f"Error saving Wi-Fi JSON for {sample.name}: {e}")
+                logger.error('Error saving Wi-Fi JSON for %s: %s', sample.name, e)
 
         return instance_json_map if instance_json_map else None
 
     def _process_geo_data(self, ds:sideseeing.SideSeeingDS, output_data_dir: str) -> Optional[Dict[str, str]]:
         """
         Prepares geospatial data (GPS routes), saving one JSON per sample 
-        in the 'output_data_dir'.
+        in the 'output_data_dir'. Routes are simplified to GEO_TOLERANCE_M, with
+        coarser levels of detail for GEO_LEVELS_M.
         """
-        print("Exporting geospatial data to JSONs...")
+        logger.info('Exporting geospatial data to JSONs...')
         os.makedirs(output_data_dir, exist_ok=True)
         
         instance_json_map: Dict[str, str] = {}
 
-        for sample in ds.iterator:
+        for sample in progress.track(ds.iterator, 'geo', ds.size, self.progress_callback):
             df_gps = sample.geolocation_points
             center = sample.geolocation_center
 
@@ -358,15 +357,20 @@ class Report:
                 continue
 
             try:
-                path_data = df_gps[['latitude', 'longitude']].values.tolist()
-                
+                path_data = sample.simplified_track(self.GEO_TOLERANCE_M)[['latitude', 'longitude']].values.tolist()
+                levels = {
+                    f'{tolerance:g}': sample.simplified_track(tolerance)[['latitude', 'longitude']].values.tolist()
+                    for tolerance in self.GEO_LEVELS_M
+                }
+
                 output_data = {
                     "center": center,
-                    "path": path_data
+                    "path": path_data,
+                    "levels": levels,
                 }
 
             except Exception as e:
-                print(f"Error extracting GPS data for {sample.name}: {e}")
+                logger.error('Error extracting GPS data for %s: %s', sample.name, e)
                 continue
 
             json_filename = f"geo_{sample.name}.json"
@@ -379,15 +383,53 @@ class Report:
                 
                 instance_json_map[sample.name] = json_relative_path
             except Exception as e:
-                print(f"Error saving geospatial JSON for {sample.name}: {e}")
+                logger.error('Error saving geospatial JSON for %s: %s', sample.name, e)
 
         return instance_json_map if instance_json_map else None
 
+    def _process_sidewalk_data(self, ds: sideseeing.SideSeeingDS, output_data_dir: str) -> Optional[str]:
+        """
+        Computes the roughness index per track segment of every sample (see roughness.dataset_roughness)
+        and saves the segments to one JSON in the 'output_data_dir', as rows of
+        [sample, start_lat, start_lon, end_lat, end_lon, roughness, roughness_max].
+        """
+        logger.info('Computing the sidewalk roughness index...')
+        os.makedirs(output_data_dir, exist_ok=True)
+
+        try:
+            segments = roughness.dataset_roughness(
+                ds, segment_m=self.SIDEWALK_SEGMENT_M,
+                max_workers=self.max_workers, progress_callback=self.progress_callback,
+            )
+        except Exception as e:
+            logger.error('Error computing the sidewalk roughness index: %s', e)
+            return None
+
+        if segments.empty:
+            return None
+
+        columns = ['instance', 'start_latitude', 'start_longitude', 'end_latitude', 'end_longitude', 'roughness', 'roughness_max']
+        output_data = {
+            "segment_m": self.SIDEWALK_SEGMENT_M,
+            "quantiles": segments['roughness'].quantile([0.25, 0.5, 0.75]).round(4).tolist(),
+            "segments": segments[columns].round(6).values.tolist(),
+        }
+
+        json_filename = "sidewalk.json"
+        try:
+            with open(os.path.join(output_data_dir, json_filename), 'w', encoding='utf-8') as f:
+                json.dump(output_data, f)
+        except Exception as e:
+            logger.error('Error saving sidewalk JSON: %s', e)
+            return None
+
+        return f"data/{json_filename}"
+
     def generate_report(self, input_dir: str, output_dir: str, title: str = None, generate_metadata: bool = False, google_api_key: str = None, version="1"):
         """
         Generate the HTML report from the SideSeeing dataset located in 'input_dir' and save it to 'output_dir'.
         """
-        print(f"Loading directory: {input_dir}")
+        logger.info('Loading directory: %s', input_dir)
         ds = self._load_sideseeing_data(input_dir, generate_metadata, google_api_key)
 
         os.makedirs(output_dir, exist_ok=True)
@@ -401,7 +443,8 @@ class Report:
         sections = {
             'sensor': self._process_sensors_data(ds, output_dir_data),
             'wifi': self._process_wifi_data(ds, output_dir_data),
-            'geo': self._process_geo_data(ds, output_dir_data)
+            'geo': self._process_geo_data(ds, output_dir_data),
+            'sidewalk': self._process_sidewalk_data(ds, output_dir_data),
         }
 
         processed_sections = {key: value for key, value in sections.items() if value is not None}
@@ -425,7 +468,7 @@ class Report:
         with open(output_html, 'w', encoding='utf-8') as f:
             f.write(html_data)
 
-        print(f"Report generated successfully at: {output_html}")
+        logger.info('Report generated successfully at: %s', output_html)
 
         self._copy_static_assets(output_dir)
 
@@ -435,7 +478,7 @@ class Report:
 
         def _copy_from_path(static_path: str):
             if not os.path.isdir(static_path):
-                print("No static assets directory found; skipping copy.")
+                logger.info('No static assets directory found; skipping copy.')
                 return
 
             if os.path.exists(destination):
@@ -443,9 +486,9 @@ class Report:
 
             try:
                 shutil.copytree(static_path, destination)
-                print(f"Static assets copied to: {destination}")
+                logger.info('Static assets copied to: %s', destination)
             except Exception as exc:
-                print(f"Failed to copy static assets: {exc}")
+                logger.error('Failed to copy static assets: %s', exc)
 
         try:
             static_resources = importlib.resources.files(self.DEFAULT_TEMPLATE_PACKAGE) / "static"
@@ -465,8 +508,11 @@ if __name__ == "__main__":
     parser.add_argument("-v", "--version", help="Version number", default="1")
     parser.add_argument("-g", "--generate_metadata", help="Generate metadata.csv if not present.", action="store_true")
     parser.add_argument("-k", "--google_api_key", help="Google API key")
+    parser.add_argument("-w", "--workers", help="Worker processes for the sidewalk assessment (default: every CPU).", type=int, default=None)
 
     args = parser.parse_args()
 
-    r = Report()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    r = Report(progress_callback=progress.log_progress, max_workers=args.workers)
     r.generate_report(args.input_dir, args.output_dir, args.title, args.generate_metadata, args.google_api_key, args.version)
@@ -0,0 +1,302 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import alignment, constants, shared, utils
+
+
+# Statistics computed from cumulative sums and `reduceat` over sample slices (see `slice_features`).
+STATISTICS = ['mean', 'std', 'rms', 'energy', 'min', 'max', 'jerk']
+
+FEATURES = STATISTICS + ['zero_crossings', 'band_power']
+
+DEFAULT_FEATURES = ['mean', 'std', 'rms', 'energy', 'min', 'max', 'zero_crossings', 'band_power']
+
+DEFAULT_BANDS = [(0.0, 2.0), (2.0, 5.0), (5.0, 10.0), (10.0, 25.0)]
+
+KEY_COLUMNS = ['instance', 'sensor', 'start_time', 'end_time']
+
+CHUNK_WINDOWS = 4096
+
+
+def window_view(values: np.ndarray, window: int, step: int = 1) -> np.ndarray:
+    '''
+    Returns a read-only (windows, channels, window) view of a (samples, channels) array,
+    one window every `step` samples. No data is copied.
+    '''
+    if len(values) < window:
+        return np.empty((0, values.shape[1], window), dtype=values.dtype)
+    return np.lib.stride_tricks.sliding_window_view(values, window, axis=0)[::step]
+
+
+def feature_names(channels: list, features: list = None, bands: list = None) -> list:
+    '''
+    Returns the feature column names, `<channel>_<feature>`, with one
+    `<channel>_band_<low>_<high>hz` column per band for 'band_power'.
+    '''
+    features = DEFAULT_FEATURES if features is None else features
+    bands = DEFAULT_BANDS if bands is None else bands
+
+    names = []
+    for channel in channels:
+        for feature in features:
+            if feature == 'band_power':
+                names.extend(f'{channel}_band_{low:g}_{high:g}hz' for low, high in bands)
+            else:
+                names.append(f'{channel}_{feature}')
+    return names
+
+
+def _band_power(centered, rate, bands):
+    window = centered.shape[-1]
+    spectrum = np.abs(np.fft.rfft(centered, axis=-1)) ** 2 * (2.0 / window ** 2)
+    frequencies = np.fft.rfftfreq(window, d=1 / rate)
+    return np.stack([
+        spectrum[..., (frequencies >= low) & (frequencies < high)].sum(axis=-1)
+        for low, high in bands
+    ], axis=-1)
+
+
+def _check(features):
+    unknown = set(features) - set(FEATURES)
+    if unknown:
+        raise ValueError(f'Unknown features {sorted(unknown)}. Use any of {FEATURES}.')
+
+
+def _slice_statistics(values, lo, hi, features, times):
+    '''
+    Returns {feature: (slices, channels) array} for the STATISTICS in `features`.
+    '''
+    if not features:
+        return {}
+    counts = (hi - lo)[:, None]
+    zero = np.zeros((1, values.shape[1]))
+    missing = np.isnan(values)
+    # Shifting by the channel means keeps the cumulative sums small; NaNs only spoil their own slices.
+    offset = np.nanmean(values, axis=0) if (~missing).any() else np.zeros(values.shape[1])
+    offset = np.nan_to_num(offset)
+    shifted = np.where(missing, 0.0, values - offset)
+
+    def window_sum(x):
+        total = np.vstack([zero, np.cumsum(x, axis=0)])
+        return total[hi] - total[lo]
+
+    spoiled = window_sum(missing) > 0
+    mean = window_sum(shifted) / counts
+    spread = np.maximum(window_sum(shifted ** 2) / counts - mean ** 2, 0)
+    mean = np.where(spoiled, np.nan, mean + offset)
+    spread = np.where(spoiled, np.nan, spread)
+
+    result = {}
+    for feature in features:
+        if feature == 'mean':
+            result[feature] = mean
+        elif feature == 'std':
+            result[feature] = np.sqrt(spread)
+        elif feature == 'rms':
+            result[feature] = np.sqrt(spread + mean ** 2)
+        elif feature == 'energy':
+            result[feature] = (spread + mean ** 2) * counts
+        elif feature in ('min', 'max'):
+            reduce = np.minimum if feature == 'min' else np.maximum
+            padded = np.vstack([values, zero])
+            result[feature] = reduce.reduceat(padded, np.column_stack([lo, hi]).ravel(), axis=0)[::2]
+        elif feature == 'jerk':
+            steps = np.abs(np.diff(values, axis=0))
+            changes = np.vstack([zero, np.cumsum(np.nan_to_num(steps), axis=0)])
+            duration = np.maximum(times[hi - 1] - times[lo], 1e-9)[:, None]
+            result[feature] = np.where(spoiled, np.nan, (changes[hi - 1] - changes[lo]) / duration)
+    return result
+
+
+def slice_features(values: np.ndarray, lo: np.ndarray, hi: np.ndarray, features: list = None,
+                   times: np.ndarray = None) -> np.ndarray:
+    '''
+    Computes STATISTICS over the sample slices [lo, hi) of a (samples, channels) array, which
+    may overlap and have different lengths (e.g. windows of a fixed duration).
+
+    Sums come from cumulative sums, so mean, std, rms, energy and jerk cost is linear in the
+    number of samples whatever the slice overlap. min/max reduce every slice with `reduceat`,
+    so their cost is the total length of the slices. 'jerk' is the mean absolute change per
+    second, from the sample `times` in seconds. Slices with missing values give NaN.
+
+    Returns:
+        np.ndarray: A (slices, channels * features) float64 array, ordered as `feature_names`.
+    '''
+    features = ['mean', 'std', 'min', 'max'] if features is None else features
+    _check(features)
+    spectral = set(features) - set(STATISTICS)
+    if spectral:
+        raise ValueError(f'{sorted(spectral)} need fixed-length windows; use compute_features.')
+
+    values = np.asarray(values, dtype='float64')
+    lo, hi = np.asarray(lo, dtype='int64'), np.asarray(hi, dtype='int64')
+    if len(lo) == 0:
+        return np.empty((0, values.shape[1] * len(features)))
+
+    columns = _slice_statistics(values, lo, hi, features, times)
+    return np.stack([columns[f] for f in features], axis=-1).reshape(len(lo), -1)
+
+
+def _spectral(windows, rate, features, bands):
+    '''
+    Returns {feature: (windows, channels, k) array} for 'zero_crossings' and 'band_power' in `features`.
+    '''
+    columns = {}
+    if 'zero_crossings' in features or 'band_power' in features:
+        centered = windows - windows.mean(axis=-1)[..., None]
+        if 'zero_crossings' in features:
+            signs = np.signbit(centered)
+            columns['zero_crossings'] = (signs[..., 1:] != signs[..., :-1]).sum(axis=-1)[..., None].astype('float64')
+        if 'band_power' in features:
+            columns['band_power'] = _band_power(centered, rate, bands)
+    return columns
+
+
+def _window_statistics(windows, rate, features):
+    '''
+    Runs `_slice_statistics` over a (windows, channels, window) array. The slices must be runs of
+    samples, so windows that overlap in their source are unrolled (a copy of this chunk of windows);
+    non-overlapping windows of a contiguous array are only reshaped.
+    '''
+    count, channels, length = windows.shape
+    flat = windows.transpose(0, 2, 1).reshape(-1, channels)
+    lo = np.arange(count) * length
+    times = np.tile(np.arange(length) / rate, count)
+    return _slice_statistics(flat, lo, lo + length, features, times)
+
+
+def _assemble(columns, features, count):
+    stacked = np.concatenate([columns[f] for f in features], axis=-1)
+    return stacked.reshape(count, stacked.shape[1] * stacked.shape[2])
+
+
+def compute_features(windows: np.ndarray, rate: float, features: list = None, bands: list = None) -> np.ndarray:
+    '''
+    Computes features over a (windows, channels, window) array, e.g. from `window_view`, in
+    chunks of CHUNK_WINDOWS windows.
+
+    The STATISTICS are computed as in `slice_features`, with 'energy' the sum of squares and
+    'jerk' timed at `rate` Hz. 'zero_crossings' counts sign changes of the window with its mean
+    removed, and 'band_power' is the mean power of the mean-removed window in each frequency
+    band (in Hz, [low, high)), from a real FFT at `rate` Hz.
+
+    Returns:
+        np.ndarray: A (windows, channels * features) float64 array, ordered as `feature_names`.
+    '''
+    features = DEFAULT_FEATURES if features is None else features
+    bands = DEFAULT_BANDS if bands is None else bands
+    _check(features)
+
+    count = len(windows)
+    statistics = [f for f in features if f in STATISTICS]
+    chunks = []
+    for start in range(0, max(count, 1), CHUNK_WINDOWS):
+        chunk = windows[start:start + CHUNK_WINDOWS]
+        columns = _spectral(chunk, rate, features, bands)
+        columns.update({f: v[..., None] for f, v in _window_statistics(chunk, rate, statistics).items()})
+        chunks.append(columns)
+
+    columns = {f: np.concatenate([chunk[f] for chunk in chunks]) for f in features}
+    return _assemble(columns, features, count)
+
+
+def sensor_features(data: pd.DataFrame, origin, channels: list, window: int = 128, step: int = 64,
+                    features: list = None, bands: list = None) -> tuple:
+    '''
+    Computes window features of one sensor stream.
+
+    Windows have a fixed number of samples; the sampling rate used by 'band_power' is
+    estimated from the median interval between samples. The STATISTICS are computed over the
+    whole stream at once (see `slice_features`); the other features over chunks of
+    CHUNK_WINDOWS windows so the FFT buffers stay small.
+
+    Args:
+        data (pd.DataFrame): A sensor DataFrame.
+        origin (datetime): Times are reported in seconds since `origin`, usually the media start.
+        channels (list): The columns to use, e.g. ['x', 'y', 'z'].
+        window (int): The window length in samples.
+        step (int): The distance between window starts in samples.
+
+    Returns:
+        tuple: `start_times`, `end_times` (times of the first and last sample of each window)
+        and a (windows, len(feature_names(channels, features, bands))) float64 array.
+    '''
+    features = DEFAULT_FEATURES if features is None else features
+    bands = DEFAULT_BANDS if bands is None else bands
+    _check(features)
+    names = feature_names(channels, features, bands)
+    if data is None or len(data) < max(window, 2):
+        return np.empty(0), np.empty(0), np.empty((0, len(names)))
+
+    t = utils.seconds_since(data, origin)
+    order = np.argsort(t, kind='stable')
+    t = t[order]
+    values = data[channels].to_numpy(dtype='float64')[order]
+    rate = 1 / max(np.median(np.diff(t)), 1e-9)
+
+    windows = window_view(values, window, step)
+    first = np.arange(len(windows)) * step
+    spectral = [f for f in features if f not in STATISTICS]
+    chunks = [_spectral(windows[start:start + CHUNK_WINDOWS], rate, spectral, bands) for start in range(0, len(windows), CHUNK_WINDOWS)]
+    columns = {f: np.concatenate([chunk[f] for chunk in chunks]) for f in spectral}
+
+    statistics = [f for f in features if f in STATISTICS]
+    for feature, stat in _slice_statistics(values, first, first + window, statistics, t).items():
+        columns[feature] = stat[..., None]
+
+    return t[first], t[first + window - 1], _assemble(columns, features, len(windows))
+
+
+def instance_features(instance, sensors=None, window: int = 128, step: int = 64, features: list = None,
+                      bands: list = None) -> pd.DataFrame:
+    '''
+    Computes window features of the sensor streams of an instance.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        sensors (str or list, optional): Modalities ('sensors3'), raw sensor names or canonical sensor types. Defaults to every sensor.
+        window (int): The window length in samples.
+        step (int): The distance between window starts in samples.
+        features (list, optional): A subset of FEATURES. Defaults to all of them.
+        bands (list, optional): (low, high) frequency bands in Hz for 'band_power'. Defaults to DEFAULT_BANDS.
+
+    Returns:
+        pd.DataFrame: One row per window, keyed by instance, sensor and start_time (seconds since the
+        media start), with one column per channel and feature (see `feature_names`).
+    '''
+    tables = []
+    for name, df, channels in alignment.select_streams(instance, sensors, constants.SENSOR_ATTRIBUTES, strict=False):
+        starts, ends, values = sensor_features(df, instance.media_start_time, channels, window, step, features, bands)
+        if len(starts) == 0:
+            continue
+        table = pd.DataFrame(values, columns=feature_names(channels, features, bands))
+        table.insert(0, 'end_time', ends)
+        table.insert(0, 'start_time', starts)
+        table.insert(0, 'sensor', name)
+        table.insert(0, 'instance', instance.name)
+        tables.append(table)
+
+    if not tables:
+        return pd.DataFrame(columns=KEY_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
+
+
+def dataset_features(dataset, sensors=None, window: int = 128, step: int = 64, features: list = None,
+                     bands: list = None, max_workers: int = 1, progress_callback=None) -> pd.DataFrame:
+    '''
+    Computes window features for every instance of a dataset (see `instance_features`). With
+    `max_workers` > 1 instances are processed in worker processes through shared memory
+    (see shared.map_shared).
+
+    Example:
+        table = dataset_features(ds, sensors=['accelerometer', 'gyroscope'], window=256, step=128, max_workers=4)
+        table.set_index(['instance', 'sensor', 'start_time'])
+    '''
+    tables = shared.map_shared(
+        instance_features, dataset.iterator, sensors, window, step, features, bands,
+        max_workers=max_workers, progress_callback=progress_callback,
+    )
+    tables = [t for t in tables if len(t)]
+    if not tables:
+        return pd.DataFrame(columns=KEY_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,159 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import constants, media, utils
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_FPS = 30.0
+
+
+def video_timing(instance, fps: float = None) -> tuple:
+    '''
+    Returns the (fps, frame_count) of an instance video. Without a readable video (or when
+    `fps` is given), the frame rate is `fps` or DEFAULT_FPS and the number of frames comes
+    from the media duration.
+    '''
+    info = media.get_video_info(instance.video) if (fps is None and getattr(instance, 'video', None)) else None
+    if info is not None:
+        return info['fps'], info['frame_count']
+
+    if fps is None:
+        logger.warning('Using %s fps for %s: the video frame rate is not available.', DEFAULT_FPS, instance.name)
+    fps = float(fps or DEFAULT_FPS)
+    return fps, int(np.floor(instance.media_total_time * fps))
+
+
+class FrameTable:
+    '''
+    A per-instance lookup table between video frames and the other modalities.
+
+    `table` has one row per frame with its time (seconds since the media start), its
+    UTC datetime, the [start, stop) row range of every sensor stream covering the frame
+    duration (columns `<sensor name>:start` and `<sensor name>:stop`), the GPS position
+    linearly interpolated at the frame time (NaN outside the GPS track) and the last
+    consumption reading. Frame -> sensor window lookups are array indexing and
+    time -> frame is a division, so both are O(1).
+
+    The frame rate is read from the video; if there is no readable video, `fps` (or
+    DEFAULT_FPS) is used and the number of frames comes from the media duration.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        fps (float, optional): Overrides the frame rate.
+
+    Example:
+        frames = instance.frame_table()
+        frames.frame_at(12.5)
+        frames.sensor_window(375, 'icm4x6xx accelerometer non-wakeup')
+    '''
+    def __init__(self, instance, fps: float = None):
+        self.instance = instance
+
+        self.fps, self.frame_count = video_timing(instance, fps)
+
+        self.streams = {}
+        self.table = self._build()
+
+    def _build(self):
+        instance = self.instance
+        times = np.arange(self.frame_count) / self.fps
+        origin = pd.Timestamp(instance.media_start_time)
+
+        columns = {
+            'frame': np.arange(self.frame_count),
+            'time': times,
+            'Datetime UTC': origin + pd.to_timedelta(times, unit='s'),
+        }
+
+        for attr in constants.SENSOR_ATTRIBUTES:
+            for sensor_name, df in (getattr(instance, attr, None) or {}).items():
+                seconds = utils.seconds_since(df, instance.media_start_time)
+                self.streams[sensor_name] = attr
+                columns[f'{sensor_name}:start'] = np.searchsorted(seconds, times, side='left')
+                columns[f'{sensor_name}:stop'] = np.searchsorted(seconds, times + 1 / self.fps, side='left')
+
+        latitude = longitude = np.full(self.frame_count, np.nan)
+        gps = getattr(instance, 'geolocation_points', None)
+        if gps is not None and not gps.empty:
+            gps = gps.dropna(subset=['latitude', 'longitude'])
+        if gps is not None and not gps.empty:
+            seconds = utils.seconds_since(gps, instance.media_start_time)
+            inside = (times >= seconds[0]) & (times <= seconds[-1])
+            latitude = np.where(inside, np.interp(times, seconds, gps['latitude'].to_numpy(dtype='float64')), np.nan)
+            longitude = np.where(inside, np.interp(times, seconds, gps['longitude'].to_numpy(dtype='float64')), np.nan)
+        columns['latitude'] = latitude
+        columns['longitude'] = longitude
+
+        consumption = np.full(self.frame_count, np.nan)
+        df = getattr(instance, 'consumption', None)
+        if df is not None and not df.empty:
+            seconds = utils.seconds_since(df, instance.media_start_time)
+            last = np.searchsorted(seconds, times, side='right') - 1
+            values = pd.to_numeric(df['battery_microamperes'], errors='coerce').to_numpy(dtype='float64')
+            consumption = np.where(last >= 0, values[np.maximum(last, 0)], np.nan)
+        columns['battery_microamperes'] = consumption
+
+        return pd.DataFrame(columns)
+
+    @property
+    def duration(self):
+        return self.frame_count / self.fps
+
+    def frame_at(self, time: float) -> int:
+        '''
+        Returns the frame shown at `time` (seconds since the media start), clipped to the video.
+        '''
+        return int(np.clip(np.floor(time * self.fps), 0, max(self.frame_count - 1, 0)))
+
+    def frames_at(self, times) -> np.ndarray:
+        '''
+        Vectorized `frame_at`.
+        '''
+        return np.clip(np.floor(np.asarray(times) * self.fps), 0, max(self.frame_count - 1, 0)).astype('int64')
+
+    def time_of(self, frame: int) -> float:
+        return frame / self.fps
+
+    def sensor_rows(self, frame: int, sensor_name: str) -> tuple:
+        '''
+        Returns the [start, stop) row range of a sensor stream that falls within a frame.
+        '''
+        return (
+            int(self.table[f'{sensor_name}:start'].iat[frame]),
+            int(self.table[f'{sensor_name}:stop'].iat[frame]),
+        )
+
+    def sensor_window(self, frame: int, sensor_name: str, before: int = 0, after: int = 0) -> pd.DataFrame:
+        '''
+        Returns the sensor rows recorded during `frame`, extended by `before` and `after` frames.
+        '''
+        first = max(frame - before, 0)
+        last = min(frame + after, self.frame_count - 1)
+        start = int(self.table[f'{sensor_name}:start'].iat[first])
+        stop = int(self.table[f'{sensor_name}:stop'].iat[last])
+        data = getattr(self.instance, self.streams[sensor_name])[sensor_name]
+        return data.iloc[start:stop]
+
+    def sensor_frames(self, sensor_name: str) -> np.ndarray:
+        '''
+        Returns, for every row of a sensor stream, the frame shown when it was recorded.
+        '''
+        data = getattr(self.instance, self.streams[sensor_name])[sensor_name]
+        return self.frames_at(utils.seconds_since(data, self.instance.media_start_time))
+
+    def position(self, frame: int) -> tuple:
+        '''
+        Returns the interpolated (latitude, longitude) at a frame.
+        '''
+        return float(self.table['latitude'].iat[frame]), float(self.table['longitude'].iat[frame])
+
+    def __str__(self):
+        return f'SSFrameTable[name: {self.instance.name}, frames: {self.frame_count}, fps: {self.fps}]'
+
+    def __repr__(self):
+        return self.__str__()
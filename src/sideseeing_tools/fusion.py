@@ -0,0 +1,236 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import resample, sensor_types, utils
+
+
+# Time constants of the complementary filter, in seconds: below them the gyroscope is trusted,
+# above them the accelerometer (gravity) and the magnetometer (north).
+TAU_GRAVITY_S = 1.0
+
+TAU_HEADING_S = 5.0
+
+# The affine recursion is solved with a parallel scan over blocks of this many samples.
+CHUNK_SAMPLES = 65536
+
+WORLD_COLUMNS = ['east', 'north', 'up']
+
+
+def _skew(vectors: np.ndarray) -> np.ndarray:
+    x, y, z = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+    zero = np.zeros_like(x)
+    return np.stack([
+        np.stack([zero, -z, y], axis=-1),
+        np.stack([z, zero, -x], axis=-1),
+        np.stack([-y, x, zero], axis=-1),
+    ], axis=1)
+
+
+def rotation_increments(gyro: np.ndarray, dt: np.ndarray) -> np.ndarray:
+    '''
+    Returns, for every interval, the (3, 3) matrix that maps a fixed world vector expressed in the
+    sensor frame at the start of the interval to the sensor frame at its end, for a sensor turning
+    at `gyro` rad/s (Rodrigues' formula, one batched evaluation for all intervals).
+
+    Args:
+        gyro (np.ndarray): (intervals, 3) angular velocities in rad/s, in the sensor frame.
+        dt (np.ndarray): The interval durations in seconds.
+    '''
+    rotation = -gyro * dt[:, None]
+    angle = np.linalg.norm(rotation, axis=1)
+    axis = rotation / np.where(angle > 0, angle, 1)[:, None]
+    k = _skew(axis)
+    return (
+        np.eye(3)[None]
+        + np.sin(angle)[:, None, None] * k
+        + (1 - np.cos(angle))[:, None, None] * (k @ k)
+    )
+
+
+def affine_scan(matrices: np.ndarray, offsets: np.ndarray, initial: np.ndarray) -> np.ndarray:
+    '''
+    Solves the recursion `x[k] = matrices[k] @ x[k - 1] + offsets[k]`, with `x[-1] = initial`, for
+    every k at once.
+
+    The maps are composed with a Hillis-Steele prefix scan (log2(n) batched matrix products per
+    block of CHUNK_SAMPLES), and the state is carried from one block to the next.
+
+    Returns:
+        np.ndarray: The (n, 3) states.
+    '''
+    states = np.empty_like(offsets)
+    state = np.asarray(initial, dtype='float64')
+    for start in range(0, len(offsets), CHUNK_SAMPLES):
+        m = matrices[start:start + CHUNK_SAMPLES].copy()
+        b = offsets[start:start + CHUNK_SAMPLES].copy()
+        shift = 1
+        while shift < len(b):
+            b[shift:] = np.einsum('kij,kj->ki', m[shift:], b[:-shift]) + b[shift:]
+            m[shift:] = m[shift:] @ m[:-shift]
+            shift *= 2
+        states[start:start + CHUNK_SAMPLES] = np.einsum('kij,j->ki', m, state) + b
+        state = states[start + len(b) - 1]
+    return states
+
+
+def complementary_filter(dt: np.ndarray, increments: np.ndarray, measurements: np.ndarray, tau: float) -> np.ndarray:
+    '''
+    Tracks a world vector (gravity, north) in the sensor frame:
+    `v[k] = (1 - a[k]) * increments[k] @ v[k - 1] + a[k] * measurements[k]`, with `a[k] = dt[k] / (tau + dt[k])`.
+    The gyroscope propagation dominates over periods shorter than `tau` seconds and the measurements
+    over longer ones. `tau=np.inf` propagates the first measurement with the gyroscope only.
+
+    Args:
+        dt (np.ndarray): Time since the previous sample, in seconds (the first value is ignored).
+        increments (np.ndarray): (samples, 3, 3) rotations from `rotation_increments` (the first one is ignored).
+        measurements (np.ndarray): (samples, 3) measured vectors.
+    '''
+    alpha = dt / (tau + dt) if np.isfinite(tau) else np.zeros_like(dt)
+    alpha[0] = 1.0
+    matrices = (1 - alpha)[:, None, None] * increments
+    return affine_scan(matrices, alpha[:, None] * measurements, np.zeros(3))
+
+
+def orientation(gravity: np.ndarray, north: np.ndarray) -> np.ndarray:
+    '''
+    Returns the (samples, 3, 3) rotations from the sensor frame to the East-North-Up world frame,
+    from the gravity (the accelerometer at rest, pointing up) and north references in the sensor
+    frame. The rows are the east, north and up axes in sensor coordinates.
+    '''
+    up = gravity / np.linalg.norm(gravity, axis=1, keepdims=True)
+    east = np.cross(north, up)
+    east /= np.linalg.norm(east, axis=1, keepdims=True)
+    return np.stack([east, np.cross(up, east), up], axis=1)
+
+
+def fuse(times: np.ndarray, accelerometer: np.ndarray, gyroscope: np.ndarray = None, magnetometer: np.ndarray = None,
+         tau_gravity: float = TAU_GRAVITY_S, tau_heading: float = TAU_HEADING_S, gravity: float = None) -> tuple:
+    '''
+    Estimates the orientation of the sensor and its linear acceleration in the world frame with a
+    complementary filter, from streams sampled at the same times.
+
+    Gravity and north are tracked in the sensor frame (see `complementary_filter`): the gyroscope
+    rotates the previous estimates and the accelerometer and magnetometer pull them back. Without a
+    magnetometer the heading is the gyroscope-propagated direction of the sensor's y axis at the
+    first sample (so 'north' is relative to the starting heading); without a gyroscope the
+    estimates are low-pass filtered measurements.
+
+    Args:
+        times (np.ndarray): Sorted sample times in seconds.
+        accelerometer, gyroscope, magnetometer (np.ndarray): (samples, 3) arrays, in m/s², rad/s and μT.
+        tau_gravity, tau_heading (float): Time constants of the filter, in seconds.
+        gravity (float, optional): The gravity subtracted from the vertical axis. Defaults to the median
+            norm of the accelerometer, which also absorbs a scale bias of the sensor.
+
+    Returns:
+        tuple: `linear_acceleration`, a (samples, 3) East-North-Up array in m/s², and `rotation`,
+        the (samples, 3, 3) sensor-to-world rotations (see `orientation`).
+    '''
+    times = np.asarray(times, dtype='float64')
+    accelerometer = np.asarray(accelerometer, dtype='float64')
+    dt = np.diff(times, prepend=times[:1])
+
+    if gyroscope is None:
+        increments = np.broadcast_to(np.eye(3), (len(times), 3, 3))
+    else:
+        gyroscope = np.asarray(gyroscope, dtype='float64')
+        midpoints = (gyroscope + np.roll(gyroscope, 1, axis=0)) / 2
+        increments = rotation_increments(midpoints, dt)
+
+    vertical = complementary_filter(dt, increments, accelerometer, tau_gravity)
+    if magnetometer is None:
+        reference = np.zeros_like(accelerometer)
+        reference[0] = [0.0, 1.0, 0.0]
+        north = complementary_filter(dt, increments, reference, np.inf)
+    else:
+        north = complementary_filter(dt, increments, np.asarray(magnetometer, dtype='float64'), tau_heading)
+
+    rotation = orientation(vertical, north)
+    world = np.einsum('kij,kj->ki', rotation, accelerometer)
+    world[:, 2] -= np.median(np.linalg.norm(accelerometer, axis=1)) if gravity is None else gravity
+    return world, rotation
+
+
+def _stream(instance, sensor_type, name=None):
+    '''
+    Returns the (DataFrame, values) of a 3-axis stream: the raw sensor `name`, or the stream of
+    `sensor_type` with the most samples, preferring calibrated (`sensors3`) streams. Uncalibrated
+    streams are corrected with their estimated bias (x - dx, ...).
+    '''
+    candidates = []
+    for attr in ['sensors3', 'sensors6']:
+        for stream_name, df in (getattr(instance, attr, None) or {}).items():
+            if stream_name == name or (name is None and sensor_types.sensor_type(stream_name) == sensor_type):
+                candidates.append((attr, df))
+        if candidates:
+            break
+    if not candidates:
+        return None, None
+
+    attr, df = max(candidates, key=lambda c: len(c[1]))
+    values = df[['x', 'y', 'z']].to_numpy(dtype='float64')
+    if attr == 'sensors6':
+        values = values - df[['dx', 'dy', 'dz']].to_numpy(dtype='float64')
+    return df, values
+
+
+def _on_times(df, values, origin, targets):
+    times = utils.seconds_since(df, origin)
+    order = np.argsort(times, kind='stable')
+    times, values = times[order], values[order]
+    return np.stack([np.interp(targets, times, values[:, axis]) for axis in range(values.shape[1])], axis=1)
+
+
+def linear_acceleration(instance, rate: float = None, accelerometer: str = None, gyroscope: str = None,
+                        magnetometer: str = None, use_magnetometer: bool = True, tau_gravity: float = TAU_GRAVITY_S,
+                        tau_heading: float = TAU_HEADING_S, as_array: bool = False):
+    '''
+    Computes the gravity-free linear acceleration of an instance in the East-North-Up world frame
+    (see `fuse`).
+
+    The gyroscope and magnetometer are interpolated onto the accelerometer samples, or every stream
+    onto a uniform grid at `rate` Hz over the accelerometer time range (see resample.grid).
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        rate (float, optional): A fixed output rate in Hz. Defaults to the accelerometer samples.
+        accelerometer, gyroscope, magnetometer (str, optional): Raw sensor names. Default to the streams of
+            each type with the most samples.
+        use_magnetometer (bool): If False, the heading is relative to the first sample (see `fuse`).
+        as_array (bool): If True, returns `(times, linear_acceleration, rotation)` arrays.
+
+    Returns:
+        pd.DataFrame: A `time` column (seconds since the media start) and the `east`, `north` and `up`
+        linear acceleration, in m/s².
+
+    Example:
+        world = linear_acceleration(instance, rate=100)
+        world['horizontal'] = np.hypot(world['east'], world['north'])
+    '''
+    df, values = _stream(instance, 'accelerometer', accelerometer)
+    if df is None or len(df) < 2:
+        raise ValueError(f'No accelerometer data in {instance.name}.')
+
+    times = utils.seconds_since(df, instance.media_start_time)
+    targets = np.sort(times) if rate is None else resample.grid(times.min(), times.max(), rate)
+    accel = _on_times(df, values, instance.media_start_time, targets)
+
+    selected = {'gyroscope': gyroscope}
+    if use_magnetometer:
+        selected['magnetometer'] = magnetometer
+
+    streams = {}
+    for sensor_type, name in selected.items():
+        stream_df, stream_values = _stream(instance, sensor_type, name)
+        if stream_df is not None and len(stream_df) > 1:
+            streams[sensor_type] = _on_times(stream_df, stream_values, instance.media_start_time, targets)
+
+    world, rotation = fuse(
+        targets, accel, streams.get('gyroscope'), streams.get('magnetometer'), tau_gravity, tau_heading,
+    )
+    if as_array:
+        return targets, world, rotation
+
+    result = pd.DataFrame(world, columns=WORLD_COLUMNS, copy=False)
+    result.insert(0, 'time', targets)
+    return result
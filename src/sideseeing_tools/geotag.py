@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import alignment, constants, utils
+
+
+GEOTAG_COLUMNS = ['latitude', 'longitude', 'accuracy', 'fix_distance']
+
+# Fixes farther apart than this, in seconds, are not interpolated between.
+MAX_GAP_S = 30.0
+
+# Times before the first fix or after the last one take that fix if it is at most this close, in seconds.
+MAX_EDGE_S = 5.0
+
+# Drift, in m/s, added to the reported accuracy for every second away from the nearest fix.
+DRIFT_MPS = 1.0
+
+
+def _fixes(gps: pd.DataFrame, origin) -> tuple:
+    '''
+    Returns the (seconds since `origin`, latitude, longitude, accuracy) arrays of the valid fixes,
+    sorted by time. The accuracy is NaN when the track does not report it.
+    '''
+    if gps is None or gps.empty:
+        return np.empty(0), np.empty(0), np.empty(0), np.empty(0)
+
+    times = utils.seconds_since(gps, origin)
+    latitude = pd.to_numeric(gps['latitude'], errors='coerce').to_numpy(dtype='float64')
+    longitude = pd.to_numeric(gps['longitude'], errors='coerce').to_numpy(dtype='float64')
+    if 'accuracy' in gps.columns:
+        accuracy = pd.to_numeric(gps['accuracy'], errors='coerce').to_numpy(dtype='float64')
+    else:
+        accuracy = np.full(len(gps), np.nan)
+
+    keep = ~(np.isnan(times) | np.isnan(latitude) | np.isnan(longitude))
+    order = np.argsort(times[keep], kind='stable')
+    return times[keep][order], latitude[keep][order], longitude[keep][order], accuracy[keep][order]
+
+
+def interpolate(fix_times, latitude, longitude, accuracy, times, max_gap_s: float = MAX_GAP_S,
+                max_edge_s: float = MAX_EDGE_S, drift_mps: float = DRIFT_MPS) -> np.ndarray:
+    '''
+    Interpolates positions at `times` from GPS fixes, with one binary search for all times
+    (see alignment.bracket).
+
+    Positions are linear between the fixes surrounding each time (longitudes are interpolated
+    across the antimeridian) and held from the first/last fix within `max_edge_s` seconds of the
+    track ends. Times between fixes more than `max_gap_s` seconds apart, or farther from the ends,
+    get NaN. The accuracy estimate (meters) combines the reported accuracy, interpolated like the
+    position, with `drift_mps` meters per second away from the nearest fix (NaN where the fixes
+    do not report an accuracy).
+
+    Args:
+        fix_times (array): Fix times in seconds, sorted.
+        latitude, longitude, accuracy (array): The fixes.
+        times (array): Target times in seconds, on the same clock as `fix_times`.
+
+    Returns:
+        np.ndarray: A (len(times), 4) array with the columns of GEOTAG_COLUMNS; `fix_distance`
+        is the distance in seconds to the nearest fix.
+    '''
+    times = np.asarray(times, dtype='float64')
+    out = np.full((len(times), len(GEOTAG_COLUMNS)), np.nan)
+    if len(fix_times) == 0 or len(times) == 0:
+        return out
+
+    left, right, weight = alignment.bracket(fix_times, times)
+    span = fix_times[right] - fix_times[left]
+    fix_distance = np.minimum(np.abs(times - fix_times[left]), np.abs(fix_times[right] - times))
+
+    inside = (times >= fix_times[0]) & (times <= fix_times[-1])
+    valid = np.where(inside, (span <= max_gap_s) | (fix_distance == 0), fix_distance <= max_edge_s)
+
+    delta_lon = (longitude[right] - longitude[left] + 180) % 360 - 180
+    lon = (longitude[left] + weight * delta_lon + 180) % 360 - 180
+    lat = latitude[left] + weight * (latitude[right] - latitude[left])
+    reported = accuracy[left] + weight * (accuracy[right] - accuracy[left])
+
+    out[:, 0] = lat
+    out[:, 1] = lon
+    out[:, 2] = np.hypot(reported, drift_mps * fix_distance)
+    out[:, 3] = fix_distance
+    out[~valid] = np.nan
+    return out
+
+
+def positions(gps: pd.DataFrame, datetimes, max_gap_s: float = MAX_GAP_S, max_edge_s: float = MAX_EDGE_S,
+              drift_mps: float = DRIFT_MPS) -> pd.DataFrame:
+    '''
+    Interpolates a GPS track at the given datetimes (see `interpolate`).
+
+    Returns:
+        pd.DataFrame: One row per datetime, with the columns of GEOTAG_COLUMNS.
+    '''
+    datetimes = pd.Series(pd.to_datetime(np.asarray(datetimes)))
+    origin = datetimes.iloc[0] if len(datetimes) else pd.Timestamp(0)
+    fixes = _fixes(gps, origin)
+    times = (datetimes - origin).dt.total_seconds().to_numpy()
+    values = interpolate(*fixes, times, max_gap_s, max_edge_s, drift_mps)
+    return pd.DataFrame(values, columns=GEOTAG_COLUMNS, copy=False)
+
+
+def geotag(instance, target='video', max_gap_s: float = MAX_GAP_S, max_edge_s: float = MAX_EDGE_S,
+           drift_mps: float = DRIFT_MPS) -> pd.DataFrame:
+    '''
+    Interpolates the GPS track of an instance on a timeline.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        target: 'video' for one row per video frame, a rate in Hz, or explicit times (seconds since
+            the media start, or datetimes); see alignment.timeline.
+        max_gap_s (float): Longest interval between fixes that is interpolated, in seconds.
+        max_edge_s (float): How long the first/last fix is held outside the track, in seconds.
+        drift_mps (float): Growth of the accuracy estimate away from the fixes, in m/s.
+
+    Returns:
+        pd.DataFrame: A `time` column (seconds since the media start) and the columns of GEOTAG_COLUMNS.
+
+    Example:
+        frames = geotag(instance, 'video')
+        table = features.instance_features(instance, 'accelerometer')
+        table[GEOTAG_COLUMNS] = geotag(instance, (table['start_time'] + table['end_time']) / 2)[GEOTAG_COLUMNS]
+    '''
+    times = alignment.timeline(instance, target)
+    fixes = _fixes(instance.geolocation_points, instance.media_start_time)
+    df = pd.DataFrame(interpolate(*fixes, times, max_gap_s, max_edge_s, drift_mps), columns=GEOTAG_COLUMNS, copy=False)
+    df.insert(0, 'time', times)
+    return df
+
+
+def geotag_sensors(instance, sensors=None, max_gap_s: float = MAX_GAP_S, max_edge_s: float = MAX_EDGE_S,
+                   drift_mps: float = DRIFT_MPS) -> dict:
+    '''
+    Interpolates the GPS track of an instance at every sample of its sensor streams.
+
+    Args:
+        sensors (str or list, optional): Modalities ('sensors3'), raw sensor names or canonical sensor types.
+            Defaults to every sensor.
+
+    Returns:
+        dict: {sensor name: DataFrame with the index of the sensor DataFrame, its 'Datetime UTC' and
+        the columns of GEOTAG_COLUMNS}.
+    '''
+    fixes = _fixes(instance.geolocation_points, instance.media_start_time)
+
+    result = {}
+    for name, df, _ in alignment.select_streams(instance, sensors, constants.SENSOR_ATTRIBUTES, strict=False):
+        times = utils.seconds_since(df, instance.media_start_time)
+        values = interpolate(*fixes, times, max_gap_s, max_edge_s, drift_mps)
+        tagged = pd.DataFrame(values, index=df.index, columns=GEOTAG_COLUMNS, copy=False)
+        tagged.insert(0, 'Datetime UTC', df['Datetime UTC'])
+        result[name] = tagged
+    return result
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from scipy import sparse
+
+from sideseeing_tools import constants, utils
+
+
+def _load_taxonomy(taxonomy):
+    if taxonomy is None:
+        return []
+    if isinstance(taxonomy, str):
+        taxonomy = utils.load_csv_data(taxonomy, fieldnames=constants.LABELS_FILE_FIELDNAMES)
+    return [(t['category'], t['tag']) for t in taxonomy]
+
+
+class LabelIndex:
+    '''
+    An inverted index over the labels (`labels.txt`/`labels.csv`) of a dataset.
+
+    It keeps a sparse instance x tag matrix, where each cell counts how many times
+    the instance carries the tag, and the tag -> instances postings derived from it.
+    Tags are (category, tag) pairs; the taxonomy tags come first, in file order,
+    followed by the tags found only in the labels.
+
+    Args:
+        labels (dict): Maps each instance name to its list of {'category', 'tag'} dicts, or None if unlabeled.
+        taxonomy (str or list, optional): The taxonomy file path or its loaded rows.
+
+    Example:
+        index = LabelIndex.from_dataset(ds, taxonomy='./my-project/taxonomy.csv')
+        index.frequencies()
+        index.cooccurrence('surface type', 'pavement condition')
+        index.search(all_of=['obstacles,pole'], none_of=['pothole'])
+    '''
+    def __init__(self, labels: dict, taxonomy=None):
+        self.taxonomy = _load_taxonomy(taxonomy)
+        self.instance_names = list(labels.keys())
+        self.unlabeled = [name for name, label in labels.items() if label is None]
+
+        self.tags = list(dict.fromkeys(self.taxonomy))
+        positions = {tag: ind for ind, tag in enumerate(self.tags)}
+
+        rows, cols = [], []
+        for row, label in enumerate(labels.values()):
+            for l in label or []:
+                tag = (l['category'], l['tag'])
+                if tag not in positions:
+                    positions[tag] = len(self.tags)
+                    self.tags.append(tag)
+                rows.append(row)
+                cols.append(positions[tag])
+
+        self.counts = sparse.csr_matrix(
+            (np.ones(len(rows), dtype='int32'), (rows, cols)),
+            shape=(len(self.instance_names), len(self.tags)),
+        )
+        self.matrix = (self.counts > 0).astype('int32').tocsr()
+
+        by_tag = self.matrix.tocsc()
+        self.postings = {
+            tag: by_tag.indices[by_tag.indptr[ind]:by_tag.indptr[ind + 1]].copy()
+            for ind, tag in enumerate(self.tags)
+        }
+        self._positions = positions
+
+    @classmethod
+    def from_dataset(cls, dataset, taxonomy=None):
+        labels = {instance.name: getattr(instance, 'label', None) for instance in dataset.iterator}
+        return cls(labels, taxonomy)
+
+    @property
+    def categories(self):
+        return list(dict.fromkeys(category for category, _ in self.tags))
+
+    def category_tags(self, category: str, taxonomy_only: bool = False) -> list:
+        '''
+        Returns the tags of a category, optionally limited to the taxonomy.
+        '''
+        tags = self.taxonomy if taxonomy_only else self.tags
+        return list(dict.fromkeys(t for c, t in tags if c == category))
+
+    def frequencies(self) -> pd.Series:
+        '''
+        Counts the occurrences of each (category, tag) in the dataset.
+        '''
+        counts = np.asarray(self.counts.sum(axis=0)).ravel()
+        index = pd.MultiIndex.from_tuples(self.tags, names=['category', 'tag'])
+        return pd.Series(counts, index=index, name='Frequency')
+
+    def cooccurrence(self, primary_category: str, secondary_category: str) -> pd.DataFrame:
+        '''
+        Counts, for each pair of taxonomy tags, the occurrences of the secondary tag in
+        instances labeled with the primary tag.
+
+        Returns:
+            pd.DataFrame: Secondary tags as rows and primary tags as columns.
+        '''
+        primary = self.category_tags(primary_category, taxonomy_only=True)
+        secondary = self.category_tags(secondary_category, taxonomy_only=True)
+
+        p_cols = [self._positions[(primary_category, t)] for t in primary]
+        s_cols = [self._positions[(secondary_category, t)] for t in secondary]
+
+        product = (self.counts[:, s_cols].T @ self.matrix[:, p_cols]).toarray()
+        return pd.DataFrame(product, index=secondary, columns=primary)
+
+    def _tag_postings(self, tag: str):
+        if ',' in tag:
+            key = tuple(t.strip() for t in tag.split(',', 1))
+            return self.postings.get(key, np.empty(0, dtype='int32'))
+
+        found = [p for (_, t), p in self.postings.items() if t == tag]
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype='int32')
+
+    def search(self, all_of=None, any_of=None, none_of=None) -> list:
+        '''
+        Finds instances by their labels using set operations over the postings.
+
+        Args:
+            all_of (str or list): Tags that must all be present, as 'tag' or 'category,tag'.
+            any_of (str or list): Tags of which at least one must be present.
+            none_of (str or list): Tags that must be absent.
+
+        Returns:
+            list: The matching instance names.
+        '''
+        result = np.arange(len(self.instance_names))
+
+        for tag in utils.as_list(all_of):
+            result = np.intersect1d(result, self._tag_postings(tag), assume_unique=True)
+
+        if any_of is not None:
+            matches = [self._tag_postings(tag) for tag in utils.as_list(any_of)]
+            union = np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype='int32')
+            result = np.intersect1d(result, union, assume_unique=True)
+
+        for tag in utils.as_list(none_of):
+            result = np.setdiff1d(result, self._tag_postings(tag), assume_unique=True)
+
+        return [self.instance_names[ind] for ind in result]
+
+    def __str__(self):
+        return f'SSLabelIndex[instances: {len(self.instance_names)}, tags: {len(self.tags)}]'
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,3 +1,4 @@
+import logging
 import os
 
 import imageio
@@ -7,6 +8,9 @@ import cv2
 from moviepy import VideoFileClip
 
 
+logger = logging.getLogger(__name__)
+
+
 def extract_audio(source_path: str, target_path: str, sample_rate=44100, channels=2, codec='pcm_s16le', overwrite=False):
     '''
     Extracts audio in WAV format from a video file.
@@ -20,7 +24,7 @@ def extract_audio(source_path: str, target_path: str, sample_rate=44100, channel
     wav_path = os.path.join(target_dir, mp4_name.replace('.mp4', '.wav'))
 
     if not os.path.exists(wav_path) or overwrite:
-        print(f'INFO. Extracting WAV from {source_path} to {wav_path}.')
+        logger.info('Extracting WAV from %s to %s.', source_path, wav_path)
         clip = VideoFileClip(source_path)
         clip.audio.write_audiofile(wav_path, fps=sample_rate, nbytes=2, codec=codec, ffmpeg_params=["-ac", str(channels)])
         clip.close()
@@ -41,7 +45,7 @@ def extract_gif(source_path: str, target_path: str, target_width=300, target_fps
     gif_path = os.path.join(target_dir, mp4_name.replace('.mp4', '.gif'))
 
     if not os.path.exists(gif_path):
-        print(f'INFO. Extracting GIF from {source_path} to {gif_path}.')
+        logger.info('Extracting GIF from %s to %s.', source_path, gif_path)
 
         cap = cv2.VideoCapture(source_path)
         original_fps = cap.get(cv2.CAP_PROP_FPS)
@@ -82,16 +86,53 @@ def extract_video_snippet(source_path, start_second, end_second, output_path):
         snippet.write_videofile(output_path)
 
     except FileNotFoundError:
-        print(f'ERROR. Source file not found. Check the file path {source_path}.')
+        logger.error('Source file not found. Check the file path %s.', source_path)
 
     except Exception as e:
-        print(f'Error occurred: {str(e)}')
+        logger.error('Error occurred: %s', e)
 
     finally:
         if 'snippet' in locals():
             snippet.close()
 
 
+def get_video_info(source_path):
+    '''
+    Reads the frame rate, frame count and frame size of a video file.
+
+    Args:
+        source_path (str): Path to the source video file.
+
+    Returns:
+        dict: The keys `fps`, `frame_count`, `width`, `height` and `duration` (seconds), or None if the video cannot be read.
+    '''
+    info = None
+    try:
+        cap = cv2.VideoCapture(source_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        if cap.isOpened() and fps > 0:
+            info = {
+                'fps': fps,
+                'frame_count': frame_count,
+                'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                'duration': frame_count / fps,
+            }
+        else:
+            logger.warning('Could not read the frame rate of %s.', source_path)
+
+    except Exception as e:
+        logger.error('Error occurred: %s', e)
+
+    finally:
+        if 'cap' in locals():
+            cap.release()
+
+    return info
+
+
 def extract_frames_at_times(source_path, frame_times: list, target_dir=None, prefix='', left_zeros=5):
     '''
     Extracts frames from a video file at the specified time points and saves them as image files.
@@ -131,10 +172,10 @@ def extract_frames_at_times(source_path, frame_times: list, target_dir=None, pre
                 break
 
     except FileNotFoundError:
-        print(f'ERROR. Source file not found. Check the file path {source_path}.')
+        logger.error('Source file not found. Check the file path %s.', source_path)
 
     except Exception as e:
-        print(f'Error occurred: {str(e)}')
+        logger.error('Error occurred: %s', e)
 
     finally:
         if 'cap' in locals():
@@ -182,10 +223,10 @@ def extract_frames_at_positions(source_path, frame_positions: list, target_dir=N
                 break
 
     except FileNotFoundError:
-        print(f'ERROR. Source file not found. Check the file path {source_path}.')
+        logger.error('Source file not found. Check the file path %s.', source_path)
 
     except Exception as e:
-        print(f'Error occurred: {str(e)}')
+        logger.error('Error occurred: %s', e)
 
     finally:
         if 'cap' in locals():
@@ -251,10 +292,10 @@ def extract_frames_timespan(source_path, start_time, end_time, target_dir=None,
                 break
 
     except FileNotFoundError:
-        print(f'ERROR. Source file not found. Check the file path {source_path}.')
+        logger.error('Source file not found. Check the file path %s.', source_path)
 
     except Exception as e:
-        print(f'Error occurred: {str(e)}')
+        logger.error('Error occurred: %s', e)
 
     finally:
         if 'cap' in locals():
@@ -304,7 +345,7 @@ def extract_frames_positionspan(source_path, start_frame, end_frame, target_dir=
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         if end_frame > total_frames:
             end_frame = total_frames
-            print(f'WARNING. End frame position is greater than the total number of frames. Setting end frame to {total_frames}.')
+            logger.warning('End frame position is greater than the total number of frames. Setting end frame to %s.', total_frames)
 
         frame_positions = [i for i in range(start_frame, end_frame, step)]
 
@@ -325,10 +366,10 @@ def extract_frames_positionspan(source_path, start_frame, end_frame, target_dir=
                 break
 
     except FileNotFoundError:
-        print(f'ERROR. Source file not found. Check the file path {source_path}.')
+        logger.error('Source file not found. Check the file path %s.', source_path)
 
     except Exception as e:
-        print(f'Error occurred: {str(e)}')
+        logger.error('Error occurred: %s', e)
 
     finally:
         if 'cap' in locals():
@@ -393,10 +434,10 @@ def extract_frames(source_path, target_dir=None, step=None, prefix='', left_zero
                 break
 
     except FileNotFoundError:
-        print(f'ERROR. Source file not found. Check the file path {source_path}.')
+        logger.error('Source file not found. Check the file path %s.', source_path)
 
     except Exception as e:
-        print(f'Error occurred: {str(e)}')
+        logger.error('Error occurred: %s', e)
 
     finally:
         if 'cap' in locals():
@@ -1,4 +1,5 @@
 import cv2
+import logging
 import folium
 import librosa
 import matplotlib as mpl
@@ -10,6 +11,10 @@ from matplotlib import animation
 
 from sideseeing_tools import constants, media, utils
 from sideseeing_tools import sideseeing as sst
+from sideseeing_tools.labels import LabelIndex
+
+
+logger = logging.getLogger(__name__)
 
 
 class SideSeeingPlotter:
@@ -26,7 +31,7 @@ class SideSeeingPlotter:
         Plots the waveform and the Mel spectrogram for the specified audio file.
         '''
         if not hasattr(instance, 'audio'):
-            print(f'Extracting audio data')
+            logger.info('Extracting audio data')
             instance.audio = media.extract_audio(
                 instance.video, 
                 instance.video.replace('.mp4', '.wav')
@@ -47,29 +52,30 @@ class SideSeeingPlotter:
         plt.tight_layout()
         plt.show()
 
-    def plot_instance_map(self, instance: sst.SideSeeingInstance, titles='OpenStreetMap', zoom_start=14):        
-        points = instance.geolocation_points[['latitude', 'longitude']].values.tolist()
+    def plot_instance_map(self, instance: sst.SideSeeingInstance, titles='OpenStreetMap', zoom_start=14, tolerance_m=1.0):
+        '''
+        Plots the GPS track of an instance on a folium map: the route as a blue line, with markers
+        on the first (red) and last (green) fixes.
+
+        Args:
+            tolerance_m (float, optional): The track is simplified to this tolerance in meters before
+                being drawn (see SideSeeingInstance.simplified_track). None draws every fix.
+        '''
+        gps = instance.geolocation_points if tolerance_m is None else instance.simplified_track(tolerance_m)
+        points = [] if gps is None else gps[['latitude', 'longitude']].values.tolist()
         center = instance.geolocation_center
 
         if len(points) > 0:
             map = folium.Map(location=center, titles=titles, zoom_start=zoom_start)
-            counter = 1
-
-            for lat, lon in points:
-                if counter == 1:
-                    color = 'red'
-                elif counter == len(points):
-                    color = 'green'
-                else:
-                    color = 'blue'
-
-                folium.Marker([lat, lon], icon=folium.Icon(color=color)).add_to(map)
-                counter += 1
+            folium.PolyLine(points, color='blue', weight=2, opacity=0.6).add_to(map)
+            folium.Marker(points[0], icon=folium.Icon(color='red')).add_to(map)
+            if len(points) > 1:
+                folium.Marker(points[-1], icon=folium.Icon(color='green')).add_to(map)
 
             folium.LayerControl().add_to(map)
             return map
         else:
-            print('WARNING. GPS data is missing.')
+            logger.warning('GPS data is missing.')
 
     def plot_instance_video_frames(self, instance: sst.SideSeeingInstance):
         '''
@@ -194,7 +200,7 @@ class SideSeeingPlotter:
 
             if ind == num_sensor_subplots - 1:
                 if not hasattr(instance, 'audio'):
-                    print(f'Extracting audio data')
+                    logger.info('Extracting audio data')
                     instance.audio = media.extract_audio(
                         instance.video, 
                         instance.video.replace('.mp4', '.wav')
@@ -232,30 +238,31 @@ class SideSeeingPlotter:
         plt.tight_layout()
         plt.show()
 
+    @property
+    def label_index(self) -> LabelIndex:
+        '''
+        The label index of the dataset, built on first use.
+        '''
+        if getattr(self, '_label_index', None) is None:
+            self._label_index = LabelIndex.from_dataset(self.dataset, taxonomy=self.categories_and_tags)
+        return self._label_index
+
+    def _warn_unlabeled(self):
+        for name in self.label_index.unlabeled:
+            logger.warning("%s isn't labeled.", name)
+
     def plot_dataset_tags(self):
         if len(self.categories_and_tags) == 0:
-            print('WARNING. There are no categories and tags loaded. Check the taxonomy file.')
+            logger.warning('There are no categories and tags loaded. Check the taxonomy file.')
             return
 
-        labels = {}
-        for l in self.categories_and_tags:
-            cat, tag = l['category'], l['tag']
-            k = f'{cat},{tag}'.replace(' ', '_')
-            labels[k] = 0
+        self._warn_unlabeled()
 
-        for instance in self.dataset.iterator:
-            if not hasattr(instance, 'label'):
-                print(f"WARNING. {instance.name} isn't labeled.")
-            else:
-                for l in instance.label:
-                    cat, tag = l['category'], l['tag']
-                    k = f'{cat},{tag}'.replace(' ', '_')
-                    if k not in labels:
-                        labels[k] = 0
-                    labels[k] += 1
-
-        df = pd.DataFrame.from_dict(data=labels, orient='index', columns=['Frequency'])
-        df = df.fillna(0)
+        frequencies = self.label_index.frequencies()
+        keys = [f'{cat},{tag}'.replace(' ', '_') for cat, tag in frequencies.index]
+
+        df = pd.DataFrame({'Frequency': frequencies.to_numpy()}, index=keys)
+        df = df.groupby(level=0, sort=False).sum()
         df = df.astype(int)
         df = df.sort_values('Frequency', ascending=False)
 
@@ -263,49 +270,17 @@ class SideSeeingPlotter:
     
     def plot_dataset_tags_matrix(self, primary_category, secondary_category):
         if len(self.categories_and_tags) == 0:
-            print('WARNING. There are no categories and tags loaded. Check the taxonomy file.')
+            logger.warning('There are no categories and tags loaded. Check the taxonomy file.')
             return
         
         if primary_category is None or secondary_category is None:
-            print(f'ERROR. You must pass a category name.')
-            print(f'Here are the possibilities: {self.categories_and_tags.keys()}.')
+            logger.error('You must pass a category name.')
+            logger.error('Here are the possibilities: %s.', self.label_index.categories)
             return
 
-        matrix = {}
-
-        for ct in self.categories_and_tags:
-            c = ct['category']
-            t = ct['tag']
-
-            if c == primary_category:
-                matrix[t] = {}
+        self._warn_unlabeled()
 
-        for st in matrix:
-            for ct in self.categories_and_tags:
-                c = ct['category']
-                t = ct['tag']
-
-                if c == secondary_category:
-                    matrix[st][t] = 0
-
-        for instance in self.dataset.iterator:
-            if not hasattr(instance, 'label'):
-                print(f"WARNING. {instance.name} isn't labeled.")
-            else:
-                instance_st = set()
-                for l in instance.label:
-                    cat, tag = l['category'], l['tag']
-                    if cat == primary_category:
-                        instance_st.add(tag)
-
-                for l in instance.label:
-                    cat, tag = l['category'], l['tag']
-                    if cat == secondary_category:
-                        for s in instance_st:
-                            matrix[s][tag] += 1
-
-        df = pd.DataFrame(data=matrix)
-        df = df.fillna(0)
+        df = self.label_index.cooccurrence(primary_category, secondary_category)
         df = df.astype(int)
 
         return df.style.applymap(func=lambda x: 'color: red' if x < 1 else 'color: black')
@@ -409,7 +384,7 @@ class SideSeeingPlotter:
     def plot_dataset_frames_at_times(self, times, show_instance_name=True, show_frame_number=True):
         for instance in self.dataset.iterator:
             if show_instance_name:
-                print(instance.name)
+                logger.info(instance.name)
             self.plot_instance_video_frames_at_times(instance, times=times, show_frame_number=show_frame_number)
 
     def plot_sensor(self, data, time_column, axis_columns, xlim=None, ylim=None, title=None, linewidth=0.75, figsize=(20, 4)):
@@ -0,0 +1,106 @@
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressTracker:
+    '''
+    Tracks a long, dataset-wide operation and reports its progress.
+
+    After each `update` the callback receives a dict with the operation name, the
+    current item, items done/total, accumulated bytes and rows, the elapsed time,
+    the throughput (items, bytes and rows per second) and the estimated time to
+    finish (`eta`, in seconds, or None when the total is unknown).
+
+    Args:
+        operation (str): A short name for the operation, e.g. 'load'.
+        total (int, optional): The number of items expected.
+        callback (callable, optional): Called with the progress dict. If None, progress is logged at DEBUG level.
+        min_interval (float, optional): Minimum number of seconds between two reports. The last one is always sent.
+    '''
+    def __init__(self, operation: str, total: int = None, callback=None, min_interval: float = 0.0):
+        self.operation = operation
+        self.total = total
+        self.callback = callback
+        self.min_interval = min_interval
+        self.items_done = 0
+        self.bytes = 0
+        self.rows = 0
+        self.started_at = time.perf_counter()
+        self._reported_at = None
+
+    def update(self, items: int = 1, bytes: int = 0, rows: int = 0, item=None):
+        '''
+        Registers finished work and reports it.
+        '''
+        self.items_done += items
+        self.bytes += bytes
+        self.rows += rows
+
+        now = time.perf_counter()
+        finished = self.total is not None and self.items_done >= self.total
+        if not finished and self._reported_at is not None and now - self._reported_at < self.min_interval:
+            return
+
+        self._reported_at = now
+        self._report(self.info(item, now))
+
+    def info(self, item=None, now=None) -> dict:
+        now = time.perf_counter() if now is None else now
+        elapsed = now - self.started_at
+        rate = (lambda value: value / elapsed if elapsed > 0 else 0.0)
+
+        eta = None
+        if self.total is not None and self.items_done > 0:
+            eta = elapsed / self.items_done * max(self.total - self.items_done, 0)
+
+        return {
+            'operation': self.operation,
+            'item': item,
+            'items_done': self.items_done,
+            'items_total': self.total,
+            'bytes': self.bytes,
+            'rows': self.rows,
+            'elapsed': elapsed,
+            'items_per_second': rate(self.items_done),
+            'bytes_per_second': rate(self.bytes),
+            'rows_per_second': rate(self.rows),
+            'eta': eta,
+        }
+
+    def _report(self, info):
+        if self.callback is None:
+            logger.debug('%s: %s/%s items done.', info['operation'], info['items_done'], info['items_total'])
+        else:
+            self.callback(info)
+
+
+def track(iterable, operation: str, total: int = None, callback=None):
+    '''
+    Yields the items of `iterable`, reporting one finished item each time the next one is requested.
+    '''
+    tracker = ProgressTracker(operation, total=total, callback=callback)
+    for item in iterable:
+        yield item
+        tracker.update(item=getattr(item, 'name', None))
+
+
+def log_progress(info: dict):
+    '''
+    A progress callback that logs one line per report at INFO level.
+    '''
+    total = info['items_total'] if info['items_total'] is not None else '?'
+    eta = f"{info['eta']:.1f}s" if info['eta'] is not None else 'N/A'
+
+    logger.info(
+        '%s: %s/%s items (%.1f items/s, %.1f MB/s, %.0f rows/s), ETA %s.',
+        info['operation'],
+        info['items_done'],
+        total,
+        info['items_per_second'],
+        info['bytes_per_second'] / 1024**2,
+        info['rows_per_second'],
+        eta,
+    )
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import constants, shared
+
+
+GAP_FACTOR = 3.0
+
+QUALITY_COLUMNS = [
+    'instance', 'modality', 'sensor', 'samples', 'first', 'last', 'duration', 'rate',
+    'interval_ms', 'jitter_p50_ms', 'jitter_p95_ms', 'jitter_p99_ms',
+    'gaps', 'max_gap_ms', 'gap_seconds', 'duplicates', 'out_of_order',
+    'start_offset', 'end_offset', 'coverage',
+]
+
+
+def _gap_threshold(gap_ms, modality, sensor):
+    if not isinstance(gap_ms, dict):
+        return gap_ms
+    for key in (sensor, modality, 'default'):
+        if key in gap_ms:
+            return gap_ms[key]
+    return None
+
+
+def stream_quality(datetimes, media_start_time, media_stop_time, gap_ms: float = None, event_ns=None) -> dict:
+    '''
+    Computes timing quality measures of one stream, with array operations only.
+
+    Args:
+        datetimes (array): The 'Datetime UTC' values, in row order.
+        media_start_time (datetime): Start of the media window.
+        media_stop_time (datetime): End of the media window.
+        gap_ms (float, optional): Intervals longer than this, in milliseconds, count as gaps.
+            Defaults to GAP_FACTOR times the median interval of the stream.
+        event_ns (array, optional): Event timestamps in nanoseconds (the sensor 'timestamp_nano'), in row order.
+            Out-of-order rows are detected on them only: the loaders sort every stream by 'Datetime UTC',
+            so `datetimes` are always in order.
+
+    Returns:
+        dict: `samples`; `first`, `last` and `duration` (seconds); `rate` (samples per second);
+        `interval_ms` (median interval) and `jitter_p50_ms`/`jitter_p95_ms`/`jitter_p99_ms`
+        (percentiles of the absolute deviation of the intervals from the median); `gaps`,
+        `max_gap_ms` and `gap_seconds` (intervals longer than `gap_ms`); `duplicates` (repeated
+        timestamps); `out_of_order` (event timestamps earlier than the previous row, NaN without `event_ns`); `start_offset`
+        and `end_offset` (seconds between the media start/stop and the first/last sample)
+        and `coverage`, the fraction of the media window with samples and no gaps.
+    '''
+    ns = np.asarray(datetimes, dtype='datetime64[ns]').view('int64')
+    start = np.datetime64(pd.Timestamp(media_start_time), 'ns').view('int64')
+    stop = np.datetime64(pd.Timestamp(media_stop_time), 'ns').view('int64')
+    window = max((stop - start) / 1e9, 0.0)
+
+    result = {column: np.nan for column in QUALITY_COLUMNS[3:]}
+    result.update({'samples': len(ns), 'first': pd.NaT, 'last': pd.NaT, 'gaps': 0, 'duplicates': 0, 'coverage': 0.0})
+    if event_ns is not None:
+        result['out_of_order'] = int((np.diff(np.asarray(event_ns, dtype='int64')) < 0).sum())
+    if len(ns) == 0:
+        return result
+
+    ns = np.sort(ns)
+    first, last = ns[0], ns[-1]
+    result['first'] = pd.Timestamp(first)
+    result['last'] = pd.Timestamp(last)
+    result['duration'] = (last - first) / 1e9
+    result['start_offset'] = (first - start) / 1e9
+    result['end_offset'] = (stop - last) / 1e9
+
+    intervals = np.diff(ns) / 1e6
+    result['duplicates'] = int((intervals == 0).sum())
+    if len(intervals) == 0:
+        return result
+
+    if result['duration'] > 0:
+        result['rate'] = (len(ns) - 1) / result['duration']
+
+    median = np.median(intervals)
+    result['interval_ms'] = median
+    result['jitter_p50_ms'], result['jitter_p95_ms'], result['jitter_p99_ms'] = np.percentile(np.abs(intervals - median), [50, 95, 99])
+
+    gaps = intervals > (GAP_FACTOR * median if gap_ms is None else gap_ms)
+    result['gaps'] = int(gaps.sum())
+    result['max_gap_ms'] = intervals.max()
+
+    lo = np.clip(ns[:-1], start, stop)
+    hi = np.clip(ns[1:], start, stop)
+    gap_ns = ((hi - lo) * gaps).sum()
+    result['gap_seconds'] = gap_ns / 1e9
+
+    covered = max(min(last, stop) - max(first, start), 0) - gap_ns
+    result['coverage'] = covered / 1e9 / window if window > 0 else 0.0
+    return result
+
+
+def instance_quality(instance, gap_ms=None) -> pd.DataFrame:
+    '''
+    Runs `stream_quality` on every sensor stream, the GPS track and the consumption readings of
+    an instance.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        gap_ms (float or dict, optional): The gap threshold in milliseconds, or a dict mapping sensor
+            names or modalities (and 'default') to thresholds. By default, and for streams missing
+            from the dict, the threshold is GAP_FACTOR times the median interval of each stream.
+
+    Returns:
+        pd.DataFrame: One row per stream with the columns of QUALITY_COLUMNS.
+    '''
+    streams = []
+    for attr in constants.SENSOR_ATTRIBUTES:
+        for name, df in (getattr(instance, attr, None) or {}).items():
+            streams.append((attr, name, df))
+    for attr in constants.TABLE_ATTRIBUTES:
+        df = getattr(instance, attr, None)
+        if df is not None and not df.empty:
+            streams.append((attr, attr, df))
+
+    rows = []
+    for attr, name, df in streams:
+        event_ns = None
+        if 'timestamp_nano' in df.columns:
+            events = pd.to_numeric(df['timestamp_nano'], errors='coerce')
+            if events.notna().all() and (events >= 0).all():
+                event_ns = events.to_numpy(dtype='int64')
+
+        measures = stream_quality(
+            df['Datetime UTC'].to_numpy(), instance.media_start_time, instance.media_stop_time,
+            _gap_threshold(gap_ms, attr, name), event_ns,
+        )
+        rows.append({'instance': instance.name, 'modality': attr, 'sensor': name, **measures})
+
+    return pd.DataFrame(rows, columns=QUALITY_COLUMNS)
+
+
+def dataset_quality(dataset, gap_ms=None, max_workers: int = 1, progress_callback=None) -> pd.DataFrame:
+    '''
+    Scans every instance of a dataset (see `instance_quality`) and returns one table. With
+    `max_workers` > 1 instances are scanned in worker processes through shared memory
+    (see shared.map_shared).
+
+    Example:
+        quality = dataset_quality(ds, gap_ms={'default': 50, 'geolocation_points': 20000}, max_workers=8)
+        quality[(quality['coverage'] < 0.9) | (quality['out_of_order'] > 0)]
+    '''
+    tables = shared.map_shared(
+        instance_quality, dataset.iterator, gap_ms,
+        max_workers=max_workers, progress_callback=progress_callback,
+    )
+    tables = [t for t in tables if len(t)]
+    if not tables:
+        return pd.DataFrame(columns=QUALITY_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,541 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools.spatial import grid_cells, grid_center, grid_key
+
+
+OBSERVATION_COLUMNS = ['bssid', 'ssid', 'instance', 'time', 'seconds', 'latitude', 'longitude', 'level', 'frequency']
+
+SCAN_COLUMNS = ['instance', 'time', 'latitude', 'longitude']
+
+
+def _nearest_positions(times: pd.Series, gps: pd.DataFrame, tolerance_s: float) -> pd.DataFrame:
+    '''
+    Pairs each timestamp with the GPS fix nearest in time, within `tolerance_s` seconds.
+    Returns a DataFrame aligned with `times` with the columns `latitude` and `longitude` (NaN when no fix is close enough).
+    '''
+    left = pd.DataFrame({'Datetime UTC': pd.to_datetime(times).astype('datetime64[ns]'), '_row': np.arange(len(times))})
+
+    if gps is None or gps.empty:
+        left['latitude'] = np.nan
+        left['longitude'] = np.nan
+        return left[['latitude', 'longitude']]
+
+    right = gps[['Datetime UTC', 'latitude', 'longitude']].dropna().copy()
+    right['Datetime UTC'] = right['Datetime UTC'].astype('datetime64[ns]')
+
+    merged = pd.merge_asof(
+        left.sort_values('Datetime UTC'),
+        right.sort_values('Datetime UTC'),
+        on='Datetime UTC',
+        direction='nearest',
+        tolerance=pd.Timedelta(seconds=tolerance_s),
+    )
+    return merged.sort_values('_row')[['latitude', 'longitude']].reset_index(drop=True)
+
+
+class WifiIndex:
+    '''
+    A dataset-wide BSSID -> (instance, time, position, RSSI) index over Wi-Fi scans.
+
+    Observations are kept sorted by BSSID with an offsets array, so the postings of an
+    access point are one binary search away. Each scan (the networks an instance saw
+    at the same timestamp) is paired with the nearest GPS fix in time.
+
+    Args:
+        tolerance_s (float): Maximum time distance, in seconds, between a scan and the GPS fix used as its position.
+
+    Example:
+        index = WifiIndex.from_dataset(ds)
+        index.lookup('88:00:33:77:a9:34')
+        index.access_points()
+        index.locate({'88:00:33:77:a9:34': -70, '14:51:20:da:e8:ec': -80}, k=3)
+    '''
+    def __init__(self, tolerance_s: float = 10.0):
+        self.tolerance_s = tolerance_s
+        self.instance_names = []
+        self.bssids = np.empty(0, dtype=str)
+        self._offsets = np.zeros(1, dtype='int64')
+        self.observations = pd.DataFrame(columns=OBSERVATION_COLUMNS + ['scan'])
+        self.scans = pd.DataFrame(columns=SCAN_COLUMNS + ['size'])
+
+    @classmethod
+    def from_dataset(cls, dataset, tolerance_s: float = 10.0):
+        index = cls(tolerance_s)
+        index._build(dataset.iterator)
+        return index
+
+    @property
+    def size(self):
+        return len(self.observations)
+
+    def _build(self, instances):
+        observations, scans = [], []
+        scan_offset = 0
+
+        for instance in instances:
+            wifi = getattr(instance, 'wifi_networks', None)
+            if wifi is None or wifi.empty:
+                continue
+
+            wifi = wifi.dropna(subset=['BSSID'])
+            if wifi.empty:
+                continue
+
+            code = len(self.instance_names)
+            self.instance_names.append(instance.name)
+
+            times = pd.to_datetime(wifi['Datetime UTC']).astype('datetime64[ns]')
+            scan_times = np.unique(times.to_numpy())
+            positions = _nearest_positions(pd.Series(scan_times), instance.geolocation_points, self.tolerance_s)
+            scan_ids = np.searchsorted(scan_times, times.to_numpy())
+
+            scans.append(pd.DataFrame({
+                'instance': code,
+                'time': scan_times,
+                'latitude': positions['latitude'].to_numpy(),
+                'longitude': positions['longitude'].to_numpy(),
+                'size': np.bincount(scan_ids, minlength=len(scan_times)),
+            }))
+
+            observations.append(pd.DataFrame({
+                'bssid': wifi['BSSID'].astype(str).str.lower().to_numpy(),
+                'ssid': wifi['SSID'].fillna('').astype(str).to_numpy(),
+                'instance': code,
+                'time': times.to_numpy(),
+                'seconds': (times - pd.Timestamp(instance.media_start_time)).dt.total_seconds().to_numpy(),
+                'latitude': positions['latitude'].to_numpy()[scan_ids],
+                'longitude': positions['longitude'].to_numpy()[scan_ids],
+                'level': pd.to_numeric(wifi['level'], errors='coerce').to_numpy(dtype='float64'),
+                'frequency': pd.to_numeric(wifi['frequency'], errors='coerce').to_numpy(dtype='float64'),
+                'scan': scan_ids + scan_offset,
+            }))
+            scan_offset += len(scan_times)
+
+        if not observations:
+            return
+
+        df = pd.concat(observations, ignore_index=True)
+        df = df.sort_values(['bssid', 'time'], kind='stable').reset_index(drop=True)
+        self._set(df, pd.concat(scans, ignore_index=True))
+
+    def _set(self, observations, scans):
+        self.observations = observations
+        self.scans = scans
+
+        bssids = observations['bssid'].to_numpy(dtype=str)
+        self.bssids, starts = np.unique(bssids, return_index=True)
+        self._offsets = np.append(starts, len(bssids)).astype('int64')
+
+    def _postings(self, bssid: str):
+        bssid = bssid.lower()
+        pos = np.searchsorted(self.bssids, bssid)
+        if pos == len(self.bssids) or self.bssids[pos] != bssid:
+            return np.empty(0, dtype='int64')
+        return np.arange(self._offsets[pos], self._offsets[pos + 1])
+
+    def lookup(self, bssid: str) -> pd.DataFrame:
+        '''
+        Returns where and when an access point was seen: one row per observation with
+        the instance, time, seconds since the media start, position and RSSI level.
+        '''
+        rows = self.observations.iloc[self._postings(bssid)].copy()
+        rows['instance'] = [self.instance_names[c] for c in rows['instance']]
+        return rows[OBSERVATION_COLUMNS].reset_index(drop=True)
+
+    def access_points(self) -> pd.DataFrame:
+        '''
+        Aggregates the observations per access point.
+
+        The estimated location is the centroid of the scan positions weighted by the
+        received power (10^(level/10)), so nearby, strong observations dominate.
+
+        Returns:
+            pd.DataFrame: Indexed by BSSID, with `ssid`, `frequency`, `observations`, `instances`,
+            `first_seen`, `last_seen`, `mean_level`, `max_level`, `latitude` and `longitude`.
+        '''
+        df = self.observations
+        grouped = df.groupby('bssid', sort=True)
+
+        aggregates = pd.DataFrame({
+            'ssid': grouped['ssid'].agg(lambda s: s.value_counts().index[0]),
+            'frequency': grouped['frequency'].median(),
+            'observations': grouped.size(),
+            'instances': grouped['instance'].nunique(),
+            'first_seen': grouped['time'].min(),
+            'last_seen': grouped['time'].max(),
+            'mean_level': grouped['level'].mean(),
+            'max_level': grouped['level'].max(),
+        })
+
+        located = df.dropna(subset=['latitude', 'longitude', 'level'])
+        weights = np.power(10.0, located['level'].to_numpy() / 10.0)
+        sums = pd.DataFrame({
+            'bssid': located['bssid'].to_numpy(),
+            'w': weights,
+            'wlat': weights * located['latitude'].to_numpy(),
+            'wlon': weights * located['longitude'].to_numpy(),
+        }).groupby('bssid').sum()
+
+        aggregates['latitude'] = sums['wlat'] / sums['w']
+        aggregates['longitude'] = sums['wlon'] / sums['w']
+        aggregates.index.name = 'bssid'
+        return aggregates
+
+    def locate(self, observed, k: int = 5, min_matches: int = 1) -> pd.DataFrame:
+        '''
+        Finds the scans whose fingerprint best matches a set of observed access points.
+
+        Scans are ranked by the Jaccard similarity between the observed BSSIDs and the
+        scan's BSSIDs and, on ties, by the mean absolute RSSI difference over the shared
+        access points. Only scans with a GPS position are returned.
+
+        Args:
+            observed (dict or list): {bssid: level} or just the BSSIDs.
+            k (int): Maximum number of scans to return.
+            min_matches (int): Minimum number of shared access points.
+
+        Returns:
+            pd.DataFrame: `instance`, `time`, `latitude`, `longitude`, `matches`, `similarity` and `rssi_error`.
+        '''
+        if not isinstance(observed, dict):
+            observed = {b: np.nan for b in observed}
+
+        rows, levels = [], []
+        for bssid, level in observed.items():
+            postings = self._postings(bssid)
+            rows.append(postings)
+            levels.append(np.full(len(postings), np.nan if level is None else level, dtype='float64'))
+
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype='int64')
+        columns = ['instance', 'time', 'latitude', 'longitude', 'matches', 'similarity', 'rssi_error']
+        if len(rows) == 0:
+            return pd.DataFrame(columns=columns)
+
+        matched = pd.DataFrame({
+            'scan': self.observations['scan'].to_numpy()[rows],
+            'error': np.abs(self.observations['level'].to_numpy()[rows] - np.concatenate(levels)),
+        })
+        result = matched.groupby('scan').agg(matches=('scan', 'size'), rssi_error=('error', 'mean'))
+        result = result[result['matches'] >= min_matches]
+
+        scans = self.scans.iloc[result.index.to_numpy()]
+        result['similarity'] = result['matches'] / (len(observed) + scans['size'].to_numpy() - result['matches'])
+        result['instance'] = [self.instance_names[c] for c in scans['instance']]
+        result['time'] = scans['time'].to_numpy()
+        result['latitude'] = scans['latitude'].to_numpy()
+        result['longitude'] = scans['longitude'].to_numpy()
+
+        result = result.dropna(subset=['latitude', 'longitude'])
+        result = result.sort_values(['similarity', 'rssi_error'], ascending=[False, True], kind='stable', na_position='last')
+        return result[columns].head(k).reset_index(drop=True)
+
+    def save(self, path: str):
+        '''
+        Saves the index to a NumPy .npz file.
+        '''
+        obs = self.observations
+        np.savez_compressed(
+            path,
+            tolerance_s=self.tolerance_s,
+            instance_names=np.array(self.instance_names, dtype=str),
+            bssid=obs['bssid'].to_numpy(dtype=str),
+            ssid=obs['ssid'].to_numpy(dtype=str),
+            instance=obs['instance'].to_numpy(dtype='int32'),
+            time=obs['time'].to_numpy(dtype='datetime64[ns]').view('int64'),
+            seconds=obs['seconds'].to_numpy(dtype='float64'),
+            latitude=obs['latitude'].to_numpy(dtype='float64'),
+            longitude=obs['longitude'].to_numpy(dtype='float64'),
+            level=obs['level'].to_numpy(dtype='float64'),
+            frequency=obs['frequency'].to_numpy(dtype='float64'),
+            scan=obs['scan'].to_numpy(dtype='int64'),
+            scan_instance=self.scans['instance'].to_numpy(dtype='int32'),
+            scan_time=self.scans['time'].to_numpy(dtype='datetime64[ns]').view('int64'),
+            scan_latitude=self.scans['latitude'].to_numpy(dtype='float64'),
+            scan_longitude=self.scans['longitude'].to_numpy(dtype='float64'),
+            scan_size=self.scans['size'].to_numpy(dtype='int64'),
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        '''
+        Loads an index saved with `save`.
+        '''
+        with np.load(path) as data:
+            index = cls(float(data['tolerance_s']))
+            index.instance_names = [str(n) for n in data['instance_names']]
+            if len(data['bssid']) == 0:
+                return index
+
+            observations = pd.DataFrame({
+                col: data[col] for col in ['bssid', 'ssid', 'instance', 'seconds', 'latitude', 'longitude', 'level', 'frequency', 'scan']
+            })
+            observations.insert(3, 'time', data['time'].view('datetime64[ns]'))
+            scans = pd.DataFrame({
+                'instance': data['scan_instance'],
+                'time': data['scan_time'].view('datetime64[ns]'),
+                'latitude': data['scan_latitude'],
+                'longitude': data['scan_longitude'],
+                'size': data['scan_size'],
+            })
+            observations['bssid'] = observations['bssid'].astype(object)
+            observations['ssid'] = observations['ssid'].astype(object)
+            index._set(observations, scans)
+        return index
+
+    def __str__(self):
+        return f'SSWifiIndex[access_points: {len(self.bssids)}, observations: {self.size}]'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+CELL_KEY = ['mcc', 'mnc', 'lac', 'cid']
+
+CELL_OBSERVATION_COLUMNS = CELL_KEY + ['operator', 'instance', 'time', 'seconds', 'latitude', 'longitude', 'ss', 'level', 'registered']
+
+# Android reports Integer.MAX_VALUE for identity fields that are unavailable.
+CELL_UNAVAILABLE = 2147483647
+
+
+class CellIndex:
+    '''
+    A dataset-wide index of cell observations keyed by full cell identity (mcc, mnc, lac, cid).
+
+    Each observation is positioned with the nearest GPS fix in time. Positioned
+    observations are also binned on a metric grid of `cell_size_m` meters (the same
+    grid as spatial.GeoIndex, see spatial.grid_cells), giving every cell a coarse
+    coverage footprint with signal statistics per grid square. Footprints are sorted
+    by grid key, so area queries only touch the grid rows they overlap.
+
+    Rows with missing, masked or unavailable (2147483647) identity fields are skipped.
+
+    Args:
+        tolerance_s (float): Maximum time distance, in seconds, between an observation and its GPS fix.
+        cell_size_m (float): The footprint grid size in meters.
+
+    Example:
+        cells = CellIndex.from_dataset(ds)
+        cells.cells()
+        cells.footprint(724, 5, 3, 1)
+        cells.coverage(-23.56, -46.74, -23.55, -46.73)
+    '''
+    def __init__(self, tolerance_s: float = 10.0, cell_size_m: float = 200.0):
+        self.tolerance_s = tolerance_s
+        self.cell_size_m = float(cell_size_m)
+        self.ref_latitude = None
+        self.instance_names = []
+        self._set(pd.DataFrame(columns=CELL_OBSERVATION_COLUMNS))
+
+    @classmethod
+    def from_dataset(cls, dataset, tolerance_s: float = 10.0, cell_size_m: float = 200.0):
+        index = cls(tolerance_s, cell_size_m)
+        index._build(dataset.iterator)
+        return index
+
+    @property
+    def size(self):
+        return len(self.observations)
+
+    def _build(self, instances):
+        observations = []
+
+        for instance in instances:
+            cell = getattr(instance, 'cell_networks', None)
+            if cell is None or cell.empty:
+                continue
+
+            key = cell[CELL_KEY].apply(pd.to_numeric, errors='coerce')
+            valid = key.notna().all(axis=1) & (key != CELL_UNAVAILABLE).all(axis=1)
+            cell, key = cell[valid], key[valid].astype('int64')
+            if cell.empty:
+                continue
+
+            code = len(self.instance_names)
+            self.instance_names.append(instance.name)
+
+            times = pd.to_datetime(cell['Datetime UTC']).astype('datetime64[ns]')
+            positions = _nearest_positions(times.reset_index(drop=True), instance.geolocation_points, self.tolerance_s)
+
+            df = key.reset_index(drop=True)
+            df['operator'] = cell['alpha_short'].fillna('').astype(str).to_numpy()
+            df['instance'] = code
+            df['time'] = times.to_numpy()
+            df['seconds'] = (times - pd.Timestamp(instance.media_start_time)).dt.total_seconds().to_numpy()
+            df['latitude'] = positions['latitude'].to_numpy()
+            df['longitude'] = positions['longitude'].to_numpy()
+            df['ss'] = pd.to_numeric(cell['ss'], errors='coerce').to_numpy(dtype='float64')
+            df['level'] = pd.to_numeric(cell['level'], errors='coerce').to_numpy(dtype='float64')
+            df['registered'] = cell['registered'].fillna(False).astype(bool).to_numpy()
+            observations.append(df)
+
+        if not observations:
+            return
+
+        self._set(pd.concat(observations, ignore_index=True))
+
+    def _set(self, observations):
+        observations = observations.sort_values(CELL_KEY + ['time'], kind='stable').reset_index(drop=True)
+        self.identities = observations[CELL_KEY].drop_duplicates().reset_index(drop=True)
+        self._codes = {tuple(int(v) for v in row): ind for ind, row in enumerate(self.identities.itertuples(index=False))}
+
+        cell_code = observations.groupby(CELL_KEY, sort=True).ngroup().to_numpy(dtype='int64') if len(observations) else np.empty(0, dtype='int64')
+        observations['cell'] = cell_code
+        self.observations = observations
+        self._offsets = np.searchsorted(cell_code, np.arange(len(self.identities) + 1)).astype('int64')
+
+        located = observations.dropna(subset=['latitude', 'longitude'])
+        if self.ref_latitude is None and not located.empty:
+            self.ref_latitude = float(located['latitude'].mean())
+
+        if located.empty:
+            self.footprints = pd.DataFrame(columns=['cell', 'key', 'cx', 'cy', 'observations', 'mean_ss', 'max_ss'])
+            return
+
+        cx, cy = grid_cells(located['latitude'].to_numpy(), located['longitude'].to_numpy(), self.cell_size_m, self.ref_latitude)
+        grid = pd.DataFrame({'cell': located['cell'].to_numpy(), 'cx': cx, 'cy': cy, 'ss': located['ss'].to_numpy()})
+        footprints = grid.groupby(['cell', 'cx', 'cy']).agg(
+            observations=('ss', 'size'), mean_ss=('ss', 'mean'), max_ss=('ss', 'max'),
+        ).reset_index()
+        footprints['key'] = grid_key(footprints['cx'].to_numpy(dtype='int64'), footprints['cy'].to_numpy(dtype='int64'))
+        self.footprints = footprints.sort_values('key', kind='stable').reset_index(drop=True)
+
+    def _code(self, mcc, mnc, lac, cid):
+        return self._codes.get((int(mcc), int(mnc), int(lac), int(cid)))
+
+    def lookup(self, mcc: int, mnc: int, lac: int, cid: int) -> pd.DataFrame:
+        '''
+        Returns every observation of a cell, with its instance, time, position and signal.
+        '''
+        code = self._code(mcc, mnc, lac, cid)
+        if code is None:
+            return pd.DataFrame(columns=CELL_OBSERVATION_COLUMNS)
+
+        rows = self.observations.iloc[self._offsets[code]:self._offsets[code + 1]].copy()
+        rows['instance'] = [self.instance_names[c] for c in rows['instance']]
+        return rows[CELL_OBSERVATION_COLUMNS].reset_index(drop=True)
+
+    def cells(self) -> pd.DataFrame:
+        '''
+        Aggregates the observations per cell identity: operator, observations, instances,
+        first/last seen, signal strength statistics (`ss`, dBm), mean signal level, the
+        centroid of the positioned observations and the number of footprint grid squares.
+        '''
+        grouped = self.observations.groupby('cell', sort=True)
+        df = self.identities.copy()
+        df['operator'] = grouped['operator'].agg(lambda s: s.value_counts().index[0])
+        df['observations'] = grouped.size()
+        df['instances'] = grouped['instance'].nunique()
+        df['first_seen'] = grouped['time'].min()
+        df['last_seen'] = grouped['time'].max()
+        df['mean_ss'] = grouped['ss'].mean()
+        df['min_ss'] = grouped['ss'].min()
+        df['max_ss'] = grouped['ss'].max()
+        df['std_ss'] = grouped['ss'].std()
+        df['mean_level'] = grouped['level'].mean()
+        df['latitude'] = grouped['latitude'].mean()
+        df['longitude'] = grouped['longitude'].mean()
+        df['footprint_cells'] = self.footprints.groupby('cell').size().reindex(df.index, fill_value=0)
+        return df
+
+    def footprint(self, mcc: int, mnc: int, lac: int, cid: int) -> pd.DataFrame:
+        '''
+        Returns the coverage footprint of a cell: one row per grid square where it was
+        observed, with the square center, the number of observations and the signal strength.
+        '''
+        code = self._code(mcc, mnc, lac, cid)
+        footprint = self.footprints[self.footprints['cell'] == code] if code is not None else self.footprints.iloc[0:0]
+        return self._with_centers(footprint)[['latitude', 'longitude', 'observations', 'mean_ss', 'max_ss']].reset_index(drop=True)
+
+    def _with_centers(self, footprints):
+        footprints = footprints.copy()
+        if footprints.empty:
+            footprints['latitude'] = pd.Series(dtype='float64')
+            footprints['longitude'] = pd.Series(dtype='float64')
+            return footprints
+        footprints['latitude'], footprints['longitude'] = grid_center(
+            footprints['cx'].to_numpy(dtype='int64'), footprints['cy'].to_numpy(dtype='int64'),
+            self.cell_size_m, self.ref_latitude,
+        )
+        return footprints
+
+    def coverage(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> pd.DataFrame:
+        '''
+        Lists the cells observed inside a bounding box (at grid resolution) with their
+        number of grid squares, observations and signal strength in that area.
+        '''
+        columns = CELL_KEY + ['grid_cells', 'observations', 'mean_ss', 'max_ss']
+        if self.footprints.empty:
+            return pd.DataFrame(columns=columns)
+
+        cx0, cy0 = grid_cells(min_lat, min_lon, self.cell_size_m, self.ref_latitude)
+        cx1, cy1 = grid_cells(max_lat, max_lon, self.cell_size_m, self.ref_latitude)
+        rows = np.arange(int(cy0), int(cy1) + 1, dtype='int64')
+
+        keys = self.footprints['key'].to_numpy(dtype='int64')
+        lo = np.searchsorted(keys, grid_key(int(cx0), rows), side='left')
+        hi = np.searchsorted(keys, grid_key(int(cx1), rows), side='right')
+        positions = [np.arange(a, b) for a, b in zip(lo, hi) if b > a]
+        if not positions:
+            return pd.DataFrame(columns=columns)
+
+        area = self.footprints.iloc[np.concatenate(positions)].copy()
+        area['weighted_ss'] = area['mean_ss'] * area['observations']
+        grouped = area.groupby('cell', sort=True).agg(
+            grid_cells=('key', 'size'), observations=('observations', 'sum'),
+            weighted_ss=('weighted_ss', 'sum'), max_ss=('max_ss', 'max'),
+        )
+        grouped['mean_ss'] = grouped['weighted_ss'] / grouped['observations']
+
+        df = self.identities.iloc[grouped.index.to_numpy()].reset_index(drop=True)
+        for col in ['grid_cells', 'observations', 'mean_ss', 'max_ss']:
+            df[col] = grouped[col].to_numpy()
+        return df[columns]
+
+    def save(self, path: str):
+        '''
+        Saves the index to a NumPy .npz file. Footprints are rebuilt on load.
+        '''
+        obs = self.observations
+        np.savez_compressed(
+            path,
+            tolerance_s=self.tolerance_s,
+            cell_size_m=self.cell_size_m,
+            ref_latitude=np.nan if self.ref_latitude is None else self.ref_latitude,
+            instance_names=np.array(self.instance_names, dtype=str),
+            key=obs[CELL_KEY].to_numpy(dtype='int64'),
+            operator=obs['operator'].to_numpy(dtype=str),
+            instance=obs['instance'].to_numpy(dtype='int32'),
+            time=obs['time'].to_numpy(dtype='datetime64[ns]').view('int64'),
+            values=obs[['seconds', 'latitude', 'longitude', 'ss', 'level']].to_numpy(dtype='float64'),
+            registered=obs['registered'].to_numpy(dtype=bool),
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        '''
+        Loads an index saved with `save`.
+        '''
+        with np.load(path) as data:
+            index = cls(float(data['tolerance_s']), float(data['cell_size_m']))
+            ref_latitude = float(data['ref_latitude'])
+            index.ref_latitude = None if np.isnan(ref_latitude) else ref_latitude
+            index.instance_names = [str(n) for n in data['instance_names']]
+
+            observations = pd.DataFrame(data['key'].reshape(-1, len(CELL_KEY)), columns=CELL_KEY)
+            observations['operator'] = data['operator'].astype(object)
+            observations['instance'] = data['instance']
+            observations['time'] = data['time'].view('datetime64[ns]')
+            values = data['values'].reshape(-1, 5)
+            for ind, col in enumerate(['seconds', 'latitude', 'longitude', 'ss', 'level']):
+                observations[col] = values[:, ind]
+            observations['registered'] = data['registered']
+
+        index._set(observations)
+        return index
+
+    def __str__(self):
+        return f'SSCellIndex[cells: {len(self.identities)}, observations: {self.size}]'
+
+    def __repr__(self):
+        return self.__str__()
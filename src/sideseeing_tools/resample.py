@@ -0,0 +1,211 @@
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+from scipy import signal
+
+from sideseeing_tools import alignment, constants, utils
+
+
+METHODS = ['linear', 'nearest', 'zoh', 'polyphase']
+
+MAX_DENOMINATOR = 100
+
+
+def grid(start: float, stop: float, rate: float) -> np.ndarray:
+    '''
+    Returns the uniform times in [start, stop) at `rate` Hz.
+    '''
+    return start + np.arange(int(np.ceil((stop - start) * rate))) / rate
+
+
+def resample_batch(times: list, values: list, targets: np.ndarray, method: str = 'linear') -> np.ndarray:
+    '''
+    Resamples several streams onto the same target times in one vectorized pass.
+
+    The streams are laid end to end on a single time axis, each shifted by a multiple of
+    the total time span, so one call to alignment.interpolate locates every target time in
+    every stream. Targets outside a stream time range are NaN (there is no extrapolation).
+
+    Args:
+        times (list): One sorted float array of sample times per stream.
+        values (list): One (samples, axes) float array per stream; all streams must have the same number of axes.
+        targets (np.ndarray): The target times, sorted.
+        method (str): 'linear', 'nearest' or 'zoh' (zero-order hold: the last sample at or before each target).
+
+    Returns:
+        np.ndarray: A (streams, len(targets), axes) float64 array.
+    '''
+    if method not in ('linear', 'nearest', 'zoh'):
+        raise ValueError(f"Unknown method '{method}' for resample_batch. Use 'linear', 'nearest' or 'zoh'.")
+
+    targets = np.asarray(targets, dtype='float64')
+    n_streams, n_targets = len(times), len(targets)
+    n_axes = values[0].shape[1] if n_streams else 0
+    out = np.full((n_streams, n_targets, n_axes), np.nan)
+    if n_streams == 0 or n_targets == 0:
+        return out
+
+    lengths = np.array([len(t) for t in times])
+    stops = np.cumsum(lengths)
+    if stops[-1] == 0:
+        return out
+
+    all_times = np.concatenate(times).astype('float64')
+    all_values = np.concatenate(values).astype('float64')
+    low = min(all_times.min(), targets[0])
+    span = max(all_times.max(), targets[-1]) - low + 1.0
+
+    offsets = np.arange(n_streams) * span - low
+    shifted = all_times + np.repeat(offsets, lengths)
+    queries = (targets[None, :] + offsets[:, None]).ravel()
+
+    # Inside its own stream range a target only reaches samples of that stream.
+    result = alignment.interpolate(queries, shifted, all_values, 'previous' if method == 'zoh' else method)
+
+    first = np.minimum(np.repeat(stops - lengths, n_targets), len(shifted) - 1)
+    last = np.maximum(np.repeat(stops - 1, n_targets), 0)
+    inside = np.repeat(lengths > 0, n_targets) & (queries >= shifted[first]) & (queries <= shifted[last])
+    result[~inside] = np.nan
+
+    out[:] = result.reshape(n_streams, n_targets, n_axes)
+    return out
+
+
+def decimate(times: np.ndarray, values: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    '''
+    Anti-aliased (polyphase) resampling of one stream onto uniform target times.
+
+    The stream is first interpolated onto a uniform grid close to its own rate, chosen so
+    that the target rate is a rational `up / down` multiple of it, and then filtered and
+    resampled with `scipy.signal.resample_poly`, which low-passes below the new Nyquist
+    frequency before dropping samples. Every axis is filtered in the same call.
+
+    Args:
+        times (np.ndarray): Sorted sample times.
+        values (np.ndarray): A (samples, axes) array.
+        targets (np.ndarray): Uniformly spaced target times.
+
+    Returns:
+        np.ndarray: A (len(targets), axes) array, NaN outside the stream time range.
+    '''
+    out = np.full((len(targets), values.shape[1]), np.nan)
+    if len(times) < 2 or len(targets) == 0:
+        return out
+
+    inside = np.flatnonzero((targets >= times[0]) & (targets <= times[-1]))
+    if len(inside) == 0:
+        return out
+
+    rate = 1 / (targets[1] - targets[0]) if len(targets) > 1 else 1.0
+    source_rate = 1 / np.median(np.diff(times))
+    ratio = Fraction(rate / source_rate).limit_denominator(MAX_DENOMINATOR)
+    up, down = max(ratio.numerator, 1), max(ratio.denominator, 1)
+
+    origin = targets[inside[0]]
+    uniform = grid(origin, times[-1], rate * down / up)
+    uniform = uniform[uniform <= times[-1]]
+    x = resample_batch([times], [values], uniform, 'linear')[0]
+    if len(x) < 2:
+        out[inside[0]] = values[np.searchsorted(times, origin)]
+        return out
+
+    x = np.where(np.isnan(x), np.nanmean(x, axis=0), x)
+    y = signal.resample_poly(x, up, down, axis=0, padtype='line')
+
+    count = min(len(y), len(inside))
+    out[inside[:count]] = y[:count]
+    return out
+
+
+def resample(times, values, rate: float, method: str = 'linear', start: float = None, stop: float = None) -> tuple:
+    '''
+    Resamples one stream to a fixed rate.
+
+    Args:
+        times (array): Sorted sample times, in seconds.
+        values (array): A (samples,) or (samples, axes) array.
+        rate (float): The target rate, in Hz.
+        method (str): 'linear', 'nearest', 'zoh' or 'polyphase' (anti-aliased).
+        start (float, optional): First target time. Defaults to the first sample time.
+        stop (float, optional): End of the target times (exclusive). Defaults to the last sample time, included.
+
+    Returns:
+        tuple: (target times, resampled values), with the values shaped like the input.
+
+    Example:
+        t, x = resample(df['Time (s)'].to_numpy(), df[['x', 'y', 'z']].to_numpy(), 50, method='polyphase')
+    '''
+    times = np.asarray(times, dtype='float64')
+    values = np.asarray(values, dtype='float64')
+    flat = values.ndim == 1
+    if flat:
+        values = values[:, None]
+
+    start = times[0] if start is None else start
+    if stop is None:
+        targets = start + np.arange(int(np.floor((times[-1] - start) * rate + 1e-9)) + 1) / rate
+    else:
+        targets = grid(start, stop, rate)
+
+    if method == 'polyphase':
+        result = decimate(times, values, targets)
+    else:
+        result = resample_batch([times], [values], targets, method)[0]
+    return targets, (result[:, 0] if flat else result)
+
+
+def resample_instance(instance, rate: float, method: str = 'linear') -> dict:
+    '''
+    Resamples every sensor stream of an instance onto a common grid at `rate` Hz, from the
+    media start to the media end.
+
+    Streams are put on the media clock (see utils.seconds_since) and all streams of a
+    modality are resampled in one batched call (see resample_batch); 'polyphase' filters
+    every axis of a stream at once. Rows before the first or after the last sample of a
+    stream are dropped.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        rate (float): The target rate, in Hz.
+        method (str): 'linear', 'nearest', 'zoh' or 'polyphase'.
+
+    Returns:
+        dict: {'sensors1': {name: DataFrame}, 'sensors3': {...}, 'sensors6': {...}}, each DataFrame with the columns
+        'Datetime UTC', 'time' (seconds since the media start) and the sensor axes.
+    '''
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Use one of {METHODS}.")
+
+    targets = grid(0.0, instance.media_total_time, rate)
+    datetimes = pd.Timestamp(instance.media_start_time) + pd.to_timedelta(targets, unit='s')
+
+    resampled = {attr: {} for attr in constants.SENSOR_ATTRIBUTES}
+    for attr in constants.SENSOR_ATTRIBUTES:
+        streams = getattr(instance, attr, None) or {}
+        if not streams:
+            continue
+
+        names, times, values = [], [], []
+        for name, df in streams.items():
+            seconds = utils.seconds_since(df, instance.media_start_time)
+            data = df[constants.CHANNELS[attr]].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+            order = np.argsort(seconds, kind='stable')
+            names.append(name)
+            times.append(seconds[order])
+            values.append(data[order])
+
+        if method == 'polyphase':
+            results = [decimate(t, v, targets) for t, v in zip(times, values)]
+        else:
+            results = resample_batch(times, values, targets, method)
+
+        for name, result in zip(names, results):
+            keep = ~np.all(np.isnan(result), axis=1)
+            df = pd.DataFrame(result[keep], columns=constants.CHANNELS[attr])
+            df.insert(0, 'time', targets[keep])
+            df.insert(0, 'Datetime UTC', datetimes[keep])
+            resampled[attr][name] = df
+
+    return resampled
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import features, geotag, sensor_types, shared, trajectory, utils
+
+
+# Vibration band, in Hz. It leaves out the gait (about 1-3 Hz) and most of its harmonics.
+DEFAULT_BAND = (5.0, 25.0)
+
+SEGMENT_M = 10.0
+
+ROUGHNESS_COLUMNS = [
+    'instance', 'segment', 'start_distance', 'end_distance', 'start_time', 'end_time',
+    'start_latitude', 'start_longitude', 'end_latitude', 'end_longitude',
+    'windows', 'roughness', 'roughness_max',
+]
+
+
+def _accelerometer(instance, sensor=None):
+    '''
+    Returns the accelerometer stream to use: `sensor` if given, else the one with the most samples.
+    '''
+    streams = getattr(instance, 'sensors3', None) or {}
+    if sensor is not None:
+        return streams.get(sensor)
+    candidates = [df for name, df in streams.items() if sensor_types.sensor_type(name) == 'accelerometer']
+    return max(candidates, key=len) if candidates else None
+
+
+def window_roughness(data: pd.DataFrame, origin, window: int = 128, step: int = 64, band: tuple = DEFAULT_BAND) -> tuple:
+    '''
+    Computes the roughness index of every window of an accelerometer stream.
+
+    The vertical acceleration of a window is its projection on the window's mean acceleration
+    (gravity), so the index does not depend on how the phone is held. The index is the RMS
+    of the vertical acceleration in `band` (m/s²): the square root of its band power, from a real
+    FFT (see features.compute_features). Windows are processed in chunks of features.CHUNK_WINDOWS.
+
+    Args:
+        data (pd.DataFrame): A 3-axis accelerometer DataFrame.
+        origin (datetime): Times are reported in seconds since `origin`, usually the media start.
+        window (int): The window length in samples.
+        step (int): The distance between window starts in samples.
+        band (tuple): (low, high) frequency band in Hz.
+
+    Returns:
+        tuple: `start_times`, `end_times` and the roughness index of each window.
+    '''
+    if data is None or len(data) < max(window, 2):
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    t = utils.seconds_since(data, origin)
+    order = np.argsort(t, kind='stable')
+    t = t[order]
+    values = data[['x', 'y', 'z']].to_numpy(dtype='float64')[order]
+    rate = 1 / max(np.median(np.diff(t)), 1e-9)
+
+    windows = features.window_view(values, window, step)
+    index = np.empty(len(windows))
+    for start in range(0, len(windows), features.CHUNK_WINDOWS):
+        chunk = windows[start:start + features.CHUNK_WINDOWS]
+        gravity = chunk.mean(axis=-1)
+        norm = np.linalg.norm(gravity, axis=-1, keepdims=True)
+        up = gravity / np.where(norm > 0, norm, 1)
+        vertical = np.einsum('wcl,wc->wl', chunk, up)[:, None, :]
+        index[start:start + features.CHUNK_WINDOWS] = np.sqrt(features.compute_features(vertical, rate, ['band_power'], [band])[:, 0])
+
+    first = np.arange(len(windows)) * step
+    return t[first], t[first + window - 1], index
+
+
+def instance_roughness(instance, segment_m: float = SEGMENT_M, window: int = 128, step: int = 64,
+                       band: tuple = DEFAULT_BAND, sensor: str = None, max_gap_s: float = geotag.MAX_GAP_S) -> pd.DataFrame:
+    '''
+    Computes the roughness index of an instance per GPS segment.
+
+    Window indexes (see `window_roughness`) are placed on the track at the middle of each window
+    (see geotag.interpolate), and the track is cut every `segment_m` meters of distance traveled
+    (see trajectory.segment_boundaries).
+    Windows that cannot be geotagged (GPS gaps longer than `max_gap_s`) are left out.
+
+    Args:
+        instance (SideSeeingInstance): The instance.
+        segment_m (float): The segment length in meters.
+        window (int): The window length in samples.
+        step (int): The distance between window starts in samples.
+        band (tuple): (low, high) frequency band in Hz.
+        sensor (str, optional): The raw name of the accelerometer. Defaults to the accelerometer with the most samples.
+        max_gap_s (float): Longest interval between GPS fixes that is interpolated, in seconds.
+
+    Returns:
+        pd.DataFrame: One row per segment with the columns of ROUGHNESS_COLUMNS: distances along the track (m),
+        times (seconds since the media start), end positions, the number of windows and the mean and maximum index.
+    '''
+    empty = pd.DataFrame(columns=ROUGHNESS_COLUMNS)
+    starts, ends, index = window_roughness(_accelerometer(instance, sensor), instance.media_start_time, window, step, band)
+    fixes = geotag._fixes(instance.geolocation_points, instance.media_start_time)
+    if len(index) == 0 or len(fixes[0]) == 0:
+        return empty
+
+    centers = (starts + ends) / 2
+    positions = geotag.interpolate(*fixes, centers, max_gap_s)
+    track = trajectory.trajectory(instance.geolocation_points)
+    cumulative = track['cumulative_distance'].to_numpy()
+    distance = np.interp(centers, utils.seconds_since(track, instance.media_start_time), cumulative)
+    boundaries = trajectory.segment_boundaries(track, segment_m)
+
+    keep = ~np.isnan(positions[:, 0])
+    if not keep.any():
+        return empty
+    starts, ends, index, positions, distance = starts[keep], ends[keep], index[keep], positions[keep], distance[keep]
+
+    segment = np.clip(np.searchsorted(boundaries, distance, side='right') - 1, 0, max(len(boundaries) - 2, 0))
+    segments, first, windows = np.unique(segment, return_index=True, return_counts=True)
+    last = first + windows - 1
+
+    return pd.DataFrame({
+        'instance': instance.name,
+        'segment': segments,
+        'start_distance': boundaries[segments],
+        'end_distance': boundaries[np.minimum(segments + 1, len(boundaries) - 1)],
+        'start_time': starts[first],
+        'end_time': ends[last],
+        'start_latitude': positions[first, 0],
+        'start_longitude': positions[first, 1],
+        'end_latitude': positions[last, 0],
+        'end_longitude': positions[last, 1],
+        'windows': windows,
+        'roughness': np.add.reduceat(index, first) / windows,
+        'roughness_max': np.maximum.reduceat(index, first),
+    }, columns=ROUGHNESS_COLUMNS)
+
+
+def dataset_roughness(dataset, segment_m: float = SEGMENT_M, window: int = 128, step: int = 64,
+                      band: tuple = DEFAULT_BAND, sensor: str = None, max_gap_s: float = geotag.MAX_GAP_S,
+                      max_workers: int = 1, progress_callback=None) -> pd.DataFrame:
+    '''
+    Computes the roughness index per GPS segment for every instance of a dataset (see
+    `instance_roughness`). With `max_workers` > 1 instances are processed in worker processes
+    through shared memory (see shared.map_shared).
+
+    Example:
+        segments = dataset_roughness(ds, segment_m=20, max_workers=8)
+        segments.nlargest(10, 'roughness')
+    '''
+    tables = shared.map_shared(
+        instance_roughness, dataset.iterator, segment_m, window, step, band, sensor, max_gap_s,
+        max_workers=max_workers, progress_callback=progress_callback,
+    )
+    tables = [t for t in tables if len(t)]
+    if not tables:
+        return pd.DataFrame(columns=ROUGHNESS_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,338 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import constants, sensor_types, shared, utils
+from sideseeing_tools.features import feature_names, slice_features
+
+
+CHANNELS = constants.CHANNELS['sensors3'] + ['magnitude']
+
+STATISTICS = ['mean', 'std', 'min', 'max', 'jerk']
+
+FEATURE_NAMES = feature_names(CHANNELS, STATISTICS)
+
+WINDOW_COLUMNS = ['instance', 'sensor', 'start_time', 'end_time', 'samples']
+
+RESULT_COLUMNS = ['query', 'rank', 'instance', 'sensor', 'start_time', 'end_time', 'distance']
+
+
+def pick_sensor(instance, sensor: str):
+    '''
+    Returns the `sensors3` stream name of an instance matching `sensor`, which can be a raw
+    sensor name or a canonical type (see sensor_types). For a type, calibrated non-wakeup
+    streams are preferred. Returns None if the instance has no such stream.
+    '''
+    streams = getattr(instance, 'sensors3', None) or {}
+    if sensor in streams:
+        return sensor
+
+    candidates = [name for name in streams if sensor_types.sensor_type(name) == sensor]
+    if not candidates:
+        return None
+
+    info = sensor_types.describe
+    return sorted(candidates, key=lambda name: (info(name).wakeup, not info(name).calibrated, name))[0]
+
+
+def window_features(data: pd.DataFrame, origin, window_s: float = 2.0, step_s: float = 1.0, min_samples: int = 10):
+    '''
+    Computes fixed-length window features of a three-axis stream.
+
+    For x, y, z and the magnitude it computes the mean, standard deviation, minimum,
+    maximum and jerk (mean absolute change per second) of windows of `window_s` seconds,
+    with features.slice_features, so the cost is linear in the number of samples.
+
+    Args:
+        data (pd.DataFrame): A `sensors3` DataFrame.
+        origin (datetime): Times are reported in seconds since `origin`, usually the media start.
+        window_s (float): The window length in seconds.
+        step_s (float): The distance between window starts in seconds.
+        min_samples (int): Windows with fewer samples are skipped.
+
+    Returns:
+        tuple: `start_times`, `end_times`, `samples` (arrays with one entry per window) and
+        `features`, a (windows, len(FEATURE_NAMES)) float64 array.
+    '''
+    empty = (np.empty(0), np.empty(0), np.empty(0, dtype='int64'), np.empty((0, len(FEATURE_NAMES))))
+    if data is None or len(data) < max(min_samples, 2):
+        return empty
+
+    t = utils.seconds_since(data, origin)
+    order = np.argsort(t, kind='stable')
+    t = t[order]
+
+    xyz = data[constants.CHANNELS['sensors3']].to_numpy(dtype='float64')[order]
+    values = np.column_stack([xyz, np.sqrt((xyz ** 2).sum(axis=1))])
+
+    starts = np.arange(t[0], t[-1] - window_s + 1e-9, step_s)
+    lo = np.searchsorted(t, starts, side='left')
+    hi = np.searchsorted(t, starts + window_s, side='left')
+    keep = (hi - lo) >= max(min_samples, 2)
+    starts, lo, hi = starts[keep], lo[keep], hi[keep]
+    if len(starts) == 0:
+        return empty
+
+    return starts, starts + window_s, hi - lo, slice_features(values, lo, hi, STATISTICS, t)
+
+
+def _instance_windows(instance, sensor, window_s, step_s, min_samples):
+    sensor_name = pick_sensor(instance, sensor)
+    if sensor_name is None:
+        return None
+
+    starts, ends, samples, features = window_features(
+        instance.sensors3[sensor_name], instance.media_start_time, window_s, step_s, min_samples,
+    )
+    windows = pd.DataFrame({
+        'instance': instance.name, 'sensor': sensor_name,
+        'start_time': starts, 'end_time': ends, 'samples': samples,
+    }, columns=WINDOW_COLUMNS)
+    return windows, features
+
+
+def _squared_distances(queries, matrix, matrix_norms):
+    d = (queries ** 2).sum(axis=1)[:, None] + matrix_norms[None, :] - 2.0 * (queries @ matrix.T)
+    return np.maximum(d, 0)
+
+
+class SensorWindowIndex:
+    '''
+    A k-nearest-neighbour index over fixed-length windows of `sensors3` streams.
+
+    Window features (see `window_features`) are standardized across the dataset and kept
+    in a float32 matrix; `windows` is the id map from each row to its instance, sensor and
+    time span (in seconds since the media start, so the matching video can be cut with
+    `SideSeeingInstance.extract_snippet`). Windows with missing values (NaN features) are
+    left out. Queries compute distances in batches with NumPy. After `quantize`, queries can probe only the nearest coarse clusters (an inverted file).
+
+    Args:
+        sensor (str): A canonical sensor type (e.g. 'accelerometer') or a raw `sensors3` name.
+        window_s (float): The window length in seconds.
+        step_s (float): The distance between window starts in seconds.
+        min_samples (int): Windows with fewer samples are skipped.
+
+    Example:
+        index = SensorWindowIndex.from_dataset(ds, sensor='accelerometer', window_s=2)
+        index.query('FhdNormal#Mia3-2024-08-01-10-02-22-118', 42.0, k=5)
+    '''
+    def __init__(self, sensor: str = 'accelerometer', window_s: float = 2.0, step_s: float = 1.0, min_samples: int = 10):
+        self.sensor = sensor
+        self.window_s = window_s
+        self.step_s = step_s
+        self.min_samples = min_samples
+        self.windows = pd.DataFrame(columns=WINDOW_COLUMNS)
+        self.matrix = np.empty((0, len(FEATURE_NAMES)), dtype='float32')
+        self.mean = np.zeros(len(FEATURE_NAMES))
+        self.scale = np.ones(len(FEATURE_NAMES))
+        self.centroids = None
+        self._set_rows()
+
+    @classmethod
+    def from_dataset(cls, dataset, sensor: str = 'accelerometer', window_s: float = 2.0, step_s: float = 1.0,
+                     min_samples: int = 10, max_workers: int = 1, progress_callback=None):
+        '''
+        Builds the index. With `max_workers` > 1 the features are computed in worker
+        processes through shared memory (see shared.map_shared).
+        '''
+        index = cls(sensor, window_s, step_s, min_samples)
+        results = shared.map_shared(
+            _instance_windows, dataset.iterator, sensor, window_s, step_s, min_samples,
+            max_workers=max_workers, progress_callback=progress_callback,
+        )
+        results = [r for r in results if r is not None and len(r[0])]
+        if results:
+            index._fit(
+                pd.concat([w for w, _ in results], ignore_index=True),
+                np.vstack([f for _, f in results]),
+            )
+        return index
+
+    def _fit(self, windows, features):
+        finite = np.isfinite(features).all(axis=1)
+        windows, features = windows[finite].reset_index(drop=True), features[finite]
+        if not len(features):
+            return
+
+        self.windows = windows
+        self.mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self.matrix = self.transform(features)
+        self.centroids = None
+        self._set_rows()
+
+    def _set_rows(self):
+        self._norms = (self.matrix.astype('float64') ** 2).sum(axis=1)
+        self._instance_codes, self._instance_names = pd.factorize(self.windows['instance'])
+
+    @property
+    def size(self):
+        return len(self.matrix)
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        '''
+        Standardizes raw window features (as returned by `window_features`) with the index statistics.
+        '''
+        return ((np.atleast_2d(features) - self.mean) / self.scale).astype('float32')
+
+    def quantize(self, n_clusters: int = None, iterations: int = 20, seed: int = 0):
+        '''
+        Groups the rows into `n_clusters` coarse clusters with k-means (default: sqrt of the
+        number of rows) so that queries can search only the `n_probe` nearest clusters.
+        '''
+        n_clusters = min(n_clusters or max(int(np.sqrt(self.size)), 1), self.size)
+        rng = np.random.default_rng(seed)
+        centroids = self.matrix[rng.choice(self.size, n_clusters, replace=False)].astype('float64')
+
+        for _ in range(iterations):
+            assignment = self._nearest_centroids(self.matrix, centroids, 1)[:, 0]
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, self.matrix)
+            counts = np.bincount(assignment, minlength=n_clusters)[:, None]
+            centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+
+        assignment = self._nearest_centroids(self.matrix, centroids, 1)[:, 0]
+        self.centroids = centroids.astype('float32')
+        self._list_order = np.argsort(assignment, kind='stable')
+        self._list_offsets = np.searchsorted(assignment[self._list_order], np.arange(n_clusters + 1))
+
+    def _nearest_centroids(self, queries, centroids, n):
+        norms = (centroids ** 2).sum(axis=1)
+        d = _squared_distances(np.asarray(queries, dtype='float64'), centroids, norms)
+        return np.argsort(d, axis=1, kind='stable')[:, :n]
+
+    def knn(self, queries: np.ndarray, k: int = 5, n_probe: int = None, exclude_instances=None, batch_size: int = 256):
+        '''
+        Finds the `k` nearest rows of each standardized query vector.
+
+        Args:
+            queries (np.ndarray): A (queries, features) array, already standardized (see `transform`).
+            k (int): Number of neighbours.
+            n_probe (int, optional): After `quantize`, the number of clusters searched per query. If None, the search is exact.
+            exclude_instances (array, optional): For each query, an instance name whose windows are skipped.
+            batch_size (int): Number of queries whose distances are computed at once.
+
+        Returns:
+            tuple: `distances` and `rows`, (queries, k) arrays; missing neighbours have distance inf and row -1.
+        '''
+        queries = np.atleast_2d(np.asarray(queries, dtype='float64'))
+        excluded = None
+        if exclude_instances is not None:
+            lookup = {name: code for code, name in enumerate(self._instance_names)}
+            excluded = np.array([lookup.get(name, -1) for name in exclude_instances])
+
+        distances = np.full((len(queries), k), np.inf)
+        rows = np.full((len(queries), k), -1, dtype='int64')
+        matrix = self.matrix.astype('float64')
+
+        for begin in range(0, len(queries), batch_size):
+            batch = slice(begin, begin + batch_size)
+            q = queries[batch]
+
+            if n_probe is None or self.centroids is None:
+                candidates = np.broadcast_to(np.arange(self.size), (len(q), self.size))
+                d = _squared_distances(q, matrix, self._norms)
+            else:
+                probes = self._nearest_centroids(q, self.centroids.astype('float64'), min(n_probe, len(self.centroids)))
+                lists = [
+                    np.concatenate([self._list_order[self._list_offsets[c]:self._list_offsets[c + 1]] for c in probe])
+                    for probe in probes
+                ]
+                width = max(len(l) for l in lists)
+                candidates = np.full((len(q), width), -1, dtype='int64')
+                for ind, l in enumerate(lists):
+                    candidates[ind, :len(l)] = l
+                d = ((matrix[candidates] - q[:, None, :]) ** 2).sum(axis=2)
+                d[candidates < 0] = np.inf
+
+            if excluded is not None:
+                d = np.where(self._instance_codes[candidates] == excluded[batch][:, None], np.inf, d)
+
+            top = min(k, d.shape[1])
+            part = np.argpartition(d, top - 1, axis=1)[:, :top] if top else np.empty((len(q), 0), dtype='int64')
+            part_d = np.take_along_axis(d, part, axis=1)
+            order = np.argsort(part_d, axis=1, kind='stable')
+
+            distances[batch, :top] = np.sqrt(np.take_along_axis(part_d, order, axis=1))
+            rows[batch, :top] = np.take_along_axis(np.take_along_axis(candidates, part, axis=1), order, axis=1)
+
+        rows[~np.isfinite(distances)] = -1
+        return distances, rows
+
+    def _results(self, distances, rows):
+        query, rank = np.nonzero(rows >= 0)
+        found = rows[query, rank]
+        df = self.windows.iloc[found][['instance', 'sensor', 'start_time', 'end_time']].reset_index(drop=True)
+        df.insert(0, 'rank', rank + 1)
+        df.insert(0, 'query', query)
+        df['distance'] = distances[query, rank]
+        return df[RESULT_COLUMNS]
+
+    def query(self, instance: str, time: float, k: int = 5, n_probe: int = None, exclude_same_instance: bool = True) -> pd.DataFrame:
+        '''
+        Finds the windows most similar to the indexed window of `instance` that contains
+        `time` (seconds since the media start).
+
+        Returns:
+            pd.DataFrame: `query`, `rank`, `instance`, `sensor`, `start_time`, `end_time` and `distance`.
+        '''
+        windows = self.windows
+        mask = (windows['instance'] == instance) & (windows['start_time'] <= time) & (windows['end_time'] > time)
+        if not mask.any():
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+
+        row = np.flatnonzero(mask.to_numpy())[0]
+        exclude = [instance] if exclude_same_instance else None
+        return self._results(*self.knn(self.matrix[row], k, n_probe, exclude))
+
+    def query_features(self, features: np.ndarray, k: int = 5, n_probe: int = None) -> pd.DataFrame:
+        '''
+        Finds the windows most similar to raw feature vectors, e.g. computed with
+        `window_features` on a stream that is not in the index.
+        '''
+        return self._results(*self.knn(self.transform(features), k, n_probe))
+
+    def save(self, path: str):
+        '''
+        Saves the index to a NumPy .npz file.
+        '''
+        np.savez_compressed(
+            path,
+            params=np.array([self.window_s, self.step_s, self.min_samples], dtype='float64'),
+            sensor=np.array(self.sensor),
+            matrix=self.matrix,
+            mean=self.mean,
+            scale=self.scale,
+            instance=self.windows['instance'].to_numpy(dtype=str),
+            sensor_name=self.windows['sensor'].to_numpy(dtype=str),
+            times=self.windows[['start_time', 'end_time']].to_numpy(dtype='float64'),
+            samples=self.windows['samples'].to_numpy(dtype='int64'),
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        '''
+        Loads an index saved with `save`. Coarse clusters are not saved; call `quantize` again if needed.
+        '''
+        with np.load(path) as data:
+            window_s, step_s, min_samples = data['params']
+            index = cls(str(data['sensor']), float(window_s), float(step_s), int(min_samples))
+            index.matrix = data['matrix']
+            index.mean = data['mean']
+            index.scale = data['scale']
+            times = data['times'].reshape(-1, 2)
+            index.windows = pd.DataFrame({
+                'instance': data['instance'].astype(object),
+                'sensor': data['sensor_name'].astype(object),
+                'start_time': times[:, 0],
+                'end_time': times[:, 1],
+                'samples': data['samples'],
+            }, columns=WINDOW_COLUMNS)
+        index._set_rows()
+        return index
+
+    def __str__(self):
+        return f'SSSensorWindowIndex[sensor: {self.sensor}, windows: {self.size}]'
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,70 @@
+import functools
+import re
+
+from collections import namedtuple
+
+
+SensorInfo = namedtuple('SensorInfo', ['name', 'type', 'wakeup', 'calibrated', 'unit'])
+
+UNKNOWN_TYPE = 'unknown'
+
+# Canonical types in matching order: the first pattern found in the normalized raw name wins,
+# so composite sensors (e.g. linear acceleration, geomagnetic rotation vector) come first.
+SENSOR_TYPES = [
+    ('linear_acceleration', r'linear acc', 'm/s²'),
+    ('gravity', r'gravity', 'm/s²'),
+    ('geomagnetic_rotation_vector', r'geomag\w* rotation', ''),
+    ('game_rotation_vector', r'game rotation', ''),
+    ('rotation_vector', r'rotation vector', ''),
+    ('step_counter', r'step counter', 'steps'),
+    ('step_detector', r'step detector', ''),
+    ('significant_motion', r'significant motion', ''),
+    ('accelerometer', r'acc', 'm/s²'),
+    ('gyroscope', r'gyr', 'rad/s'),
+    ('magnetometer', r'mag', 'μT'),
+    ('light', r'light|lux', 'lx'),
+    ('pressure', r'pressure|baro', 'hPa'),
+    ('proximity', r'proximity', 'cm'),
+    ('relative_humidity', r'humidity', '%'),
+    ('temperature', r'temp', '°C'),
+    ('orientation', r'orientation', '°'),
+]
+
+TYPE_NAMES = [t for t, _, _ in SENSOR_TYPES] + [UNKNOWN_TYPE]
+
+_PATTERNS = [(t, re.compile(pattern), unit) for t, pattern, unit in SENSOR_TYPES]
+
+
+def _normalize(name: str) -> str:
+    return ' '.join(re.sub(r'[_\-]', ' ', name.lower()).split())
+
+
+@functools.lru_cache(maxsize=None)
+def describe(name: str) -> SensorInfo:
+    '''
+    Maps a raw vendor sensor name to its canonical type, wake-up flag, calibration and unit.
+
+    Example:
+        describe('qmc6308 Magnetometer-Uncalibrated Wakeup')
+        # SensorInfo(name='qmc6308 Magnetometer-Uncalibrated Wakeup', type='magnetometer', wakeup=True, calibrated=False, unit='μT')
+    '''
+    normalized = _normalize(name)
+
+    sensor_type, unit = UNKNOWN_TYPE, ''
+    for t, pattern, u in _PATTERNS:
+        if pattern.search(normalized):
+            sensor_type, unit = t, u
+            break
+
+    wakeup = re.search(r'(?<!non )wakeup', normalized) is not None
+    calibrated = 'uncalibrated' not in normalized
+
+    return SensorInfo(name, sensor_type, wakeup, calibrated, unit)
+
+
+def sensor_type(name: str) -> str:
+    return describe(name).type
+
+
+def sensor_unit(name: str) -> str:
+    return describe(name).unit
@@ -0,0 +1,309 @@
+import os
+import sys
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from sideseeing_tools import constants, progress
+
+
+SCALAR_ATTRIBUTES = [
+    'name', 'path', 'metadata', 'label', 'video', 'geolocation_center',
+    'media_start_time', 'media_stop_time', 'media_total_time',
+]
+
+ALIGNMENT = 64
+
+
+def _to_datetime_ns(values):
+    return np.asarray(values, dtype='datetime64[ns]').view('int64')
+
+
+def _to_int64(values):
+    return pd.to_numeric(pd.Series(values), errors='coerce').fillna(-1).to_numpy(dtype='int64')
+
+
+def _collect_arrays(instance):
+    '''
+    Lists the numeric arrays of an instance as (attr, sensor_name, kind, array) tuples.
+    '''
+    streams = []
+    for attr in constants.SENSOR_ATTRIBUTES:
+        for sensor_name, df in (getattr(instance, attr, None) or {}).items():
+            streams.append((attr, sensor_name, df))
+
+    for attr in constants.TABLE_ATTRIBUTES:
+        df = getattr(instance, attr, None)
+        if df is not None:
+            streams.append((attr, None, df))
+
+    arrays = []
+    for attr, sensor_name, df in streams:
+        if df.empty:
+            continue
+
+        columns = constants.NUMERIC_COLUMNS[attr]
+        values = np.ascontiguousarray(df[columns].to_numpy(dtype='float64').T)
+        arrays.append((attr, sensor_name, 'values', values))
+        arrays.append((attr, sensor_name, 'datetime', _to_datetime_ns(df['Datetime UTC'])))
+
+        if 'timestamp_nano' in df.columns:
+            arrays.append((attr, sensor_name, 'timestamp_nano', _to_int64(df['timestamp_nano'])))
+
+    return arrays
+
+
+def _release(shm, unlink):
+    try:
+        shm.close()
+    except BufferError:
+        # Views over the buffer are still alive; the mapping goes away with them.
+        pass
+
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedInstanceHandle:
+    '''
+    A small, picklable description of an instance published into shared memory.
+
+    Only this object travels between processes; workers use it to attach to the
+    segment and rebuild zero-copy views with `attach`.
+    '''
+    def __init__(self, segment_name, layout, attributes):
+        self.segment_name = segment_name
+        self.layout = layout
+        self.attributes = attributes
+
+    @property
+    def name(self):
+        return self.attributes.get('name')
+
+    def __str__(self):
+        return f'SSSharedHandle[name: {self.name}, segment: {self.segment_name}]'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SharedInstance:
+    '''
+    Publishes the numeric arrays (sensor axes, timestamps, GPS and consumption) of
+    a SideSeeingInstance into a single `multiprocessing.shared_memory` segment.
+
+    The publisher owns the segment: it is unlinked on `close()`, when leaving a
+    `with` block, when the object is garbage collected or at interpreter exit.
+
+    Args:
+        instance (SideSeeingInstance): The instance to publish.
+
+    Example:
+        with SharedInstance(instance) as shared:
+            executor.submit(worker, shared.handle)
+    '''
+    def __init__(self, instance):
+        arrays = _collect_arrays(instance)
+
+        layout = []
+        offset = 0
+        for attr, sensor_name, kind, array in arrays:
+            layout.append((attr, sensor_name, kind, offset, array.shape, array.dtype.str))
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self._finalizer = weakref.finalize(self, _release, self._shm, True)
+
+        for (attr, sensor_name, kind, array), item in zip(arrays, layout):
+            target = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=item[3])
+            target[...] = array
+            del target
+
+        attributes = {attr: getattr(instance, attr, None) for attr in SCALAR_ATTRIBUTES}
+        self.handle = SharedInstanceHandle(self._shm.name, layout, attributes)
+
+    @property
+    def size(self):
+        return self._shm.size
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def close(self):
+        '''
+        Closes and unlinks the shared memory segment. Safe to call more than once.
+        '''
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self):
+        return f'SSSharedInstance[name: {self.handle.name}, bytes: {self.size}]'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SharedInstanceView:
+    '''
+    A read-only, zero-copy view of an instance published with `SharedInstance`.
+
+    It exposes the same attributes as SideSeeingInstance for the numeric data
+    (`sensors1`, `sensors3`, `sensors6`, `geolocation_points`, `consumption`) so
+    analysis functions can take either object. Text columns such as the sensor
+    accuracy are not transported.
+    '''
+    def __init__(self, handle: SharedInstanceHandle):
+        if sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=handle.segment_name, track=False)
+        else:
+            self._shm = shared_memory.SharedMemory(name=handle.segment_name)
+        self._finalizer = weakref.finalize(self, _release, self._shm, False)
+
+        for attr, value in handle.attributes.items():
+            setattr(self, attr, value)
+
+        for attr in constants.SENSOR_ATTRIBUTES:
+            setattr(self, attr, {})
+        for attr in constants.TABLE_ATTRIBUTES:
+            setattr(self, attr, None)
+
+        self.arrays = {}
+        for attr, sensor_name, kind, offset, shape, dtype in handle.layout:
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)
+            array.flags.writeable = False
+            self.arrays.setdefault((attr, sensor_name), {})[kind] = array
+
+        for (attr, sensor_name), arrays in self.arrays.items():
+            df = self._build_dataframe(attr, arrays)
+            if sensor_name is None:
+                setattr(self, attr, df)
+            else:
+                getattr(self, attr)[sensor_name] = df
+
+    def _build_dataframe(self, attr, arrays):
+        columns = constants.NUMERIC_COLUMNS[attr]
+        data = {'Datetime UTC': arrays['datetime'].view('datetime64[ns]')}
+        for ind, col in enumerate(columns):
+            data[col] = arrays['values'][ind]
+        if 'timestamp_nano' in arrays:
+            data['timestamp_nano'] = arrays['timestamp_nano']
+        return pd.DataFrame(data, copy=False)
+
+    def values(self, attr, sensor_name=None):
+        '''
+        Returns the numeric columns of a stream as a (samples, columns) array view.
+        The column order follows `constants.NUMERIC_COLUMNS[attr]`.
+        '''
+        return self.arrays[(attr, sensor_name)]['values'].T
+
+    def close(self):
+        '''
+        Releases the worker's mapping of the segment. It does not unlink it.
+        '''
+        for attr in constants.SENSOR_ATTRIBUTES:
+            setattr(self, attr, {})
+        for attr in constants.TABLE_ATTRIBUTES:
+            setattr(self, attr, None)
+        self.arrays = {}
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self):
+        return f'SSSharedView[name: {self.name}]'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def attach(handle: SharedInstanceHandle) -> SharedInstanceView:
+    '''
+    Attaches to a published instance and rebuilds its arrays and DataFrames without copying.
+    '''
+    return SharedInstanceView(handle)
+
+
+def _run_attached(func, handle, args, kwargs):
+    with attach(handle) as view:
+        return func(view, *args, **kwargs)
+
+
+def map_shared(func, instances, *args, max_workers=None, mp_context=None, progress_callback=None, **kwargs):
+    '''
+    Applies `func(instance, *args, **kwargs)` to every instance in a process pool,
+    sending shared memory handles instead of pickled DataFrames.
+
+    Workers receive a SharedInstanceView. `func` must be a module-level function and
+    must return data that does not reference the shared buffers (e.g. new arrays or
+    DataFrames). At most `2 * max_workers` instances are published at the same time,
+    and every segment is unlinked before returning, even on errors.
+
+    Args:
+        func (callable): The function to run on each instance.
+        instances (iterable): SideSeeingInstance objects, e.g. `ds.iterator`.
+        max_workers (int, optional): Number of worker processes. If 1, runs in the current process.
+        mp_context (optional): A multiprocessing context passed to the executor.
+        progress_callback (callable, optional): Receives progress dicts as instances finish. See progress.ProgressTracker.
+
+    Returns:
+        list: The results, in the same order as `instances`.
+    '''
+    instances = list(instances)
+    max_workers = max_workers or os.cpu_count() or 1
+    tracker = progress.ProgressTracker(getattr(func, '__name__', 'map_shared'), total=len(instances), callback=progress_callback)
+
+    if max_workers == 1 or len(instances) <= 1:
+        results = []
+        for instance in instances:
+            results.append(func(instance, *args, **kwargs))
+            tracker.update(item=instance.name)
+        return results
+
+    results = [None] * len(instances)
+    pending = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        try:
+            for ind, instance in enumerate(instances):
+                if len(pending) >= 2 * max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        position, shared = pending.pop(future)
+                        shared.close()
+                        results[position] = future.result()
+                        tracker.update(bytes=shared.size, item=shared.handle.name)
+
+                shared = SharedInstance(instance)
+                future = executor.submit(_run_attached, func, shared.handle, args, kwargs)
+                pending[future] = (ind, shared)
+
+            for future in list(pending):
+                position, shared = pending.pop(future)
+                try:
+                    results[position] = future.result()
+                finally:
+                    shared.close()
+                tracker.update(bytes=shared.size, item=shared.handle.name)
+        finally:
+            for future, (_, shared) in pending.items():
+                future.cancel()
+                shared.close()
+
+    return results
@@ -1,18 +1,34 @@
 import datetime
 import json
+import logging
 import os
 import random
 import re
+import time
+import numpy as np
 import pandas as pd
 
 from sideseeing_tools import (
+    alignment,
     constants, 
+    energy,
     exceptions,
+    frames,
+    fusion,
+    geotag,
     media,
+    progress,
+    sensor_types,
+    simplify,
+    stats,
+    trajectory,
     utils,
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 class SideSeeingDS:
     def __init__(
             self, 
@@ -22,9 +38,11 @@ class SideSeeingDS:
             generate_metadata=False,
             extract_media=False,
             google_api_key=None,
+            progress_callback=None,
         ):
-        print('INFO. Loading data.')
+        logger.info('Loading data.')
         self.name = name
+        self.progress_callback = progress_callback
         
         if not os.path.isdir(root_dir):
             raise exceptions.RootDirIsNotADirectoryError()
@@ -35,7 +53,7 @@ class SideSeeingDS:
 
         if generate_metadata:
             self.metadata(generate_metadata, google_api_key)
-        print('INFO. Done.')
+        logger.info('Done.')
 
     def setup(self, extract_media):
         self.instances = {}
@@ -52,15 +70,24 @@ class SideSeeingDS:
                         self.instances[ssf.name] = SideSeeingInstance(ssf.name, ssf.path)
                     self.instances[ssf.name].add_file(ssf)
 
+        tracker = progress.ProgressTracker('load', total=len(self.instances), callback=self.progress_callback)
         for key in self.instances.keys():
             is_valid_instance = self.instances[key].setup(extract_media)
             if not is_valid_instance:
                 invalid_instances.append(key)
 
+            load_stats = getattr(self.instances[key], 'load_stats', [])
+            tracker.update(
+                bytes=sum(st['bytes_read'] for st in load_stats),
+                rows=sum(st['rows_parsed'] for st in load_stats),
+                item=key,
+            )
+
         for key in invalid_instances:
             self.instances.pop(key)
 
         self.populate_sensors()
+        self.populate_catalog()
 
     def populate_sensors(self):
         self.sensors = {
@@ -72,11 +99,269 @@ class SideSeeingDS:
         for instance in self.iterator:
             for n_axis in self.sensors.keys():
                 if hasattr(instance, n_axis):
-                    for name in getattr(instance, n_axis).keys():
+                    for name in (getattr(instance, n_axis) or {}).keys():
                         if name not in self.sensors[n_axis]:
                             self.sensors[n_axis][name] = set()
                         self.sensors[n_axis][name].add(instance.name)
 
+        self.populate_sensor_types()
+
+    def populate_sensor_types(self):
+        '''
+        Builds `self.sensor_types`, a boolean instance x canonical sensor type bitmap
+        (see sensor_types.describe), and `self.sensor_type_names`, which maps each
+        canonical type to the raw sensor names found in the dataset.
+
+        Example:
+            ds.sensor_types['accelerometer']          # instances with any accelerometer
+            ds.sensor_type_names['accelerometer']     # raw names across devices
+        '''
+        self.sensor_type_names = {}
+        for names in self.sensors.values():
+            for name in names:
+                self.sensor_type_names.setdefault(sensor_types.sensor_type(name), set()).add(name)
+
+        columns = [t for t in sensor_types.TYPE_NAMES if t in self.sensor_type_names]
+        positions = {t: ind for ind, t in enumerate(columns)}
+        index = list(self.instances.keys())
+        rows = {name: ind for ind, name in enumerate(index)}
+
+        bitmap = np.zeros((len(index), len(columns)), dtype=bool)
+        for names in self.sensors.values():
+            for name, instances in names.items():
+                col = positions[sensor_types.sensor_type(name)]
+                bitmap[[rows[i] for i in instances], col] = True
+
+        self.sensor_types = pd.DataFrame(bitmap, index=pd.Index(index, name='name'), columns=columns)
+
+    def populate_catalog(self):
+        '''
+        Builds `self.catalog`, a DataFrame indexed by instance name with the fields used by
+        `query`: device, recording time, duration, labels and the GPS bounding box.
+        '''
+        rows = []
+        for instance in self.iterator:
+            device = instance.metadata.get('device', {})
+            row = {
+                'name': instance.name,
+                'manufacturer': str(device.get('manufacturer', '')).lower(),
+                'model': str(device.get('model', '')).lower(),
+                'android_version': str(device.get('androidVersion', '')),
+                'media_start_time': instance.media_start_time,
+                'media_stop_time': instance.media_stop_time,
+                'media_total_time': instance.media_total_time,
+                'tags': frozenset((l['category'], l['tag']) for l in (instance.label or [])),
+            }
+
+            gps = instance.stats.get(('geolocation_points', 'geolocation_points'))
+            if gps is not None and gps.count:
+                row['min_latitude'], row['max_latitude'] = gps.min['latitude'], gps.max['latitude']
+                row['min_longitude'], row['max_longitude'] = gps.min['longitude'], gps.max['longitude']
+
+            rows.append(row)
+
+        columns = [
+            'name', 'manufacturer', 'model', 'android_version', 'media_start_time', 'media_stop_time',
+            'media_total_time', 'tags', 'min_latitude', 'max_latitude', 'min_longitude', 'max_longitude',
+        ]
+        self.catalog = pd.DataFrame(rows, columns=columns).set_index('name')
+
+    def query(
+            self,
+            sensors=None,
+            manufacturer=None,
+            model=None,
+            android_version=None,
+            start_time=None,
+            end_time=None,
+            min_duration=None,
+            max_duration=None,
+            tags=None,
+            bbox=None,
+            types=None,
+        ):
+        '''
+        Selects instances using the precomputed `sensors` and `catalog` indexes, without touching
+        modality data. All the given filters must match.
+
+        Args:
+            sensors (str or list): Sensor names (as in `ds.sensors`) that must all be present.
+            manufacturer (str or list): Device manufacturer(s), case insensitive.
+            model (str or list): Device model(s), case insensitive.
+            android_version (str, int or list): Android version(s).
+            start_time (datetime): Keeps recordings that end at or after this time.
+            end_time (datetime): Keeps recordings that start at or before this time.
+            min_duration (float): Minimum media duration in seconds.
+            max_duration (float): Maximum media duration in seconds.
+            tags (str or list): Labels that must all be present, as 'tag' or 'category,tag', case insensitive.
+            bbox (tuple): (min_lat, min_lon, max_lat, max_lon); keeps recordings whose GPS track bounding box intersects it.
+            types (str or list): Canonical sensor types (e.g. 'accelerometer') that must all be present, whatever the device.
+
+        Returns:
+            SideSeeingDSView: A lightweight view over the selected instances.
+        '''
+        catalog = self.catalog
+        mask = pd.Series(True, index=catalog.index)
+
+        if sensors is not None:
+            names = set(catalog.index)
+            for sensor_name in utils.as_list(sensors):
+                found = set()
+                for n_axis in self.sensors.values():
+                    found |= n_axis.get(sensor_name, set())
+                names &= found
+            mask &= catalog.index.isin(names)
+
+        if manufacturer is not None:
+            mask &= catalog['manufacturer'].isin([str(m).lower() for m in utils.as_list(manufacturer)])
+
+        if model is not None:
+            mask &= catalog['model'].isin([str(m).lower() for m in utils.as_list(model)])
+
+        if android_version is not None:
+            mask &= catalog['android_version'].isin([str(v) for v in utils.as_list(android_version)])
+
+        if start_time is not None:
+            mask &= catalog['media_stop_time'] >= start_time
+
+        if end_time is not None:
+            mask &= catalog['media_start_time'] <= end_time
+
+        if min_duration is not None:
+            mask &= catalog['media_total_time'] >= min_duration
+
+        if max_duration is not None:
+            mask &= catalog['media_total_time'] <= max_duration
+
+        if tags is not None:
+            for tag in utils.as_list(tags):
+                tag = tag.strip().lower()
+                if ',' in tag:
+                    key = tuple(t.strip() for t in tag.split(',', 1))
+                    mask &= catalog['tags'].map(lambda t: key in t).astype(bool)
+                else:
+                    mask &= catalog['tags'].map(lambda t: any(tag == tt for _, tt in t)).astype(bool)
+
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            mask &= (
+                (catalog['max_latitude'] >= min_lat) & (catalog['min_latitude'] <= max_lat) &
+                (catalog['max_longitude'] >= min_lon) & (catalog['min_longitude'] <= max_lon)
+            ).fillna(False).astype(bool)
+
+        if types is not None:
+            for t in utils.as_list(types):
+                if t in self.sensor_types.columns:
+                    mask &= self.sensor_types[t].reindex(catalog.index, fill_value=False).to_numpy()
+                else:
+                    mask &= False
+
+        return SideSeeingDSView(self, catalog.index[mask.to_numpy()].tolist())
+
+    @property
+    def load_stats(self):
+        '''
+        Load statistics with one row per instance and file type: bytes read, rows parsed,
+        rows dropped by the media time window, parse errors and the wall time (in seconds)
+        spent on each stage (read, parse, timestamp conversion and DataFrame build).
+        '''
+        rows = []
+        for instance in self.iterator:
+            rows.extend(getattr(instance, 'load_stats', []))
+
+        df = pd.DataFrame(rows, columns=list(utils.create_load_stats('', '').keys()))
+        df['total_time'] = df[utils.LOAD_STATS_STAGES].sum(axis=1)
+        return df
+
+    @property
+    def stats(self):
+        '''
+        Per-stream statistics of every instance, gathered while the files were parsed
+        (see SideSeeingInstance.stats_table). Reading them does not touch the loaded data.
+        '''
+        frames = [instance.stats_table() for instance in self.iterator]
+        if not frames:
+            return pd.DataFrame(columns=stats.STATS_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def overview(self):
+        '''
+        Summarizes every stream across the dataset from the parse-time statistics: the number of
+        instances, rows and seconds covered, the mean effective rate and, per channel, the pooled
+        min, max, mean and standard deviation (instance statistics are merged, see stats.StreamStats.merge).
+
+        Returns:
+            pd.DataFrame: One row per modality, sensor and channel.
+        '''
+        merged = {}
+        instances = {}
+        durations = {}
+        rates = {}
+        for instance in self.iterator:
+            for key, st in instance.stats.items():
+                merged[key] = merged[key].merge(st) if key in merged else st
+                instances[key] = instances.get(key, 0) + 1
+                durations[key] = durations.get(key, 0.0) + st.duration
+                rates.setdefault(key, []).append(st.rate)
+
+        rows = []
+        for (modality, sensor), st in sorted(merged.items()):
+            mean, std, minimum, maximum = st.mean, st.std, st.min, st.max
+            rate = np.nanmean(rates[(modality, sensor)]) if np.isfinite(rates[(modality, sensor)]).any() else np.nan
+            for ind, channel in enumerate(st.channels):
+                rows.append([
+                    modality, sensor, channel, instances[(modality, sensor)], st.count, st.counts[ind],
+                    durations[(modality, sensor)], rate, minimum[channel], maximum[channel], mean[channel], std[channel],
+                ])
+
+        columns = ['modality', 'sensor', 'channel', 'instances', 'rows', 'count', 'duration', 'rate', 'min', 'max', 'mean', 'std']
+        return pd.DataFrame(rows, columns=columns)
+
+    def memory_usage(self):
+        '''
+        Returns the deep memory usage of the dataset, in bytes, broken down by instance,
+        modality and sensor name. See SideSeeingInstance.memory_usage.
+        '''
+        frames = [instance.memory_usage() for instance in self.iterator]
+        if not frames:
+            return pd.DataFrame(columns=['instance', 'modality', 'sensor', 'rows', 'bytes', 'source_bytes'])
+        return pd.concat(frames, ignore_index=True)
+
+    def estimate_memory_usage(self, root_dir=None):
+        '''
+        Predicts the memory needed to load the dataset stored in `root_dir`, using the
+        in-memory/on-disk ratio of each modality measured on the instances loaded here.
+        Load a small sample of recordings and point `root_dir` to the full dataset.
+
+        Args:
+            root_dir (str): The directory to estimate. Defaults to this dataset's data directory.
+
+        Returns:
+            pd.DataFrame: One row per modality with the bytes on disk, the measured ratio and the predicted bytes.
+        '''
+        root_dir = root_dir or self.data_dir
+
+        file_types = {v: k for k, v in constants.MODALITY_FILE_TYPES.items()}
+
+        usage = self.memory_usage().groupby('modality')['bytes'].sum()
+        loaded_bytes = self.load_stats.groupby('file_type')['bytes_read'].sum().rename(index=file_types)
+        ratio = (usage / loaded_bytes.where(loaded_bytes > 0)).fillna(0)
+        disk_bytes = {}
+        for root, _, files in os.walk(root_dir):
+            for f in files:
+                if f not in constants.SUPPORTED_FILES:
+                    continue
+                ssf = SideSeeingFile(root_dir, os.path.join(root, f))
+                if ssf.file_type in file_types:
+                    modality = file_types[ssf.file_type]
+                    disk_bytes[modality] = disk_bytes.get(modality, 0) + os.path.getsize(ssf.file_path)
+
+        df = pd.DataFrame({'source_bytes': pd.Series(disk_bytes, dtype='int64')})
+        df['bytes_per_source_byte'] = ratio.reindex(df.index).fillna(0)
+        df['predicted_bytes'] = (df['source_bytes'] * df['bytes_per_source_byte']).round().astype('int64')
+        df.index.name = 'modality'
+        return df.reset_index()
+
     @property
     def instance(self):
         return self.instances[random.choice(list(self.instances.keys()))]
@@ -92,7 +377,7 @@ class SideSeeingDS:
 
     def metadata(self, save=False, google_api_key=None):
         if self.size == 0:
-            print(f'ERROR. Dataset is empty.')
+            logger.error('Dataset is empty.')
             return
 
         path = os.path.join(f'{self.root_dir}', 'metadata.csv')
@@ -101,7 +386,13 @@ class SideSeeingDS:
             df = utils.load_csv_data_with_pandas(path)
 
         if not os.path.exists(path) or save:
-            df = utils.generate_metadata(self.iterator, constants.DATETIME_UTC_FORMAT, google_api_key)
+            df = utils.generate_metadata(
+                self.iterator,
+                constants.DATETIME_UTC_FORMAT,
+                google_api_key,
+                progress_callback=self.progress_callback,
+                total=self.size,
+            )
             utils.save_csv_data_with_pandas(df, path)
 
         return df
@@ -113,6 +404,67 @@ class SideSeeingDS:
         return self.__str__()
 
 
+class SideSeeingDSView:
+    '''
+    A lightweight, read-only subset of a SideSeeingDS returned by `SideSeeingDS.query`.
+    It shares the instance objects with the dataset and can be queried again.
+    '''
+    def __init__(self, dataset: SideSeeingDS, names):
+        self.dataset = dataset
+        self.names = sorted(names)
+        self.name = dataset.name
+
+    @property
+    def instances(self):
+        return {k: self.dataset.instances[k] for k in self.names}
+
+    @property
+    def instance(self):
+        return self.dataset.instances[random.choice(self.names)]
+
+    @property
+    def size(self):
+        return len(self.names)
+
+    @property
+    def iterator(self):
+        for k in self.names:
+            yield self.dataset.instances[k]
+
+    @property
+    def catalog(self):
+        return self.dataset.catalog.loc[self.names]
+
+    @property
+    def sensors(self):
+        selected = set(self.names)
+        sensors = {}
+        for n_axis, names in self.dataset.sensors.items():
+            sensors[n_axis] = {k: v & selected for k, v in names.items() if v & selected}
+        return sensors
+
+    @property
+    def sensor_types(self):
+        bitmap = self.dataset.sensor_types.loc[self.names]
+        return bitmap.loc[:, bitmap.any(axis=0)]
+
+    def query(self, **filters):
+        '''
+        Applies SideSeeingDS.query filters on top of this view.
+        '''
+        selected = set(self.dataset.query(**filters).names)
+        return SideSeeingDSView(self.dataset, [k for k in self.names if k in selected])
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __str__(self):
+        return f'SSDSView[name: {self.name}, instances: {self.size}]'
+
+    def __repr__(self):
+        return self.__str__()
+
+
 class SideSeeingFile:
     def __init__(self, data_dir, path):
         self.data_dir = data_dir
@@ -180,6 +532,32 @@ class SideSeeingInstance:
     def __repr__(self):
         return self.__str__()
 
+    def memory_usage(self):
+        '''
+        Returns the deep memory usage of the instance broken down by modality and sensor name.
+
+        Returns:
+            pd.DataFrame: Columns `instance`, `modality`, `sensor`, `rows`, `bytes` (in memory) and
+            `source_bytes` (size of the originating file; shared among the sensors of a file by row count).
+        '''
+        source_bytes = {st['file_type']: st['bytes_read'] for st in getattr(self, 'load_stats', [])}
+        rows = []
+
+        for modality, file_type in constants.MODALITY_FILE_TYPES.items():
+            data = getattr(self, modality, None)
+            if data is None:
+                continue
+
+            if modality in constants.SENSOR_ATTRIBUTES:
+                total_rows = sum(len(df) for df in data.values())
+                for sensor_name, df in data.items():
+                    share = len(df) / total_rows if total_rows else 0
+                    rows.append([self.name, modality, sensor_name, len(df), utils.deep_getsizeof(df), round(source_bytes.get(file_type, 0) * share)])
+            else:
+                rows.append([self.name, modality, None, len(data), utils.deep_getsizeof(data), source_bytes.get(file_type, 0)])
+
+        return pd.DataFrame(rows, columns=['instance', 'modality', 'sensor', 'rows', 'bytes', 'source_bytes'])
+
     def print_metadata(self):
         print(f"----\nName: {self.name}")
         print(
@@ -194,9 +572,17 @@ class SideSeeingInstance:
         )
 
     def setup(self, extract_media=False):
+        self.load_stats = []
+        self.stats = {}
+
         try:
+            metadata_stats = utils.create_load_stats(self.name, 'metadata')
+            started_at = time.perf_counter()
             with open(self.files['metadata'].file_path) as json_file:
                 self.metadata = json.load(json_file)
+            metadata_stats['bytes_read'] = os.path.getsize(self.files['metadata'].file_path)
+            metadata_stats['read_time'] = time.perf_counter() - started_at
+            self.load_stats.append(metadata_stats)
         except KeyError:
             return False
 
@@ -219,20 +605,30 @@ class SideSeeingInstance:
             setattr(self, attr, None)
 
         for k, v in self.files.items():
+            if k in ('metadata', 'video', 'audio', 'gif'):
+                file_stats = None
+            else:
+                file_stats = utils.create_load_stats(self.name, k)
+                self.load_stats.append(file_stats)
+
             if k == 'consumption':
                 self.consumption = utils.preprocess_consumption(
-                    utils.load_csv_data(v.file_path, fieldnames=constants.CONSUMPTION_FILE_FIELDNAMES),
+                    utils.load_csv_data(v.file_path, fieldnames=constants.CONSUMPTION_FILE_FIELDNAMES, load_stats=file_stats),
                     constants.DATETIME_UTC_FORMAT,
                     self.media_start_time,
                     self.media_stop_time,
+                    load_stats=file_stats,
+                    stream_stats=self._stream_stats('consumption'),
                 )
 
             if k == 'gps':
                 self.geolocation_points = utils.preprocess_gps(
-                    utils.load_csv_data(v.file_path, fieldnames=constants.GPS_FILE_FIELDNAMES),
+                    utils.load_csv_data(v.file_path, fieldnames=constants.GPS_FILE_FIELDNAMES, load_stats=file_stats),
                     constants.DATETIME_UTC_FORMAT,
                     self.media_start_time,
                     self.media_stop_time,
+                    load_stats=file_stats,
+                    stream_stats=self._stream_stats('geolocation_points'),
                 )
                 if not self.geolocation_points.empty:
                     self.geolocation_center = self.geolocation_points[['latitude', 'longitude']].mean().tolist()
@@ -240,38 +636,52 @@ class SideSeeingInstance:
                     self.geolocation_center = None
 
             if k == 'sensors3':
+                sensor_stats = {}
                 self.sensors3 = utils.preprocess_sensors(
-                    utils.load_csv_data(v.file_path, fieldnames=constants.THREE_AXES_SENSORS_FILE_FIELDNAMES),
+                    utils.load_csv_data(v.file_path, fieldnames=constants.THREE_AXES_SENSORS_FILE_FIELDNAMES, load_stats=file_stats),
                     3,
                     constants.DATETIME_UTC_FORMAT,
                     self.media_start_time,
-                    self.media_stop_time
+                    self.media_stop_time,
+                    load_stats=file_stats,
+                    stream_stats=sensor_stats,
                 )
+                self.stats.update({('sensors3', name): st for name, st in sensor_stats.items()})
 
             if k == 'sensors6':
+                sensor_stats = {}
                 self.sensors6 = utils.preprocess_sensors(
-                    utils.load_csv_data(v.file_path, fieldnames=constants.THREE_AXES_UNCALIBRATED_SENSORS_FILE_FIELDNAMES),
+                    utils.load_csv_data(v.file_path, fieldnames=constants.THREE_AXES_UNCALIBRATED_SENSORS_FILE_FIELDNAMES, load_stats=file_stats),
                     6,
                     constants.DATETIME_UTC_FORMAT,
                     self.media_start_time,
-                    self.media_stop_time
+                    self.media_stop_time,
+                    load_stats=file_stats,
+                    stream_stats=sensor_stats,
                 )
+                self.stats.update({('sensors6', name): st for name, st in sensor_stats.items()})
 
             if k == 'sensors1':
+                sensor_stats = {}
                 self.sensors1 = utils.preprocess_sensors(
-                    utils.load_csv_data(v.file_path, fieldnames=constants.ONE_AXIS_SENSORS_FILE_FIELDNAMES),
+                    utils.load_csv_data(v.file_path, fieldnames=constants.ONE_AXIS_SENSORS_FILE_FIELDNAMES, load_stats=file_stats),
                     1,
                     constants.DATETIME_UTC_FORMAT,
                     self.media_start_time,
-                    self.media_stop_time
+                    self.media_stop_time,
+                    load_stats=file_stats,
+                    stream_stats=sensor_stats,
                 )
+                self.stats.update({('sensors1', name): st for name, st in sensor_stats.items()})
 
             if k == 'wifi':
                 self.wifi_networks = utils.process_wifi_networks(
                     v.file_path,
                     datetime_format=constants.DATETIME_UTC_FORMAT,
                     start_time=self.media_start_time,
-                    end_time=self.media_stop_time
+                    end_time=self.media_stop_time,
+                    load_stats=file_stats,
+                    stream_stats=self._stream_stats('wifi_networks'),
                 )
 
             if k == 'cell':
@@ -279,11 +689,14 @@ class SideSeeingInstance:
                     v.file_path,
                     datetime_format=constants.DATETIME_UTC_FORMAT,
                     start_time=self.media_start_time,
-                    end_time=self.media_stop_time
+                    end_time=self.media_stop_time,
+                    load_stats=file_stats,
+                    stream_stats=self._stream_stats('cell_networks'),
                 )
 
             if k == 'label':
-                self.label = utils.load_csv_data(v.file_path, fieldnames=constants.LABELS_FILE_FIELDNAMES)
+                self.label = utils.load_csv_data(v.file_path, fieldnames=constants.LABELS_FILE_FIELDNAMES, load_stats=file_stats)
+                file_stats['rows_parsed'] = len(self.label)
 
             if k == 'video':
                 self.video = v.file_path
@@ -293,6 +706,21 @@ class SideSeeingInstance:
 
         return True
 
+    def _stream_stats(self, modality):
+        self.stats[(modality, modality)] = stats.StreamStats(stats.CHANNELS[modality])
+        return self.stats[(modality, modality)]
+
+    def stats_table(self):
+        '''
+        Returns the statistics gathered while the files were parsed (see stats.StreamStats), with one
+        row per stream and channel: count, first/last timestamps, duration, effective rate, min, max,
+        mean and standard deviation. Sensors are keyed by their name; other modalities by the modality.
+        '''
+        rows = []
+        for (modality, sensor), st in self.stats.items():
+            rows.extend(st.to_rows(self.name, modality, sensor))
+        return pd.DataFrame(rows, columns=stats.STATS_COLUMNS)
+
     def extract_snippet(self, start_time, end_time, output_dir, include_time_span_on_filename=False):
         '''
         Extract a snippet from the instance.
@@ -391,12 +819,12 @@ class SideSeeingInstance:
             consumption_snippet_output_file = os.path.join(output_dir, constants.CONSUMPTION_FILE_NAME)
 
         if self.consumption is None:
-            print(f"WARNING. No consumption data available for the specified time range: {start_time} to {end_time}.")
+            logger.warning('No consumption data available for the specified time range: %s to %s.', start_time, end_time)
             return
 
         consumption_snippet_data = utils.extract_dataframe_snippet(self.consumption, start_time, end_time)
         if consumption_snippet_data is None or consumption_snippet_data.empty:
-            print(f"WARNING. No consumption data available for the specified time range: {start_time} to {end_time}.")
+            logger.warning('No consumption data available for the specified time range: %s to %s.', start_time, end_time)
             return
 
         with open(consumption_snippet_output_file, 'w') as fout:
@@ -415,12 +843,12 @@ class SideSeeingInstance:
             gps_snippet_output_file = os.path.join(output_dir, constants.GPS_FILE_NAME)
 
         if self.geolocation_points is None:
-            print(f"WARNING. No GPS data available for the specified time range: {start_time} to {end_time}.")
+            logger.warning('No GPS data available for the specified time range: %s to %s.', start_time, end_time)
             return
 
         gps_snippet_data = utils.extract_dataframe_snippet(self.geolocation_points, start_time, end_time)
         if gps_snippet_data is None or gps_snippet_data.empty:
-                print(f"WARNING. No GPS data available for the specified time range: {start_time} to {end_time}.")
+                logger.warning('No GPS data available for the specified time range: %s to %s.', start_time, end_time)
                 return
 
         with open(gps_snippet_output_file, 'w') as fout:
@@ -442,12 +870,12 @@ class SideSeeingInstance:
             cell_network_snippet_output_file = os.path.join(output_dir, constants.CELL_FILE_NAME)
 
         if self.cell_networks is None:
-            print(f"WARNING. No cell network data available for the specified time range: {start_time} to {end_time}.")
+            logger.warning('No cell network data available for the specified time range: %s to %s.', start_time, end_time)
             return
 
         cell_network_snippet_data = utils.extract_dataframe_snippet(self.cell_networks, start_time, end_time)
         if cell_network_snippet_data is None or cell_network_snippet_data.empty:
-            print(f"WARNING. No cell network data available for the specified time range: {start_time} to {end_time}.")
+            logger.warning('No cell network data available for the specified time range: %s to %s.', start_time, end_time)
             return
 
         with open(cell_network_snippet_output_file, 'w') as fout:
@@ -468,12 +896,12 @@ class SideSeeingInstance:
             wifi_network_snippet_output_file = os.path.join(output_dir, constants.WIFI_FILE_NAME)
 
         if self.wifi_networks is None:
-            print(f"WARNING. No wifi network data available for the specified time range: {start_time} to {end_time}.")
+            logger.warning('No wifi network data available for the specified time range: %s to %s.', start_time, end_time)
             return
 
         wifi_network_snippet_data = utils.extract_dataframe_snippet(self.wifi_networks, start_time, end_time)
         if wifi_network_snippet_data is None or wifi_network_snippet_data.empty:
-            print(f"WARNING. No wifi network data available for the specified time range: {start_time} to {end_time}.")
+            logger.warning('No wifi network data available for the specified time range: %s to %s.', start_time, end_time)
             return
         
         with open(wifi_network_snippet_output_file, 'w') as fout:
@@ -602,33 +1030,107 @@ class SideSeeingInstance:
             left_zeros,
         )
     
+    def frame_table(self, fps=None):
+        '''
+        Returns the frame <-> sensor/GPS/consumption lookup table of the instance (see frames.FrameTable).
+        It is built on the first call and cached per frame rate.
+
+        Args:
+            fps (float, optional): Overrides the video frame rate.
+        '''
+        if not hasattr(self, '_frame_tables'):
+            self._frame_tables = {}
+        if fps not in self._frame_tables:
+            self._frame_tables[fps] = frames.FrameTable(self, fps)
+        return self._frame_tables[fps]
+
+    def align(self, streams=None, target='video', method='linear', tolerance=None, as_array=False):
+        '''
+        Aligns several streams onto a common timeline (video frames, a fixed rate or explicit times)
+        and returns them as one table (see alignment.align).
+
+        Args:
+            streams (str or list, optional): Modalities, raw sensor names or canonical sensor types. Defaults to every stream.
+            target: 'video', a rate in Hz, or explicit times (seconds since the media start, or datetimes).
+            method (str or dict): 'linear', 'nearest' or 'previous' (as-of), optionally per stream.
+            tolerance (float, optional): Maximum distance, in seconds, to the samples used; farther times become NaN.
+            as_array (bool): If True, returns `(times, values, columns)` instead of a DataFrame.
+
+        Example:
+            instance.align(['accelerometer', 'gyroscope', 'geolocation_points'], target=50, tolerance=0.05)
+        '''
+        return alignment.align(self, streams, target, method, tolerance, as_array)
+
+    def geotag_timeline(self, target='video', max_gap_s: float = geotag.MAX_GAP_S, max_edge_s: float = geotag.MAX_EDGE_S,
+                        drift_mps: float = geotag.DRIFT_MPS):
+        '''
+        Interpolates the GPS track on a timeline: latitude, longitude and an accuracy estimate per video
+        frame, at a fixed rate or at explicit times (see geotag.geotag; geotag.geotag_sensors tags every
+        sensor sample).
+
+        Args:
+            target: 'video', a rate in Hz, or explicit times (seconds since the media start, or datetimes).
+            max_gap_s (float): Longest interval between fixes that is interpolated, in seconds.
+            max_edge_s (float): How long the first/last fix is held outside the track, in seconds.
+            drift_mps (float): Growth of the accuracy estimate away from the fixes, in m/s.
+
+        Example:
+            instance.geotag_timeline('video', max_gap_s=20)
+        '''
+        return geotag.geotag(self, target, max_gap_s, max_edge_s, drift_mps)
+
+    def linear_acceleration(self, rate: float = None, use_magnetometer: bool = True, as_array: bool = False):
+        '''
+        Returns the gravity-free acceleration in the East-North-Up world frame, from the accelerometer,
+        gyroscope and magnetometer combined by a complementary filter (see fusion.linear_acceleration).
+
+        Args:
+            rate (float, optional): A fixed output rate in Hz. Defaults to the accelerometer samples.
+            use_magnetometer (bool): If False, the heading is relative to the first sample.
+            as_array (bool): If True, returns `(times, linear_acceleration, rotation)` arrays.
+
+        Example:
+            world = instance.linear_acceleration(rate=100)
+        '''
+        return fusion.linear_acceleration(self, rate, use_magnetometer=use_magnetometer, as_array=as_array)
+
+    def simplified_track(self, tolerance_m: float = 1.0, method: str = 'douglas-peucker') -> pd.DataFrame:
+        '''
+        Returns the GPS fixes needed to draw the track within `tolerance_m` meters (see simplify.simplify).
+        The importance of every fix is computed on the first call and cached per method, so further
+        levels of detail only cost a comparison. The cache is dropped when `geolocation_points` is
+        replaced by another DataFrame.
+
+        Example:
+            overview, detail = instance.simplified_track(50), instance.simplified_track(2)
+        '''
+        gps = self.geolocation_points
+        if gps is None or gps.empty:
+            return gps
+        if getattr(self, '_track_source', None) is not gps:
+            self._track_source = gps
+            self._track_importance = {}
+        if method not in self._track_importance:
+            self._track_importance[method] = simplify.importance(gps['latitude'], gps['longitude'], method)
+        return gps[self._track_importance[method] > tolerance_m]
+
+    def charge_integral(self):
+        '''
+        Returns the cumulative battery charge of the instance (see energy.ChargeIntegral), for charge and
+        energy lookups over any time window. It is built on the first call and cached until
+        `consumption` is replaced by another DataFrame.
+
+        Example:
+            instance.charge_integral().charge(10, 40)  # mAh between 10 s and 40 s after the media start
+        '''
+        if not hasattr(self, '_charge_integral') or self._charge_source is not self.consumption:
+            self._charge_source = self.consumption
+            self._charge_integral = energy.ChargeIntegral(self.consumption, self.media_start_time)
+        return self._charge_integral
+
     def calculate_sample_distance_traveled(self) -> float:
         """ 
         Calculates the distance traveled within a single sample, in km.
+        See trajectory.metrics for speeds, stops and moving time.
         """
-        df_gps = self.geolocation_points
-        if df_gps is None or df_gps.empty or len(df_gps) < 2:
-            return 0.0
-            
-        df_gps = df_gps.sort_values(by='Datetime UTC')
-        df_gps['latitude'] = pd.to_numeric(df_gps['latitude'], errors='coerce')
-        df_gps['longitude'] = pd.to_numeric(df_gps['longitude'], errors='coerce')
-        df_gps = df_gps.dropna(subset=['latitude', 'longitude'])
-        
-        if len(df_gps) < 2:
-            return 0.0
-
-        # Calculate the distance between consecutive points using pandas vector operations.
-        df_gps['latitude_next'] = df_gps['latitude'].shift(-1)
-        df_gps['longitude_next'] = df_gps['longitude'].shift(-1)
-        mask = df_gps['latitude_next'].notnull() & df_gps['longitude_next'].notnull()
-        
-        distances = df_gps.loc[mask].apply(
-            lambda row: utils.calculate_haversine_distance(
-                row['latitude'], row['longitude'],
-                row['latitude_next'], row['longitude_next']
-            ),
-            axis=1
-        )
-
-        return float(distances.sum())
+        return float(trajectory.metrics(self.geolocation_points)['distance_km'])
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools.spatial import EARTH_RADIUS_M
+
+
+METHODS = ['douglas-peucker', 'visvalingam']
+
+DEFAULT_LEVELS = [1.0, 5.0, 20.0, 100.0]
+
+
+def project(latitude, longitude) -> tuple:
+    '''
+    Projects coordinates onto local x/y meters (equirectangular, around the mean latitude).
+    '''
+    latitude = np.asarray(latitude, dtype='float64')
+    longitude = np.asarray(longitude, dtype='float64')
+    ref = np.radians(np.nanmean(latitude)) if len(latitude) else 0.0
+    return (
+        np.radians(longitude) * EARTH_RADIUS_M * np.cos(ref),
+        np.radians(latitude) * EARTH_RADIUS_M,
+    )
+
+
+def _segment_distance(px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(length > 0, ((px - ax) * dx + (py - ay) * dy) / np.where(length > 0, length, 1), 0.0)
+    t = np.clip(t, 0, 1)
+    return np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def _first_per_group(groups, values):
+    '''
+    Returns the positions of the largest value of each group (the first one on ties).
+    '''
+    order = np.lexsort((-values, groups))
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.concatenate([[True], sorted_groups[1:] != sorted_groups[:-1]]))
+    return order[starts]
+
+
+def douglas_peucker_importance(x, y) -> np.ndarray:
+    '''
+    Returns, for every point of a polyline, the largest Douglas-Peucker tolerance at which it
+    is kept, so `importance > tolerance` selects the same points as running Douglas-Peucker
+    with that tolerance. The endpoints get inf.
+
+    All segments of the current simplification are split at once: every iteration computes
+    the distance of every remaining point to its enclosing segment in one vectorized pass and
+    keeps the farthest point of each segment. A point split from segment (a, b) at distance d
+    is kept for tolerances below min(d, importance[a], importance[b]), since the segment only
+    exists when both endpoints are kept.
+    '''
+    n = len(x)
+    importance = np.zeros(n)
+    if n == 0:
+        return importance
+    importance[[0, -1]] = np.inf
+    if n < 3:
+        return importance
+
+    kept = np.array([0, n - 1])
+    candidates = np.arange(1, n - 1)
+    while len(candidates):
+        segment = np.searchsorted(kept, candidates, side='right') - 1
+        a, b = kept[segment], kept[segment + 1]
+        distance = _segment_distance(x[candidates], y[candidates], x[a], y[a], x[b], y[b])
+
+        best = _first_per_group(segment, distance)
+        best = best[distance[best] > 0]
+        if len(best) == 0:
+            break
+
+        winners = candidates[best]
+        importance[winners] = np.minimum(distance[best], np.minimum(importance[a[best]], importance[b[best]]))
+
+        live = np.zeros(len(kept), dtype=bool)
+        live[segment[best]] = True
+        remaining = np.ones(len(candidates), dtype=bool)
+        remaining[best] = False
+        candidates = candidates[remaining & live[segment]]
+        kept = np.union1d(kept, winners)
+
+    return importance
+
+
+def _triangle_areas(x, y, points):
+    ax, ay = x[points[:-2]], y[points[:-2]]
+    bx, by = x[points[1:-1]], y[points[1:-1]]
+    cx, cy = x[points[2:]], y[points[2:]]
+    return np.abs((bx - ax) * (cy - ay) - (cx - ax) * (by - ay)) / 2
+
+
+def visvalingam_importance(x, y) -> np.ndarray:
+    '''
+    Returns, for every point of a polyline, its Visvalingam-Whyatt effective area expressed as
+    a length (the square root of the area, in the units of x and y), so it can be compared to
+    the same tolerances as `douglas_peucker_importance`. The endpoints get inf.
+
+    Points are eliminated in batches: every pass removes all points whose triangle is smaller
+    than the triangles of both neighbours (never two adjacent points), and effective areas are
+    kept non-decreasing in elimination order.
+    '''
+    n = len(x)
+    importance = np.zeros(n)
+    if n == 0:
+        return importance
+    importance[[0, -1]] = np.inf
+    if n < 3:
+        return importance
+
+    points = np.arange(n)
+    largest = 0.0
+    while len(points) > 2:
+        areas = np.concatenate([[np.inf], _triangle_areas(x, y, points), [np.inf]])
+        minima = np.flatnonzero((areas[1:-1] < areas[:-2]) & (areas[1:-1] <= areas[2:])) + 1
+        if len(minima) == 0:
+            minima = np.array([np.argmin(areas[1:-1]) + 1])
+
+        removed = np.maximum(areas[minima], largest)
+        importance[points[minima]] = np.sqrt(removed)
+        largest = removed.max()
+
+        keep = np.ones(len(points), dtype=bool)
+        keep[minima] = False
+        points = points[keep]
+
+    return importance
+
+
+def importance(latitude, longitude, method: str = 'douglas-peucker') -> np.ndarray:
+    '''
+    Returns the simplification importance of every point of a track, in meters (see
+    `douglas_peucker_importance` and `visvalingam_importance`). Points with a missing
+    coordinate get -inf and are never kept.
+    '''
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Use one of {METHODS}.")
+
+    latitude = np.asarray(latitude, dtype='float64')
+    longitude = np.asarray(longitude, dtype='float64')
+    valid = ~(np.isnan(latitude) | np.isnan(longitude))
+
+    result = np.full(len(latitude), -np.inf)
+    x, y = project(latitude[valid], longitude[valid])
+    compute = douglas_peucker_importance if method == 'douglas-peucker' else visvalingam_importance
+    result[valid] = compute(x, y)
+    return result
+
+
+def simplify(gps: pd.DataFrame, tolerance_m: float = 1.0, method: str = 'douglas-peucker') -> pd.DataFrame:
+    '''
+    Simplifies a GPS track, keeping the rows needed to stay within `tolerance_m` meters of the
+    original path (Douglas-Peucker) or dropping the points with the smallest triangles
+    (Visvalingam-Whyatt). The first and last fixes are always kept.
+
+    Args:
+        gps (pd.DataFrame): A `geolocation_points` DataFrame, in time order.
+        tolerance_m (float): The tolerance in meters.
+        method (str): 'douglas-peucker' or 'visvalingam'.
+
+    Returns:
+        pd.DataFrame: The kept rows of `gps`.
+    '''
+    if gps is None or gps.empty:
+        return gps
+    weights = importance(gps['latitude'], gps['longitude'], method)
+    return gps[weights > tolerance_m]
+
+
+def levels_of_detail(gps: pd.DataFrame, tolerances: list = None, method: str = 'douglas-peucker') -> dict:
+    '''
+    Simplifies a GPS track at several tolerances (in meters) from a single importance pass.
+
+    Returns:
+        dict: {tolerance: DataFrame with the kept rows of `gps`}.
+    '''
+    tolerances = DEFAULT_LEVELS if tolerances is None else tolerances
+    if gps is None or gps.empty:
+        return {tolerance: gps for tolerance in tolerances}
+    weights = importance(gps['latitude'], gps['longitude'], method)
+    return {tolerance: gps[weights > tolerance] for tolerance in tolerances}
@@ -0,0 +1,255 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import utils
+
+
+EARTH_RADIUS_M = 6371000.0
+
+HIT_COLUMNS = ['instance', 'start_time', 'end_time', 'points']
+
+
+def _haversine_m(lat1, lon1, lat2, lon2):
+    return utils.haversine_distance(lat1, lon1, lat2, lon2, radius=EARTH_RADIUS_M)
+
+
+def grid_cells(latitude, longitude, cell_size_m: float, ref_latitude: float):
+    '''
+    Projects positions (equirectangular, around `ref_latitude`) onto a grid of square
+    cells of `cell_size_m` meters and returns the column and row of their cells.
+    '''
+    y = np.radians(latitude) * EARTH_RADIUS_M
+    x = np.radians(longitude) * EARTH_RADIUS_M * np.cos(np.radians(ref_latitude))
+    return np.floor(x / cell_size_m).astype('int64'), np.floor(y / cell_size_m).astype('int64')
+
+
+def grid_center(cx, cy, cell_size_m: float, ref_latitude: float):
+    '''
+    Returns the latitude and longitude of the center of grid cells (see `grid_cells`).
+    '''
+    latitude = np.degrees((cy + 0.5) * cell_size_m / EARTH_RADIUS_M)
+    longitude = np.degrees((cx + 0.5) * cell_size_m / (EARTH_RADIUS_M * np.cos(np.radians(ref_latitude))))
+    return latitude, longitude
+
+
+def grid_key(cx, cy):
+    '''
+    Packs the column and row of grid cells into one sortable int64 key (row-major).
+    '''
+    return (cy << 32) + (cx + (1 << 31))
+
+
+class GeoIndex:
+    '''
+    A dataset-wide spatial index over GPS fixes.
+
+    Fixes are projected (equirectangular, around `ref_latitude`) onto a grid of square
+    cells of `cell_size_m` meters and kept sorted by cell key, so bounding-box and radius
+    queries only touch the cells they overlap. Hits are reported per instance as time
+    spans, in seconds since the media start, covering consecutive matching fixes.
+
+    Args:
+        cell_size_m (float): The grid cell size in meters.
+        ref_latitude (float, optional): Latitude used for the projection. Defaults to the mean latitude of the first instances added.
+
+    Example:
+        index = GeoIndex.from_dataset(ds, cell_size_m=50)
+        hits = index.query_radius(-23.5395, -46.7074, 50)
+    '''
+    def __init__(self, cell_size_m: float = 50.0, ref_latitude: float = None):
+        self.cell_size_m = float(cell_size_m)
+        self.ref_latitude = ref_latitude
+        self.instance_names = []
+        self._keys = np.empty(0, dtype='int64')
+        self._latitude = np.empty(0, dtype='float64')
+        self._longitude = np.empty(0, dtype='float64')
+        self._seconds = np.empty(0, dtype='float64')
+        self._instance = np.empty(0, dtype='int32')
+        self._order = np.empty(0, dtype='int32')
+
+    @classmethod
+    def from_dataset(cls, dataset, cell_size_m: float = 50.0, ref_latitude: float = None):
+        index = cls(cell_size_m, ref_latitude)
+        index.update(dataset)
+        return index
+
+    @property
+    def size(self):
+        return len(self._keys)
+
+    def _cells(self, latitude, longitude):
+        return grid_cells(latitude, longitude, self.cell_size_m, self.ref_latitude)
+
+    def update(self, dataset):
+        '''
+        Adds the instances of `dataset` that are not indexed yet.
+        '''
+        indexed = set(self.instance_names)
+        batch = [i for i in dataset.iterator if i.name not in indexed]
+        self._add(batch)
+
+    def add_instance(self, instance):
+        '''
+        Adds (or replaces) the GPS fixes of an instance.
+        '''
+        if instance.name in self.instance_names:
+            self.remove_instance(instance.name)
+        self._add([instance])
+
+    def remove_instance(self, name: str):
+        code = self.instance_names.index(name)
+        keep = self._instance != code
+        self._select(keep)
+        self.instance_names[code] = None
+
+    def _select(self, mask):
+        self._keys = self._keys[mask]
+        self._latitude = self._latitude[mask]
+        self._longitude = self._longitude[mask]
+        self._seconds = self._seconds[mask]
+        self._instance = self._instance[mask]
+        self._order = self._order[mask]
+
+    def _add(self, instances):
+        lats, lons, secs, codes, orders = [], [], [], [], []
+
+        for instance in instances:
+            gps = instance.geolocation_points
+            if gps is None or gps.empty:
+                continue
+
+            gps = gps.dropna(subset=['latitude', 'longitude'])
+            code = len(self.instance_names)
+            self.instance_names.append(instance.name)
+
+            lats.append(gps['latitude'].to_numpy(dtype='float64'))
+            lons.append(gps['longitude'].to_numpy(dtype='float64'))
+            secs.append(utils.seconds_since(gps, instance.media_start_time))
+            codes.append(np.full(len(gps), code, dtype='int32'))
+            orders.append(np.arange(len(gps), dtype='int32'))
+
+        if not lats:
+            return
+
+        latitude = np.concatenate(lats)
+        if self.ref_latitude is None:
+            self.ref_latitude = float(latitude.mean())
+
+        longitude = np.concatenate(lons)
+        cx, cy = self._cells(latitude, longitude)
+
+        self._keys = np.concatenate([self._keys, grid_key(cx, cy)])
+        self._latitude = np.concatenate([self._latitude, latitude])
+        self._longitude = np.concatenate([self._longitude, longitude])
+        self._seconds = np.concatenate([self._seconds] + secs)
+        self._instance = np.concatenate([self._instance] + codes)
+        self._order = np.concatenate([self._order] + orders)
+
+        self._select(np.argsort(self._keys, kind='stable'))
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon):
+        if self.size == 0:
+            return np.empty(0, dtype='int64')
+
+        cx0, cy0 = self._cells(min_lat, min_lon)
+        cx1, cy1 = self._cells(max_lat, max_lon)
+
+        rows = np.arange(int(cy0), int(cy1) + 1, dtype='int64')
+        lo = np.searchsorted(self._keys, grid_key(cx0, rows), side='left')
+        hi = np.searchsorted(self._keys, grid_key(cx1, rows), side='right')
+
+        if not (hi > lo).any():
+            return np.empty(0, dtype='int64')
+        return np.concatenate([np.arange(a, b) for a, b in zip(lo, hi) if b > a])
+
+    def _hits(self, positions):
+        if len(positions) == 0:
+            return pd.DataFrame(columns=HIT_COLUMNS)
+
+        order = np.lexsort((self._order[positions], self._instance[positions]))
+        positions = positions[order]
+
+        instance = self._instance[positions]
+        point_order = self._order[positions]
+        new_span = np.ones(len(positions), dtype=bool)
+        new_span[1:] = (instance[1:] != instance[:-1]) | (point_order[1:] != point_order[:-1] + 1)
+        span_id = np.cumsum(new_span) - 1
+
+        seconds = self._seconds[positions]
+        starts = np.flatnonzero(new_span)
+
+        return pd.DataFrame({
+            'instance': [self.instance_names[c] for c in instance[starts]],
+            'start_time': np.minimum.reduceat(seconds, starts),
+            'end_time': np.maximum.reduceat(seconds, starts),
+            'points': np.bincount(span_id),
+        })
+
+    def query_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> pd.DataFrame:
+        '''
+        Finds the fixes inside a bounding box.
+
+        Returns:
+            pd.DataFrame: One row per instance pass with columns `instance`, `start_time`, `end_time`
+            (seconds since the media start) and `points`.
+        '''
+        candidates = self._candidates(min_lat, min_lon, max_lat, max_lon)
+        lat = self._latitude[candidates]
+        lon = self._longitude[candidates]
+        inside = (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+        return self._hits(candidates[inside])
+
+    def query_radius(self, latitude: float, longitude: float, radius_m: float) -> pd.DataFrame:
+        '''
+        Finds the fixes within `radius_m` meters of a point. See `query_bbox` for the result format.
+        '''
+        dlat = np.degrees(radius_m / EARTH_RADIUS_M)
+        dlon = dlat / max(np.cos(np.radians(latitude)), 1e-12)
+
+        candidates = self._candidates(latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon)
+        distances = _haversine_m(latitude, longitude, self._latitude[candidates], self._longitude[candidates])
+        return self._hits(candidates[distances <= radius_m])
+
+    def save(self, path: str):
+        '''
+        Saves the index to a NumPy .npz file.
+        '''
+        np.savez_compressed(
+            path,
+            cell_size_m=self.cell_size_m,
+            ref_latitude=np.nan if self.ref_latitude is None else self.ref_latitude,
+            instance_names=np.array(['' if n is None else n for n in self.instance_names], dtype=str),
+            removed=np.array([n is None for n in self.instance_names], dtype=bool),
+            keys=self._keys,
+            latitude=self._latitude,
+            longitude=self._longitude,
+            seconds=self._seconds,
+            instance=self._instance,
+            order=self._order,
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        '''
+        Loads an index saved with `save`.
+        '''
+        with np.load(path) as data:
+            ref_latitude = float(data['ref_latitude'])
+            index = cls(float(data['cell_size_m']), None if np.isnan(ref_latitude) else ref_latitude)
+            index.instance_names = [
+                None if removed else str(name)
+                for name, removed in zip(data['instance_names'], data['removed'])
+            ]
+            index._keys = data['keys']
+            index._latitude = data['latitude']
+            index._longitude = data['longitude']
+            index._seconds = data['seconds']
+            index._instance = data['instance']
+            index._order = data['order']
+        return index
+
+    def __str__(self):
+        return f'SSGeoIndex[points: {self.size}, cell_size_m: {self.cell_size_m}]'
+
+    def __repr__(self):
+        return self.__str__()
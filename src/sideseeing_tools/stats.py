@@ -0,0 +1,155 @@
+import math
+
+from sideseeing_tools import constants
+
+
+STATS_COLUMNS = [
+    'instance', 'modality', 'sensor', 'channel', 'count', 'first', 'last', 'duration', 'rate',
+    'min', 'max', 'mean', 'std',
+]
+
+# The channels of constants.CHANNELS plus the numeric fields of the radio scans.
+CHANNELS = dict(constants.CHANNELS, wifi_networks=['level', 'frequency'], cell_networks=['ss', 'level'])
+
+
+class StreamStats:
+    '''
+    Running statistics of one stream, updated one row at a time while a file is parsed.
+
+    It keeps the number of rows, the first and last timestamps and, for every channel,
+    the number of numeric values, their minimum, maximum, mean and sum of squared
+    deviations (Welford's algorithm), so the variance is numerically stable and no second
+    pass over the data is needed. Values that are not numbers (None, '', NaN) are skipped.
+    Two StreamStats can be combined with `merge` (Chan et al.), e.g. across instances.
+
+    Args:
+        channels (list): The channel names.
+
+    Example:
+        instance.stats[('sensors3', 'icm4x6xx accelerometer non-wakeup')].mean
+    '''
+    def __init__(self, channels: list):
+        self.channels = list(channels)
+        self.count = 0
+        self.first = None
+        self.last = None
+        n = len(self.channels)
+        self.counts = [0] * n
+        self.means = [0.0] * n
+        self.m2 = [0.0] * n
+        self.mins = [math.inf] * n
+        self.maxs = [-math.inf] * n
+
+    def push(self, timestamp, values):
+        '''
+        Adds a row: its timestamp and one value per channel.
+        '''
+        self.count += 1
+        if self.first is None or timestamp < self.first:
+            self.first = timestamp
+        if self.last is None or timestamp > self.last:
+            self.last = timestamp
+
+        counts, means, m2, mins, maxs = self.counts, self.means, self.m2, self.mins, self.maxs
+        for ind, value in enumerate(values):
+            if type(value) is not float:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+            if value != value:
+                continue
+
+            n = counts[ind] + 1
+            counts[ind] = n
+            delta = value - means[ind]
+            mean = means[ind] + delta / n
+            means[ind] = mean
+            m2[ind] += delta * (value - mean)
+            if value < mins[ind]:
+                mins[ind] = value
+            if value > maxs[ind]:
+                maxs[ind] = value
+
+    def merge(self, other: 'StreamStats') -> 'StreamStats':
+        '''
+        Returns the statistics of both streams together.
+        '''
+        merged = StreamStats(self.channels)
+        merged.count = self.count + other.count
+        firsts = [t for t in (self.first, other.first) if t is not None]
+        lasts = [t for t in (self.last, other.last) if t is not None]
+        merged.first = min(firsts) if firsts else None
+        merged.last = max(lasts) if lasts else None
+
+        for ind in range(len(self.channels)):
+            n_a, n_b = self.counts[ind], other.counts[ind]
+            n = n_a + n_b
+            merged.counts[ind] = n
+            merged.mins[ind] = min(self.mins[ind], other.mins[ind])
+            merged.maxs[ind] = max(self.maxs[ind], other.maxs[ind])
+            if n == 0:
+                continue
+            delta = other.means[ind] - self.means[ind]
+            merged.means[ind] = self.means[ind] + delta * n_b / n
+            merged.m2[ind] = self.m2[ind] + other.m2[ind] + delta ** 2 * n_a * n_b / n
+        return merged
+
+    @property
+    def duration(self) -> float:
+        '''
+        Seconds between the first and the last row.
+        '''
+        if self.first is None:
+            return 0.0
+        return (self.last - self.first).total_seconds()
+
+    @property
+    def rate(self) -> float:
+        '''
+        The effective sample rate, in rows per second (NaN with fewer than two distinct timestamps).
+        '''
+        return (self.count - 1) / self.duration if self.duration > 0 else math.nan
+
+    def _value(self, values, ind):
+        return values[ind] if self.counts[ind] else math.nan
+
+    @property
+    def mean(self) -> dict:
+        return {c: self._value(self.means, i) for i, c in enumerate(self.channels)}
+
+    @property
+    def variance(self) -> dict:
+        '''
+        The population variance of each channel.
+        '''
+        return {c: self.m2[i] / self.counts[i] if self.counts[i] else math.nan for i, c in enumerate(self.channels)}
+
+    @property
+    def std(self) -> dict:
+        return {c: math.sqrt(v) for c, v in self.variance.items()}
+
+    @property
+    def min(self) -> dict:
+        return {c: self._value(self.mins, i) for i, c in enumerate(self.channels)}
+
+    @property
+    def max(self) -> dict:
+        return {c: self._value(self.maxs, i) for i, c in enumerate(self.channels)}
+
+    def to_rows(self, instance: str, modality: str, sensor: str) -> list:
+        '''
+        Returns one row per channel, with the columns of STATS_COLUMNS.
+        '''
+        mean, std, minimum, maximum = self.mean, self.std, self.min, self.max
+        return [
+            [instance, modality, sensor, c, self.counts[i], self.first, self.last, self.duration, self.rate,
+             minimum[c], maximum[c], mean[c], std[c]]
+            for i, c in enumerate(self.channels)
+        ]
+
+    def __str__(self):
+        return f'SSStreamStats[count: {self.count}, channels: {self.channels}, rate: {self.rate:.2f}]'
+
+    def __repr__(self):
+        return self.__str__()
@@ -101,10 +101,27 @@ function initGeoSection(activeMaps, loadedGeoData) {
         const polyline = L.polyline(path, { color: 'blue', opacity: 0.6, weight: 2 }).addTo(map);
         const bounds = polyline.getBounds();
 
+        // Coarser levels of detail are used while their tolerance stays under one pixel
+        const levels = Object.entries(geoData.levels || {})
+            .map(([tolerance, points]) => [parseFloat(tolerance), points])
+            .sort((a, b) => b[0] - a[0]);
+        let currentPath = path;
+        function updateLevelOfDetail() {
+            const metersPerPixel = 156543.03 * Math.cos(center[0] * Math.PI / 180) / Math.pow(2, map.getZoom());
+            const level = levels.find(([tolerance, points]) => tolerance <= metersPerPixel && points.length > 1);
+            const nextPath = level ? level[1] : path;
+            if (nextPath !== currentPath) {
+                currentPath = nextPath;
+                polyline.setLatLngs(nextPath);
+            }
+        }
+        map.on('zoomend', updateLevelOfDetail);
+
         L.marker(path[0]).addTo(map).bindPopup('<b>Start</b>');
         L.marker(path[path.length - 1]).addTo(map).bindPopup('<b>End</b>');
 
         map.fitBounds(bounds, { padding: [20, 20] });
+        updateLevelOfDetail();
 
         activeMaps['geo-map'] = map;
         cleanupFullscreen = addFullscreenControl(map, 'geo-map-container');
@@ -47,6 +47,16 @@ function initSidewalkAssessmentMap() {
         overviewMap.fitBounds(initialBounds);
     }
 
+    if (typeof SIDEWALK_FILE !== 'undefined' && SIDEWALK_FILE) {
+        fetch(SIDEWALK_FILE)
+            .then(response => {
+                if (!response.ok) throw new Error(`Failed to load ${SIDEWALK_FILE}`);
+                return response.json();
+            })
+            .then(data => addRoughnessSegments(overviewMap, data))
+            .catch(err => console.error("Error loading sidewalk data:", err));
+    }
+
     // Add centralized controls
     addFullscreenControl(overviewMap, 'sidewalk-assessment-map-container');
     addRecenterControl(overviewMap, initialBounds);
@@ -55,3 +65,16 @@ function initSidewalkAssessmentMap() {
     mapDiv.closest('.section-content').dataset.mapId = 'sidewalk-assessment-map';
     window.activeMaps['sidewalk-assessment-map'] = overviewMap;
 }
+
+function addRoughnessSegments(map, data) {
+    // Segments are [sample, start_lat, start_lon, end_lat, end_lon, roughness, roughness_max]
+    const colors = ['#16a34a', '#eab308', '#f97316', '#dc2626'];
+    const quantiles = data.quantiles || [];
+
+    data.segments.forEach(([name, startLat, startLon, endLat, endLon, roughness, roughnessMax]) => {
+        const level = quantiles.filter(q => roughness > q).length;
+        L.polyline([[startLat, startLon], [endLat, endLon]], { color: colors[level], weight: 6, opacity: 0.8 })
+            .bindPopup(`<b>Sample:</b> ${name}<br><b>Roughness:</b> ${roughness.toFixed(3)} m/s²<br><b>Max:</b> ${roughnessMax.toFixed(3)} m/s²`)
+            .addTo(map);
+    });
+}
@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import constants
+
+
+INTERVAL_COLUMNS = ['instance', 'modality', 'sensor', 'start', 'stop']
+
+
+def _to_ns(values):
+    return np.asarray(pd.to_datetime(pd.Series(values, dtype=object)).to_numpy(dtype='datetime64[ns]')).view('int64')
+
+
+def _expand(query, lo, hi):
+    '''
+    Expands per-query slices [lo, hi) into aligned arrays (query, slot).
+    '''
+    counts = hi - lo
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(query, counts), np.repeat(lo, counts) + offsets
+
+
+class TimeIntervalIndex:
+    '''
+    A static index of wall-clock intervals (e.g. recordings or sensor coverage).
+
+    Intervals are kept in a centred interval tree: every node holds the intervals that contain
+    its center (an endpoint median), sorted by start and by stop, and the intervals entirely
+    before or after the center go to its children. A point query walks one root-to-leaf path
+    and reports a prefix or suffix of each node on it; a range [a, b] is the intervals containing
+    `a` plus those starting in (a, b], found with two binary searches on the start-sorted list.
+    Queries cost O(log n + k) for k results, whatever the interval lengths, and batches of queries
+    (as in `overlap_join`) walk the tree one level at a time for all of them.
+
+    Args:
+        intervals (pd.DataFrame): Columns `start` and `stop` (datetimes) plus any label columns.
+    '''
+    def __init__(self, intervals: pd.DataFrame):
+        intervals = intervals.copy()
+        intervals['start'] = pd.to_datetime(intervals['start'])
+        intervals['stop'] = pd.to_datetime(intervals['stop'])
+        self.intervals = intervals.sort_values('start', kind='stable').reset_index(drop=True)
+
+        self._start = _to_ns(self.intervals['start'])
+        self._stop = _to_ns(self.intervals['stop'])
+        self._build_tree()
+
+    def _build_tree(self):
+        '''
+        Builds the centred interval tree as flat arrays. Node `i` has a center, two children (-1 if none)
+        and a slice [offset, offset + count) of `_by_start` (positions sorted by start) and `_by_stop`
+        (sorted by stop). Endpoints are replaced by their rank among all endpoints, so the sort keys
+        `node * _span + rank` of all nodes fit one sorted array and one `searchsorted` serves every node.
+        '''
+        self._endpoints = np.unique(np.concatenate([self._start, self._stop]))
+        self._span = len(self._endpoints) + 1
+        start_rank = np.searchsorted(self._endpoints, self._start) + 1
+        stop_rank = np.searchsorted(self._endpoints, self._stop) + 1
+
+        centers, left, right, counts, by_start, by_stop = [], [], [], [], [], []
+        pending = [(np.arange(len(self._start)), -1, None)] if len(self._start) else []
+        while pending:
+            positions, parent, side = pending.pop()
+            node = len(centers)
+            if parent >= 0:
+                (left if side == 'left' else right)[parent] = node
+
+            endpoints = np.concatenate([self._start[positions], self._stop[positions]])
+            center = np.partition(endpoints, len(endpoints) // 2)[len(endpoints) // 2]
+            before = self._stop[positions] < center
+            after = self._start[positions] > center
+            here = positions[~(before | after)]
+
+            centers.append(center)
+            left.append(-1)
+            right.append(-1)
+            counts.append(len(here))
+            by_start.append(here[np.argsort(start_rank[here], kind='stable')])
+            by_stop.append(here[np.argsort(stop_rank[here], kind='stable')])
+            if before.any():
+                pending.append((positions[before], node, 'left'))
+            if after.any():
+                pending.append((positions[after], node, 'right'))
+
+        self._centers = np.asarray(centers, dtype='int64')
+        self._left = np.asarray(left, dtype='int64')
+        self._right = np.asarray(right, dtype='int64')
+        self._counts = np.asarray(counts, dtype='int64')
+        self._offsets = np.cumsum(self._counts) - self._counts
+        self._by_start = np.concatenate(by_start) if by_start else np.empty(0, dtype='int64')
+        self._by_stop = np.concatenate(by_stop) if by_stop else np.empty(0, dtype='int64')
+
+        node_of = np.repeat(np.arange(len(centers)), self._counts)
+        self._start_keys = node_of * self._span + start_rank[self._by_start]
+        self._stop_keys = node_of * self._span + stop_rank[self._by_stop]
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        '''
+        Indexes the media interval (`media_start_time` to `media_stop_time`) of each instance.
+        '''
+        rows = [
+            [i.name, 'media', None, i.media_start_time, i.media_stop_time]
+            for i in dataset.iterator
+        ]
+        return cls(pd.DataFrame(rows, columns=INTERVAL_COLUMNS))
+
+    @classmethod
+    def coverage_from_dataset(cls, dataset):
+        '''
+        Indexes the coverage interval (first to last sample) of every modality and sensor of each instance.
+        '''
+        rows = []
+        for instance in dataset.iterator:
+            streams = []
+            for modality in constants.SENSOR_ATTRIBUTES:
+                for sensor_name, df in (getattr(instance, modality, None) or {}).items():
+                    streams.append((modality, sensor_name, df))
+            for modality in constants.TABLE_ATTRIBUTES + constants.RADIO_ATTRIBUTES:
+                streams.append((modality, None, getattr(instance, modality, None)))
+
+            for modality, sensor_name, df in streams:
+                if df is None or df.empty:
+                    continue
+                rows.append([instance.name, modality, sensor_name, df['Datetime UTC'].min(), df['Datetime UTC'].max()])
+
+        return cls(pd.DataFrame(rows, columns=INTERVAL_COLUMNS))
+
+    @property
+    def size(self):
+        return len(self.intervals)
+
+    def _stabbing(self, times):
+        '''
+        For each query time returns the positions of the indexed intervals containing it,
+        as two aligned arrays (query position, indexed position).
+        '''
+        # Ranks of the last endpoint <= t and of the first endpoint >= t.
+        at_most = np.searchsorted(self._endpoints, times, side='right')
+        at_least = np.searchsorted(self._endpoints, times, side='left') + 1
+
+        found_query, found_lo, found_hi, found_side = [], [], [], []
+        query = np.arange(len(times)) if len(self._centers) else np.empty(0, dtype='int64')
+        node = np.zeros(len(query), dtype='int64')
+        while len(query):
+            center = self._centers[node]
+            t = times[query]
+            begin, end = self._offsets[node], self._offsets[node] + self._counts[node]
+
+            # Before the center: the node intervals starting at or before t (a prefix by start).
+            # After it: those stopping at or after t (a suffix by stop). On it: all of them.
+            lo = np.where(t > center, np.searchsorted(self._stop_keys, node * self._span + at_least[query], side='left'), begin)
+            hi = np.where(t < center, np.searchsorted(self._start_keys, node * self._span + at_most[query], side='right'), end)
+            found_query.append(query)
+            found_lo.append(lo)
+            found_hi.append(hi)
+            found_side.append(t > center)
+
+            child = np.where(t < center, self._left[node], np.where(t > center, self._right[node], -1))
+            query, node = query[child >= 0], child[child >= 0]
+
+        if not found_query:
+            return np.empty(0, dtype='int64'), np.empty(0, dtype='int64')
+        query, lo, hi, by_stop = (np.concatenate(a) for a in (found_query, found_lo, found_hi, found_side))
+        query, slots = _expand(query, lo, hi)
+        repeated = np.repeat(by_stop, hi - lo)
+        return query, np.where(repeated, self._by_stop[slots], self._by_start[slots])
+
+    def _overlapping(self, starts, stops):
+        '''
+        For each query interval returns the positions of the indexed intervals overlapping it,
+        as two aligned arrays (query position, indexed position): those containing its start
+        and those starting after its start and no later than its stop.
+        '''
+        stab_query, stab_found = self._stabbing(starts)
+
+        lo = np.searchsorted(self._start, starts, side='right')
+        hi = np.searchsorted(self._start, stops, side='right')
+        later_query, later_found = _expand(np.arange(len(starts)), lo, np.maximum(hi, lo))
+
+        return np.concatenate([stab_query, later_query]), np.concatenate([stab_found, later_found])
+
+    def query_range(self, start, stop) -> pd.DataFrame:
+        '''
+        Returns the intervals overlapping [start, stop].
+        '''
+        _, found = self._overlapping(_to_ns([start]), _to_ns([stop]))
+        return self.intervals.iloc[np.sort(found)].reset_index(drop=True)
+
+    def query_point(self, time) -> pd.DataFrame:
+        '''
+        Returns the intervals that contain `time`.
+        '''
+        return self.query_range(time, time)
+
+    def overlap_join(self, other=None, min_overlap: float = 0.0) -> pd.DataFrame:
+        '''
+        Finds every pair of overlapping intervals between this index and `other`.
+        Without `other`, joins the index with itself and reports each pair once,
+        skipping pairs from the same instance.
+
+        Args:
+            other (TimeIntervalIndex, optional): The index to join with.
+            min_overlap (float): Minimum overlap, in seconds.
+
+        Returns:
+            pd.DataFrame: The columns of both sides prefixed with `left_`/`right_`, plus
+            `overlap_start`, `overlap_stop` and `overlap_seconds`.
+        '''
+        right = self if other is None else other
+        left_pos, right_pos = right._overlapping(self._start, self._stop)
+
+        if other is None:
+            same_instance = (
+                self.intervals['instance'].to_numpy()[left_pos] ==
+                self.intervals['instance'].to_numpy()[right_pos]
+            )
+            keep = (left_pos < right_pos) & ~same_instance
+            left_pos, right_pos = left_pos[keep], right_pos[keep]
+
+        overlap_start = np.maximum(self._start[left_pos], right._start[right_pos])
+        overlap_stop = np.minimum(self._stop[left_pos], right._stop[right_pos])
+        overlap_seconds = (overlap_stop - overlap_start) / 1e9
+
+        keep = overlap_seconds >= min_overlap
+        left = self.intervals.iloc[left_pos[keep]].add_prefix('left_').reset_index(drop=True)
+        right_df = right.intervals.iloc[right_pos[keep]].add_prefix('right_').reset_index(drop=True)
+
+        df = pd.concat([left, right_df], axis=1)
+        df['overlap_start'] = overlap_start[keep].astype('datetime64[ns]')
+        df['overlap_stop'] = overlap_stop[keep].astype('datetime64[ns]')
+        df['overlap_seconds'] = overlap_seconds[keep]
+        return df
+
+    def __str__(self):
+        return f'SSTimeIntervalIndex[intervals: {self.size}]'
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import utils
+from sideseeing_tools.spatial import EARTH_RADIUS_M
+
+
+STOP_SPEED_MPS = 0.5
+
+MIN_STOP_S = 5.0
+
+METRIC_COLUMNS = [
+    'points', 'distance_km', 'duration', 'moving_time', 'stopped_time', 'stops',
+    'mean_speed', 'moving_speed', 'max_speed',
+]
+
+
+def _gps_arrays(gps: pd.DataFrame) -> tuple:
+    '''
+    Returns the (time in ns, latitude, longitude) arrays of a GPS DataFrame, sorted by time and
+    without rows missing a coordinate. The DataFrame is not modified.
+    '''
+    if gps is None or gps.empty:
+        return np.empty(0, dtype='int64'), np.empty(0), np.empty(0)
+
+    ns = np.asarray(gps['Datetime UTC'].to_numpy(), dtype='datetime64[ns]').view('int64')
+    latitude = pd.to_numeric(gps['latitude'], errors='coerce').to_numpy(dtype='float64')
+    longitude = pd.to_numeric(gps['longitude'], errors='coerce').to_numpy(dtype='float64')
+
+    keep = ~(np.isnan(latitude) | np.isnan(longitude))
+    ns, latitude, longitude = ns[keep], latitude[keep], longitude[keep]
+    order = np.argsort(ns, kind='stable')
+    return ns[order], latitude[order], longitude[order]
+
+
+def _segments(ns, latitude, longitude):
+    distance = utils.haversine_distance(latitude[:-1], longitude[:-1], latitude[1:], longitude[1:], radius=EARTH_RADIUS_M)
+    dt = np.diff(ns) / 1e9
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = np.where(dt > 0, distance / dt, np.nan)
+    return distance, dt, speed
+
+
+def _stop_runs(stopped: np.ndarray, dt: np.ndarray, min_stop_s: float) -> tuple:
+    '''
+    Groups consecutive stopped segments into runs. Returns the first and last segment of every
+    run lasting at least `min_stop_s` seconds.
+    '''
+    edges = np.diff(np.concatenate([[0], stopped.astype('int8'), [0]]))
+    first = np.flatnonzero(edges == 1)
+    last = np.flatnonzero(edges == -1) - 1
+    cumulative = np.concatenate([[0.0], np.cumsum(dt)])
+    duration = cumulative[last + 1] - cumulative[first]
+    keep = duration >= min_stop_s
+    return first[keep], last[keep]
+
+
+def trajectory(gps: pd.DataFrame, stop_speed: float = STOP_SPEED_MPS, min_stop_s: float = MIN_STOP_S) -> pd.DataFrame:
+    '''
+    Returns the GPS track with per-segment measures: for every fix, the distance (m), time (s)
+    and speed (m/s) since the previous fix, the cumulative distance (m) and whether the
+    segment ending at the fix belongs to a stop (slower than `stop_speed` for at least
+    `min_stop_s` seconds in a row).
+
+    Args:
+        gps (pd.DataFrame): A `geolocation_points` DataFrame. It is not modified.
+        stop_speed (float): Speed, in m/s, below which a segment counts as stopped.
+        min_stop_s (float): Minimum duration, in seconds, of a stop.
+    '''
+    ns, latitude, longitude = _gps_arrays(gps)
+    distance, dt, speed = _segments(ns, latitude, longitude)
+
+    stopped = np.zeros(len(ns), dtype=bool)
+    if len(dt):
+        first, last = _stop_runs(speed < stop_speed, dt, min_stop_s)
+        run = np.zeros(len(dt) + 1, dtype='int64')
+        np.add.at(run, first, 1)
+        np.add.at(run, last + 1, -1)
+        stopped[1:] = np.cumsum(run)[:-1] > 0
+
+    return pd.DataFrame({
+        'Datetime UTC': ns.view('datetime64[ns]'),
+        'latitude': latitude,
+        'longitude': longitude,
+        'distance': np.concatenate([[0.0], distance]),
+        'dt': np.concatenate([[np.nan], dt]),
+        'speed': np.concatenate([[np.nan], speed]),
+        'cumulative_distance': np.concatenate([[0.0], np.cumsum(distance)]),
+        'stopped': stopped,
+    })
+
+
+def segment_boundaries(track: pd.DataFrame, segment_m: float) -> np.ndarray:
+    '''
+    Returns the distances (m) along a track (see `trajectory`) where it is cut into segments of
+    `segment_m` meters: every multiple of `segment_m` and the total distance. Segment `k` spans
+    boundaries `k` to `k + 1`.
+    '''
+    total = float(track['cumulative_distance'].iloc[-1]) if len(track) else 0.0
+    return np.append(np.arange(0, total, segment_m), total)
+
+
+def stops(gps: pd.DataFrame, stop_speed: float = STOP_SPEED_MPS, min_stop_s: float = MIN_STOP_S) -> pd.DataFrame:
+    '''
+    Returns the stops of a GPS track (see `trajectory`): start and end datetimes, duration in
+    seconds and the mean position.
+    '''
+    ns, latitude, longitude = _gps_arrays(gps)
+    columns = ['start', 'end', 'duration', 'latitude', 'longitude']
+    if len(ns) < 2:
+        return pd.DataFrame(columns=columns)
+
+    _, dt, speed = _segments(ns, latitude, longitude)
+    first, last = _stop_runs(speed < stop_speed, dt, min_stop_s)
+
+    cumulative_lat = np.concatenate([[0.0], np.cumsum(latitude)])
+    cumulative_lon = np.concatenate([[0.0], np.cumsum(longitude)])
+    points = last - first + 2
+    return pd.DataFrame({
+        'start': ns[first].view('datetime64[ns]'),
+        'end': ns[last + 1].view('datetime64[ns]'),
+        'duration': (ns[last + 1] - ns[first]) / 1e9,
+        'latitude': (cumulative_lat[last + 2] - cumulative_lat[first]) / points,
+        'longitude': (cumulative_lon[last + 2] - cumulative_lon[first]) / points,
+    }, columns=columns)
+
+
+def _metrics(ns, latitude, longitude, ids, n_tracks, stop_speed, min_stop_s) -> pd.DataFrame:
+    '''
+    Computes the metrics of several tracks laid end to end; `ids` gives the track of every fix.
+    Segments between the last fix of a track and the first fix of the next one are ignored.
+    '''
+    result = pd.DataFrame(0.0, index=range(n_tracks), columns=METRIC_COLUMNS)
+    result['points'] = np.bincount(ids, minlength=n_tracks)
+    result[['mean_speed', 'moving_speed', 'max_speed']] = np.nan
+    if len(ns) < 2:
+        result['points'] = result['points'].astype('int64')
+        result['stops'] = result['stops'].astype('int64')
+        return result
+
+    distance, dt, speed = _segments(ns, latitude, longitude)
+    valid = ids[1:] == ids[:-1]
+    track = ids[:-1]
+
+    distance = np.where(valid, distance, 0.0)
+    dt = np.where(valid, dt, 0.0)
+    total_distance = np.bincount(track, distance, minlength=n_tracks)
+    duration = np.bincount(track, dt, minlength=n_tracks)
+
+    first, last = _stop_runs(valid & (speed < stop_speed), dt, min_stop_s)
+    cumulative = np.concatenate([[0.0], np.cumsum(dt)])
+    stop_duration = cumulative[last + 1] - cumulative[first]
+    stopped_time = np.bincount(track[first], stop_duration, minlength=n_tracks)
+    stop_count = np.bincount(track[first], minlength=n_tracks)
+
+    max_speed = np.full(n_tracks, -np.inf)
+    finite = valid & np.isfinite(speed)
+    np.maximum.at(max_speed, track[finite], speed[finite])
+
+    moving_time = duration - stopped_time
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result['distance_km'] = total_distance / 1000
+        result['duration'] = duration
+        result['moving_time'] = moving_time
+        result['stopped_time'] = stopped_time
+        result['stops'] = stop_count
+        result['mean_speed'] = np.where(duration > 0, total_distance / duration, np.nan)
+        result['moving_speed'] = np.where(moving_time > 0, total_distance / moving_time, np.nan)
+        result['max_speed'] = np.where(np.isfinite(max_speed), max_speed, np.nan)
+    result['points'] = result['points'].astype('int64')
+    result['stops'] = result['stops'].astype('int64')
+    return result
+
+
+def metrics(gps: pd.DataFrame, stop_speed: float = STOP_SPEED_MPS, min_stop_s: float = MIN_STOP_S) -> dict:
+    '''
+    Summarizes a GPS track.
+
+    Returns:
+        dict: `points`, `distance_km`, `duration`, `moving_time` and `stopped_time` (seconds),
+        `stops` (see `trajectory`), and `mean_speed` (over the whole duration), `moving_speed`
+        (over the moving time) and `max_speed` (of any segment), in m/s.
+    '''
+    ns, latitude, longitude = _gps_arrays(gps)
+    ids = np.zeros(len(ns), dtype='int64')
+    return _metrics(ns, latitude, longitude, ids, 1, stop_speed, min_stop_s).to_dict('records')[0]
+
+
+def dataset_metrics(dataset, stop_speed: float = STOP_SPEED_MPS, min_stop_s: float = MIN_STOP_S) -> pd.DataFrame:
+    '''
+    Computes `metrics` for every instance of a dataset in one pass: the tracks are concatenated
+    and distances, speeds and stops are computed once over the whole array and reduced per
+    instance.
+
+    Returns:
+        pd.DataFrame: One row per instance (indexed by name) with the columns of METRIC_COLUMNS.
+
+    Example:
+        metrics = dataset_metrics(ds)
+        metrics['distance_km'].sum()
+    '''
+    names, arrays = [], []
+    for instance in dataset.iterator:
+        names.append(instance.name)
+        arrays.append(_gps_arrays(instance.geolocation_points))
+
+    lengths = [len(ns) for ns, _, _ in arrays]
+    ids = np.repeat(np.arange(len(names)), lengths)
+    if arrays:
+        ns, latitude, longitude = (np.concatenate(parts) for parts in zip(*arrays))
+    else:
+        ns, latitude, longitude = np.empty(0, dtype='int64'), np.empty(0), np.empty(0)
+
+    result = _metrics(ns, latitude, longitude, ids, len(names), stop_speed, min_stop_s)
+    result.index = pd.Index(names, name='instance')
+    return result
@@ -1,8 +1,11 @@
 import csv
 import datetime
+import logging
 import re
 import requests
 import os
+import sys
+import time
 import cv2
 import numpy as np
 import pandas as pd
@@ -11,13 +14,58 @@ import reverse_geocode
 from datetime import timedelta
 from math import radians, sin, cos, sqrt, asin
 
-from .constants import CELL_SNIPPET_HEADER
+from .constants import CELL_SNIPPET_HEADER, SENSOR_ATTRIBUTES
+from .progress import ProgressTracker
+from .stats import CHANNELS, StreamStats
 
 
-def load_csv_data(path: str, fieldnames: list, delimiter=','):
+logger = logging.getLogger(__name__)
+
+
+LOAD_STATS_STAGES = ['read_time', 'parse_time', 'timestamp_time', 'build_time']
+
+# Size hint, in bytes, of the chunks read by `_read_lines`.
+READ_CHUNK_SIZE = 1 << 20
+
+
+def as_list(value) -> list:
+    '''
+    Wraps a single filter value in a list. Lists, tuples and sets are copied into a list and None gives an empty list.
+    '''
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+def create_load_stats(instance_name: str, file_type: str) -> dict:
+    '''
+    Creates an empty record of load statistics for a file of an instance.
+
+    The record is filled by the loading functions that receive it as `load_stats`:
+    bytes read, rows parsed, rows dropped by the media time window, parse errors and
+    the wall time (in seconds) of each stage (read, parse, timestamp conversion and
+    DataFrame build).
+    '''
+    stats = {
+        'instance': instance_name,
+        'file_type': file_type,
+        'bytes_read': 0,
+        'rows_parsed': 0,
+        'rows_dropped': 0,
+        'parse_errors': 0,
+    }
+    for stage in LOAD_STATS_STAGES:
+        stats[stage] = 0.0
+    return stats
+
+
+def load_csv_data(path: str, fieldnames: list, delimiter=',', load_stats=None):
     '''
     Reads a CSV file using csv.DictReader and a predefined list of fields.
     '''
+    started_at = time.perf_counter()
     data = []
 
     with open(path) as fin:
@@ -34,6 +82,10 @@ def load_csv_data(path: str, fieldnames: list, delimiter=','):
             new_row = {k.strip().lower(): v.strip().lower() for k, v in row.items()}
             data.append(new_row)
 
+    if load_stats is not None:
+        load_stats['bytes_read'] += os.path.getsize(path)
+        load_stats['read_time'] += time.perf_counter() - started_at
+
     return data
 
 
@@ -73,8 +125,9 @@ def format_location_to_string(location_data: dict) -> str:
     return ', '.join(parts)
 
 
-def generate_metadata(iterator, datetime_format: str, google_api_key: str = None):
+def generate_metadata(iterator, datetime_format: str, google_api_key: str = None, progress_callback=None, total=None):
     items = []
+    tracker = ProgressTracker('metadata', total=total, callback=progress_callback)
 
     for i in iterator:
         cap = cv2.VideoCapture(i.video)
@@ -114,11 +167,19 @@ def generate_metadata(iterator, datetime_format: str, google_api_key: str = None
         item['so_version'] = i.metadata.get('device', {}).get('androidVersion', '')
         
         items.append(item)
+        tracker.update(item=i.name)
 
     return pd.DataFrame.from_dict(items)
 
 
-def preprocess_sensors(data: dict, num_axes: int, datetime_format: str, start_time=None, end_time=None, debug=False):
+def preprocess_sensors(data: dict, num_axes: int, datetime_format: str, start_time=None, end_time=None, debug=False, load_stats=None, stream_stats=None):
+    '''
+    Parses sensor rows into one DataFrame per sensor name.
+
+    If `stream_stats` is a dict, it is filled with one stats.StreamStats per sensor name,
+    updated while the rows are parsed.
+    '''
+    started_at = time.perf_counter()
     series = {}
     ignored_lines = 0
 
@@ -156,6 +217,11 @@ def preprocess_sensors(data: dict, num_axes: int, datetime_format: str, start_ti
                 float(row['delta_z']),
             ])
 
+        if stream_stats is not None:
+            if sensor_name not in stream_stats:
+                stream_stats[sensor_name] = StreamStats(CHANNELS[f'sensors{num_axes}'])
+            stream_stats[sensor_name].push(ts, current_data[1:])
+
         current_data.append(row['timestamp_nano'])
         current_data.append(row['accuracy'])
         current_data.append(row['name'])
@@ -163,16 +229,27 @@ def preprocess_sensors(data: dict, num_axes: int, datetime_format: str, start_ti
         series[sensor_name].append(current_data)
 
     if ignored_lines > 0 and debug:
-        print(f'INFO. {ignored_lines} lines has been ignored.')
+        logger.info('%s lines has been ignored.', ignored_lines)
 
-    for key, value in series.items():
+    for value in series.values():
         value.sort(key=lambda x: x[0])
-        series[key] = to_dataframe(value, num_axes, datetime_format)
+
+    if load_stats is not None:
+        load_stats['rows_parsed'] += len(data)
+        load_stats['rows_dropped'] += ignored_lines
+        load_stats['parse_time'] += time.perf_counter() - started_at
+
+    for key, value in series.items():
+        series[key] = to_dataframe(value, num_axes, datetime_format, load_stats=load_stats)
 
     return series
 
 
-def preprocess_consumption(data: dict, datetime_format: str, start_time=None, end_time=None):
+def preprocess_consumption(data: dict, datetime_format: str, start_time=None, end_time=None, load_stats=None, stream_stats=None):
+    '''
+    Parses consumption rows. If given, `stream_stats` (a stats.StreamStats) is updated with every kept row.
+    '''
+    started_at = time.perf_counter()
     rows = []
     ignored_lines = 0
 
@@ -188,16 +265,27 @@ def preprocess_consumption(data: dict, datetime_format: str, start_time=None, en
             continue
         
         rows.append([ts, float(row['battery_microamperes'])])
+        if stream_stats is not None:
+            stream_stats.push(ts, rows[-1][1:])
     
     sorted_rows = sorted(rows, key=lambda x: x[0])
 
+    if load_stats is not None:
+        load_stats['rows_parsed'] += len(data)
+        load_stats['rows_dropped'] += ignored_lines
+        load_stats['parse_time'] += time.perf_counter() - started_at
+
     if not sorted_rows:
         return pd.DataFrame()
 
-    return to_dataframe(sorted_rows, 1, datetime_format, data_type='consumption')
+    return to_dataframe(sorted_rows, 1, datetime_format, data_type='consumption', load_stats=load_stats)
 
 
-def preprocess_gps(data: dict, datetime_format: str, start_time=None, end_time=None):
+def preprocess_gps(data: dict, datetime_format: str, start_time=None, end_time=None, load_stats=None, stream_stats=None):
+    '''
+    Parses GPS rows. If given, `stream_stats` (a stats.StreamStats) is updated with every kept row.
+    '''
+    started_at = time.perf_counter()
     rows = []
     ignored_lines = 0
 
@@ -213,13 +301,20 @@ def preprocess_gps(data: dict, datetime_format: str, start_time=None, end_time=N
             continue
 
         rows.append([ts] + [float(c) for c in [row['gps_interval'], row['accuracy'], row['latitude'], row['longitude']]])
+        if stream_stats is not None:
+            stream_stats.push(ts, rows[-1][1:])
 
     sorted_rows = sorted(rows, key=lambda x: x[0])
 
+    if load_stats is not None:
+        load_stats['rows_parsed'] += len(data)
+        load_stats['rows_dropped'] += ignored_lines
+        load_stats['parse_time'] += time.perf_counter() - started_at
+
     if not sorted_rows:
         return pd.DataFrame()
 
-    return to_dataframe(rows, 1, datetime_format, data_type='gps')
+    return to_dataframe(rows, 1, datetime_format, data_type='gps', load_stats=load_stats)
 
 
 def parse_wcdma(cell_info_str: str):
@@ -261,102 +356,166 @@ def parse_wcdma(cell_info_str: str):
     return result
 
 
-def process_cell_networks(path, datetime_format: str, start_time=None, end_time=None):
-    data = []
+def _read_lines(path, load_stats=None):
+    '''
+    Iterates over the lines of a file, skipping its header.
+
+    The file is read in chunks of about READ_CHUNK_SIZE bytes, so only one chunk is held in memory.
+    The time spent reading is added to `load_stats['read_time']`.
+    '''
+    if load_stats is not None:
+        load_stats['bytes_read'] += os.path.getsize(path)
 
     with open(path) as fin:
-        next(fin)
+        next(fin, None)
+        while True:
+            started_at = time.perf_counter()
+            lines = fin.readlines(READ_CHUNK_SIZE)
+            if load_stats is not None:
+                load_stats['read_time'] += time.perf_counter() - started_at
+            if not lines:
+                break
+            yield from lines
+
+
+def process_cell_networks(path, datetime_format: str, start_time=None, end_time=None, load_stats=None, stream_stats=None):
+    '''
+    Parses a cell file. If given, `stream_stats` (a stats.StreamStats) is updated with every kept row.
+    '''
+    data = []
+    ignored_lines = 0
+    errors = 0
 
-        for line in fin:
-            try:
-                datetime_str, wcdma_str  = line.strip().split(',', 1)
-            except ValueError as e:
-                print(f"ERROR. Error splitting line: {line}: {e}")
-                continue
+    total = 0
+    read_time = load_stats['read_time'] if load_stats is not None else 0.0
+    started_at = time.perf_counter()
 
-            try:
-                ts = datetime.datetime.strptime(datetime_str, datetime_format)
-            except ValueError as e:
-                print(f"ERROR. Error parsing datetime: {datetime_str}: {e}")
-                continue
+    for line in _read_lines(path, load_stats):
+        total += 1
+        try:
+            datetime_str, wcdma_str  = line.strip().split(',', 1)
+        except ValueError as e:
+            logger.error('Error splitting line: %s: %s', line, e)
+            errors += 1
+            continue
 
-            try:
-                if start_time and ts < start_time:
-                    continue
-                if end_time and ts > end_time:
-                    continue
-            except Exception as e:
-                print(f"ERROR. Error checking time range: {e}")
-                continue
+        try:
+            ts = datetime.datetime.strptime(datetime_str, datetime_format)
+        except ValueError as e:
+            logger.error('Error parsing datetime: %s: %s', datetime_str, e)
+            errors += 1
+            continue
 
-            try:
-                wcdma_data = parse_wcdma(wcdma_str)
-            except Exception as e:
-                print(f"ERROR. Error parsing WCDMA data: {wcdma_str}: {e}")
+        try:
+            if start_time and ts < start_time:
+                ignored_lines += 1
                 continue
+            if end_time and ts > end_time:
+                ignored_lines += 1
+                continue
+        except Exception as e:
+            logger.error('Error checking time range: %s', e)
+            errors += 1
+            continue
 
-            row = {
-                'Datetime UTC': ts,
-            }
+        try:
+            wcdma_data = parse_wcdma(wcdma_str)
+        except Exception as e:
+            logger.error('Error parsing WCDMA data: %s: %s', wcdma_str, e)
+            errors += 1
+            continue
 
-            if not isinstance(wcdma_data, dict):
-                print(f"ERROR. Parsed line is not a dictionary: {wcdma_data}")
-                continue
+        row = {
+            'Datetime UTC': ts,
+        }
+
+        if not isinstance(wcdma_data, dict):
+            logger.error('Parsed line is not a dictionary: %s', wcdma_data)
+            errors += 1
+            continue
+
+        for key in CELL_SNIPPET_HEADER:
+            if key != 'Datetime UTC':
+                row[key] = wcdma_data.get(key, '')
 
-            for key in CELL_SNIPPET_HEADER:
-                if key != 'Datetime UTC':
-                    row[key] = wcdma_data.get(key, '')
+        data.append(row)
+        if stream_stats is not None:
+            stream_stats.push(ts, [row.get(c) for c in stream_stats.channels])
 
-            data.append(row)
+    if load_stats is not None:
+        load_stats['rows_parsed'] += total - errors
+        load_stats['rows_dropped'] += ignored_lines
+        load_stats['parse_errors'] += errors
+        load_stats['parse_time'] += time.perf_counter() - started_at - (load_stats['read_time'] - read_time)
 
-    return to_dataframe(data, 1, datetime_format, data_type='cell', create_time_column=True)
+    return to_dataframe(data, 1, datetime_format, data_type='cell', create_time_column=True, load_stats=load_stats)
 
 
-def process_wifi_networks(path, datetime_format: str, start_time=None, end_time=None):
+def process_wifi_networks(path, datetime_format: str, start_time=None, end_time=None, load_stats=None, stream_stats=None):
+    '''
+    Parses a Wi-Fi file. If given, `stream_stats` (a stats.StreamStats) is updated with every kept row.
+    '''
     data = []
+    ignored_lines = 0
+    errors = 0
 
-    with open(path) as fin:
-        next(fin)
+    total = 0
+    read_time = load_stats['read_time'] if load_stats is not None else 0.0
+    started_at = time.perf_counter()
 
-        for line in fin:
-            try:
-                datetime_str, wifi_data = line.strip().split(",", 1)
-            except ValueError as e:
-                print(f"Error splitting line: {line.strip()}: {e}")
-                continue
+    for line in _read_lines(path, load_stats):
+        total += 1
+        try:
+            datetime_str, wifi_data = line.strip().split(",", 1)
+        except ValueError as e:
+            logger.error('Error splitting line: %s: %s', line.strip(), e)
+            errors += 1
+            continue
 
-            try:
-                ts = datetime.datetime.strptime(datetime_str, datetime_format)
+        try:
+            ts = datetime.datetime.strptime(datetime_str, datetime_format)
 
-                if start_time and ts < start_time:
-                    continue
-                if end_time and ts > end_time:
-                    continue
+            if start_time and ts < start_time:
+                ignored_lines += 1
+                continue
+            if end_time and ts > end_time:
+                ignored_lines += 1
+                continue
 
-            except ValueError as e:
-                print(f"Error parsing datetime: {datetime_str}: {e}")
+        except ValueError as e:
+            logger.error('Error parsing datetime: %s: %s', datetime_str, e)
+            errors += 1
+            continue
 
-            ssid_match = re.search(r'SSID: "(.*?)"', wifi_data)
-            bssid_match = re.search(r'BSSID: ([0-9a-f:]{17})', wifi_data)
-            level_match = re.search(r'level: (-?\d+)', wifi_data)
-            freq_match = re.search(r'frequency: (\d+)', wifi_data)
-            standard_match = re.search(r'standard: (\w+)', wifi_data)
+        ssid_match = re.search(r'SSID: "(.*?)"', wifi_data)
+        bssid_match = re.search(r'BSSID: ([0-9a-f:]{17})', wifi_data)
+        level_match = re.search(r'level: (-?\d+)', wifi_data)
+        freq_match = re.search(r'frequency: (\d+)', wifi_data)
+        standard_match = re.search(r'standard: (\w+)', wifi_data)
+
+        row = {
+            'Datetime UTC': datetime_str,
+            'SSID': ssid_match.group(1) if ssid_match else None,
+            'BSSID': bssid_match.group(1) if bssid_match else None,
+            'level': level_match.group(1) if level_match else None,
+            'frequency': freq_match.group(1) if freq_match else None,
+            'standard': standard_match.group(1) if standard_match else None
+        }
 
-            row = {
-                'Datetime UTC': datetime_str,
-                'SSID': ssid_match.group(1) if ssid_match else None,
-                'BSSID': bssid_match.group(1) if bssid_match else None,
-                'level': level_match.group(1) if level_match else None,
-                'frequency': freq_match.group(1) if freq_match else None,
-                'standard': standard_match.group(1) if standard_match else None
-            }
+        data.append(row)
+        if stream_stats is not None:
+            stream_stats.push(ts, [row['level'], row['frequency']])
 
-            data.append(row)
+    if load_stats is not None:
+        load_stats['rows_parsed'] += total - errors
+        load_stats['rows_dropped'] += ignored_lines
+        load_stats['parse_errors'] += errors
+        load_stats['parse_time'] += time.perf_counter() - started_at - (load_stats['read_time'] - read_time)
 
-    return to_dataframe(data, 1, datetime_format, data_type='wifi', create_time_column=True)
+    return to_dataframe(data, 1, datetime_format, data_type='wifi', create_time_column=True, load_stats=load_stats)
 
 
-def to_dataframe(data, num_axes: int, datetime_format: str, data_type='sensor', create_time_column=True):
+def to_dataframe(data, num_axes: int, datetime_format: str, data_type='sensor', create_time_column=True, load_stats=None):
     '''
     Converts data into a Pandas.DataFrame and includes a column to represent the duration in seconds of the time series.
     Also returns the count of data points for each sensor axis.
@@ -364,6 +523,8 @@ def to_dataframe(data, num_axes: int, datetime_format: str, data_type='sensor',
     if not data:
         return pd.DataFrame()
 
+    started_at = time.perf_counter()
+
     columns = ['Datetime UTC']
 
     if data_type == 'sensor':
@@ -391,42 +552,103 @@ def to_dataframe(data, num_axes: int, datetime_format: str, data_type='sensor',
         columns.extend(['timestamp', 'registered', 'connection_status', 'lac', 'cid', 'psc', 'uarfcn', 'mcc', 'mnc', 'ss', 'alpha_long', 'alpha_short', 'ber', 'rscp', 'ecno', 'level'])
 
     df = pd.DataFrame(data, columns=columns)
+    built_at = time.perf_counter()
 
     if create_time_column:
         df['Datetime UTC'] = pd.to_datetime(df['Datetime UTC'], format=datetime_format)
         df['Time (s)'] = (df['Datetime UTC'] - df['Datetime UTC'].iloc[0]).dt.total_seconds()
         df = df.sort_values('Time (s)')
 
+    if load_stats is not None:
+        load_stats['build_time'] += built_at - started_at
+        load_stats['timestamp_time'] += time.perf_counter() - built_at
+
     return df
 
 
+def seconds_since(data: pd.DataFrame, origin) -> np.ndarray:
+    '''
+    Returns the 'Datetime UTC' column of a DataFrame as seconds elapsed since `origin` (e.g. the media start time).
+    Unlike the 'Time (s)' column, which starts at the first row of each file, this puts all streams on the same clock.
+    '''
+    if data is None or data.empty:
+        return np.empty(0, dtype='float64')
+    return (data['Datetime UTC'] - pd.Timestamp(origin)).dt.total_seconds().to_numpy(dtype='float64')
+
+
+def _resample_positions(times: list, target_fps: int) -> list:
+    '''
+    For each array of 'Time (s)' values, returns the row positions picked by `resample_sensor_data`.
+
+    Rows are bucketed by whole second (stable, so rows keep their order inside a bucket) and
+    `target_fps` evenly spaced rows are taken from each non-empty bucket, with the same
+    arithmetic as `np.linspace(0, n - 1, target_fps)` truncated to int.
+    '''
+    if not times:
+        return []
+
+    lengths = [len(t) for t in times]
+    stream = np.repeat(np.arange(len(times)), lengths)
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    t = np.concatenate([np.asarray(t, dtype='float64') for t in times]) if stream.size else np.empty(0)
+
+    valid = np.flatnonzero(np.isfinite(t) & (t >= 0))
+    bucket = np.floor(t[valid]).astype('int64')
+    order = valid[np.lexsort((bucket, stream[valid]))]
+
+    key_stream = stream[order]
+    key_bucket = np.floor(t[order]).astype('int64')
+    new_run = np.ones(len(order), dtype=bool)
+    new_run[1:] = (key_stream[1:] != key_stream[:-1]) | (key_bucket[1:] != key_bucket[:-1])
+    run_starts = np.flatnonzero(new_run)
+    run_lengths = np.diff(np.append(run_starts, len(order)))
+
+    steps = np.arange(target_fps, dtype='float64')
+    if target_fps > 1:
+        picks = steps[None, :] * ((run_lengths - 1) / (target_fps - 1))[:, None]
+        picks[:, -1] = run_lengths - 1
+    else:
+        picks = np.zeros((len(run_starts), target_fps))
+    picks = picks.astype('int64')
+
+    positions = order[run_starts[:, None] + picks] - offsets[order[run_starts]][:, None]
+    run_stream = key_stream[run_starts]
+    return [positions[run_stream == ind].ravel() for ind in range(len(times))]
+
+
 def resample_sensor_data(data: pd.DataFrame, target_fps=30):
     '''
     Converts the sensor data to match the FPS rate of the video.
     This is necessary because the frequency of sensor data varies.
     At times, there are 100 points in a single second, while at other times, there are only 50 points.
     This variation is controlled by the Android device, and it is crucial to ensure synchronization between the video and sensor data.
-    '''
-    resampled_data = pd.DataFrame()
-
-    for second in range(int(data['Time (s)'].max()) + 1):
-        interval_start = second
-        interval_end = second + 1
 
-        selected_lines = data[(data['Time (s)'] >= interval_start) & (data['Time (s)'] < interval_end)]
+    For each second of 'Time (s)', `target_fps` evenly spaced rows are kept (repeating rows when
+    the second has fewer samples). Seconds without samples are skipped. Rows are picked, not
+    interpolated or filtered; see the `resample` module for interpolation and anti-aliased decimation.
+    '''
+    positions = _resample_positions([data['Time (s)'].to_numpy()], target_fps)[0]
+    return data.take(positions).reset_index(drop=True)
 
-        indices = [int(x) for x in np.linspace(
-            start=0,
-            stop=len(selected_lines) - 1,
-            num=target_fps)
-        ]
 
-        sample = selected_lines.iloc[indices]
-        resampled_data = pd.concat([resampled_data, sample])
+def resample_instance_sensors(instance, target_fps=30) -> dict:
+    '''
+    Resamples every sensor stream of an instance at once, as `resample_sensor_data` does for one stream.
 
-    resampled_data.reset_index(drop=True, inplace=True)
+    Returns:
+        dict: {'sensors1': {name: DataFrame}, 'sensors3': {...}, 'sensors6': {...}}, mirroring the instance attributes.
+    '''
+    streams = [
+        (attr, name, df)
+        for attr in SENSOR_ATTRIBUTES
+        for name, df in (getattr(instance, attr, None) or {}).items()
+    ]
+    positions = _resample_positions([df['Time (s)'].to_numpy() for _, _, df in streams], target_fps)
 
-    return resampled_data
+    resampled = {attr: {} for attr in SENSOR_ATTRIBUTES}
+    for (attr, name, df), rows in zip(streams, positions):
+        resampled[attr][name] = df.take(rows).reset_index(drop=True)
+    return resampled
 
 
 def inverse_geocode(latitude: float, longitude: float, key: str=None):
@@ -479,27 +701,27 @@ def inverse_geocode_from_google(latitude: float, longitude: float, key: str):
                 if component_type in component.get('types', []):
                     data[data_key] = component.get('long_name')
     except requests.exceptions.RequestException as e:
-        print(f"ERROR. Failed to call Google Geocoding API: {e}")
+        logger.error('Failed to call Google Geocoding API: %s', e)
     return data
 
 
 def extract_dataframe_snippet(data: pd.DataFrame, start_time, end_time, output_path=None):
     if data.empty:
-        print('ERROR. The input DataFrame is empty.')
+        logger.error('The input DataFrame is empty.')
         return None
     
     required_columns = ['Time (s)',]
     for col in required_columns:
         if col not in data.columns:
-            print(f"ERROR. Column '{col}' is not present in the DataFrame.")
+            logger.error("Column '%s' is not present in the DataFrame.", col)
             return None
     
     if start_time < data['Time (s)'].min():
-        print('WARNING. The specified start time is before the data range.')
+        logger.warning('The specified start time is before the data range.')
         start_time = data['Time (s)'].min()
 
     if end_time > data['Time (s)'].max() or end_time < 0:
-        print('WARNING. The specified end time is after the data range.')
+        logger.warning('The specified end time is after the data range.')
         end_time = data['Time (s)'].max()
     
     snippet = data[(data['Time (s)'] >= start_time) & (data['Time (s)'] <= end_time)]
@@ -568,3 +790,38 @@ def calculate_haversine_distance(lat1, lon1, lat2, lon2):
     a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
     c = 2 * asin(sqrt(a))
     return R * c
+
+
+def haversine_distance(lat1, lon1, lat2, lon2, radius: float = 6371.0) -> np.ndarray:
+    """
+    Vectorized `calculate_haversine_distance`: the great-circle distance between arrays of
+    points (or scalars, broadcast), in km by default. Pass `radius` in meters to get meters.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype='float64')) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def deep_getsizeof(obj, seen=None) -> int:
+    """ Calculate the memory used by a Python object and everything it references, in bytes. """
+    if seen is None:
+        seen = set()
+
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(deep=True).sum()) if isinstance(obj, pd.DataFrame) else int(obj.memory_usage(deep=True))
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(deep_getsizeof(k, seen) + deep_getsizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_getsizeof(i, seen) for i in obj)
+
+    return size
@@ -0,0 +1,78 @@
+'''
+Builders for the synthetic instances used by the tests.
+
+The instances are SimpleNamespace objects with the attributes of a loaded SideSeeingInstance
+that the code under test reads, and the DataFrames have the columns the loaders produce.
+'''
+import datetime
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+
+START = datetime.datetime(2024, 1, 6, 15, 0, 0)
+
+METERS_PER_DEGREE = 6371000.0 * np.pi / 180
+
+# The origin of the tracks built with `walk_north`.
+LATITUDE = -23.5
+
+LONGITUDE = -46.6
+
+
+def at(seconds):
+    '''
+    Returns START plus `seconds` (a scalar or an array) as pandas timestamps.
+    '''
+    if np.ndim(seconds) == 0:
+        return pd.Timestamp(START) + pd.Timedelta(seconds=float(seconds))
+    return pd.Timestamp(START) + pd.to_timedelta(np.asarray(seconds, dtype='float64'), unit='s')
+
+
+def make_gps(seconds, latitude, longitude, **columns) -> pd.DataFrame:
+    '''
+    A GPS DataFrame with fixes at `seconds` after START, plus any extra columns (e.g. accuracy).
+    '''
+    seconds = np.asarray(seconds, dtype='float64')
+    gps = pd.DataFrame({
+        'Datetime UTC': at(seconds),
+        'Time (s)': seconds,
+        'latitude': latitude,
+        'longitude': longitude,
+    })
+    for name, values in columns.items():
+        gps[name] = values
+    return gps
+
+
+def walk_north(seconds, meters, **columns) -> pd.DataFrame:
+    '''
+    A GPS DataFrame for a walk due north from (LATITUDE, LONGITUDE), `meters` from the start at each fix.
+    '''
+    return make_gps(seconds, LATITUDE + np.asarray(meters, dtype='float64') / METERS_PER_DEGREE, LONGITUDE, **columns)
+
+
+def make_sensor(seconds, x=0.0, y=0.0, z=0.0, **columns) -> pd.DataFrame:
+    '''
+    A three-axis sensor DataFrame with samples at `seconds` after START.
+    '''
+    seconds = np.asarray(seconds, dtype='float64')
+    df = pd.DataFrame({
+        'Datetime UTC': at(seconds),
+        'Time (s)': seconds,
+        'x': x, 'y': y, 'z': z,
+    })
+    for name, values in columns.items():
+        df[name] = values
+    return df
+
+
+def make_instance(name: str = 'synthetic', **attributes) -> SimpleNamespace:
+    '''
+    A synthetic instance starting at START, with empty sensor dictionaries unless given.
+    '''
+    instance = dict(name=name, media_start_time=START, sensors1={}, sensors3={}, sensors6={})
+    instance.update(attributes)
+    return SimpleNamespace(**instance)
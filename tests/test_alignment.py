@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import alignment
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import at, make_gps, make_instance, make_sensor
+
+
+def make_recording():
+    t = np.arange(1, 9, 0.1)
+    return make_instance(
+        video=None, media_total_time=10.0,
+        sensors3={'icm4x6xx accelerometer non-wakeup': make_sensor(t, x=t, y=2 * t)},
+        geolocation_points=make_gps([2, 6], [-23.0, -23.4], -46.0, gps_interval=1000, accuracy=5.0),
+        consumption=pd.DataFrame(),
+    )
+
+
+class TestAlignment(unittest.TestCase):
+    def setUp(self):
+        self.instance = make_recording()
+
+    def test_timeline(self):
+        self.assertEqual(len(alignment.timeline(self.instance, 4)), 40)
+        np.testing.assert_allclose(alignment.timeline(self.instance, [0.5, 1.5]), [0.5, 1.5])
+
+        datetimes = [at(3)]
+        np.testing.assert_allclose(alignment.timeline(self.instance, datetimes), [3.0])
+
+        with self.assertLogs('sideseeing_tools.frames', level='WARNING'):
+            self.assertEqual(len(alignment.timeline(self.instance, 'video')), 300)
+
+    def test_linear(self):
+        df = alignment.align(self.instance, target=[0.5, 1.55, 4.0, 9.5])
+        self.assertEqual(list(df.columns)[:4], ['time', 'icm4x6xx accelerometer non-wakeup:x', 'icm4x6xx accelerometer non-wakeup:y', 'icm4x6xx accelerometer non-wakeup:z'])
+
+        x = df['icm4x6xx accelerometer non-wakeup:x'].to_numpy()
+        self.assertTrue(np.isnan(x[0]))
+        np.testing.assert_allclose(x[1:3], [1.55, 4.0])
+        self.assertTrue(np.isnan(x[3]))
+        self.assertAlmostEqual(df['geolocation_points:latitude'].iloc[2], -23.2)
+
+    def test_nearest_previous_and_tolerance(self):
+        times = [1.04, 5.0, 7.0]
+        df = alignment.align(self.instance, 'geolocation_points', target=times, method='nearest')
+        np.testing.assert_allclose(df['geolocation_points:latitude'], [-23.0, -23.4, -23.4])
+
+        df = alignment.align(self.instance, 'geolocation_points', target=times, method='previous')
+        self.assertTrue(np.isnan(df['geolocation_points:latitude'].iloc[0]))
+        np.testing.assert_allclose(df['geolocation_points:latitude'].iloc[1:], [-23.0, -23.4])
+
+        df = alignment.align(self.instance, 'geolocation_points', target=times, method='previous', tolerance=1.5)
+        self.assertTrue(np.isnan(df['geolocation_points:latitude'].iloc[1]))
+        self.assertEqual(df['geolocation_points:latitude'].iloc[2], -23.4)
+
+    def test_selectors_and_array_output(self):
+        times, values, columns = alignment.align(
+            self.instance, ['accelerometer'], target=10,
+            method={'default': 'nearest'}, as_array=True,
+        )
+        self.assertEqual(values.shape, (100, 3))
+        self.assertTrue(values.flags['C_CONTIGUOUS'])
+        self.assertEqual(columns[0], 'icm4x6xx accelerometer non-wakeup:x')
+        np.testing.assert_allclose(values[50, :2], [5.0, 10.0])
+
+        with self.assertRaises(KeyError):
+            alignment.align(self.instance, 'gyroscope', target=10)
+
+    def test_fixture_instance(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        df = ds.instance.align(['sensors3', 'geolocation_points'], target=10, tolerance=0.5)
+
+        self.assertEqual(len(df), len(alignment.timeline(ds.instance, 10)))
+        self.assertIn('icm4x6xx gyroscope non-wakeup:z', df.columns)
+        self.assertGreater(df['icm4x6xx accelerometer non-wakeup:x'].notna().mean(), 0.9)
@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import energy, shared
+from sideseeing_tools.sideseeing import SideSeeingDS, SideSeeingInstance
+from tests.helpers import START, at, make_instance, walk_north
+
+
+def make_consumption(seconds, milliamperes):
+    seconds = np.asarray(seconds, dtype='float64')
+    return pd.DataFrame({
+        'Datetime UTC': at(seconds),
+        'battery_microamperes': -np.asarray(milliamperes, dtype='float64') * 1000,
+        'Time (s)': seconds,
+    })
+
+
+def make_walk():
+    # 1 m/s north for 100 s; 720 mA for the first 50 s, then 1440 mA.
+    seconds = np.arange(0, 101, 10.0)
+    readings = np.arange(0, 101, 1.0)
+    return make_instance(
+        metadata={'device': {'manufacturer': 'Motorola', 'model': 'Edge'}},
+        geolocation_points=walk_north(seconds, seconds, accuracy=3.0, gps_interval=10.0),
+        consumption=make_consumption(readings, np.where(readings < 50, 720.0, 1440.0)),
+    )
+
+
+class TestChargeIntegral(unittest.TestCase):
+    def test_trapezoid(self):
+        integral = energy.ChargeIntegral(make_consumption([0, 10, 20], [360, 720, 720]), START)
+
+        self.assertAlmostEqual(integral.total_charge, (5400 + 7200) / 3600)
+        self.assertAlmostEqual(integral.charge(10, 20), 2.0)
+        # Between readings the current is interpolated: 360 -> 540 mA over the first 5 s.
+        self.assertAlmostEqual(float(integral.charge(0, 5)), 5 * 450 / 3600)
+        # Windows are clipped to the readings.
+        self.assertAlmostEqual(float(integral.charge(-100, 100)), integral.total_charge)
+        np.testing.assert_allclose(integral.energy([0, 10], [10, 20]), np.array([1.5, 2.0]) * energy.NOMINAL_VOLTAGE_V / 1000)
+        self.assertAlmostEqual(float(integral.mean_current(10, 20)), 720)
+
+    def test_matches_a_scan(self):
+        rng = np.random.default_rng(0)
+        seconds = np.cumsum(rng.uniform(0.5, 1.5, 500))
+        integral = energy.ChargeIntegral(make_consumption(seconds, rng.uniform(100, 2000, 500)), START)
+
+        start, stop = np.sort(rng.choice(seconds, size=(2, 50), replace=False), axis=0)
+        for a, b, charge in zip(start, stop, integral.charge(start, stop)):
+            inside = (seconds >= a) & (seconds <= b)
+            t, current = seconds[inside], integral.current[inside]
+            self.assertAlmostEqual(charge, np.sum(np.diff(t) * (current[1:] + current[:-1]) / 2) / 3600)
+
+    def test_empty(self):
+        integral = energy.ChargeIntegral(pd.DataFrame(), START)
+        self.assertEqual(integral.total_charge, 0.0)
+        self.assertEqual(float(integral.charge(0, 10)), 0.0)
+
+
+class TestEnergy(unittest.TestCase):
+    def test_segment_energy(self):
+        table = energy.segment_energy(make_walk(), segment_m=25)
+
+        self.assertEqual(list(table.columns), energy.SEGMENT_COLUMNS)
+        self.assertEqual(len(table), 4)
+        np.testing.assert_allclose(table['start_time'], [0, 25, 50, 75], atol=1e-6)
+        np.testing.assert_allclose(table['mean_current_ma'][[0, 3]], [720, 1440])
+        # 49 s at 720 mA, 1 s ramping to 1440 mA and 50 s at 1440 mA.
+        np.testing.assert_allclose(table['charge_mah'].sum(), (49 * 720 + 1080 + 50 * 1440) / 3600)
+
+    def test_instance_cache_follows_consumption(self):
+        instance = make_walk()
+        charge_integral = SideSeeingInstance.charge_integral.__get__(instance)
+
+        first = charge_integral()
+        self.assertIs(charge_integral(), first)
+
+        instance.consumption = make_consumption([0, 10], [360, 360])
+        self.assertAlmostEqual(charge_integral().total_charge, 1.0)
+
+    def test_shared_view(self):
+        instance = make_walk()
+        expected = energy.segment_energy(instance)
+
+        with shared.SharedInstance(instance) as published:
+            with shared.attach(published.handle) as view:
+                result = energy.segment_energy(view)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_dataset(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        instance = ds.instance
+
+        table = energy.dataset_energy(ds)
+        self.assertEqual(list(table.index), [instance.name])
+        self.assertAlmostEqual(table['charge_mah'].iloc[0], instance.charge_integral().total_charge)
+        self.assertAlmostEqual(table['distance_km'].iloc[0], instance.calculate_sample_distance_traveled())
+        self.assertGreater(table['mah_per_km'].iloc[0], 0)
+
+        devices = energy.device_energy(ds)
+        self.assertEqual(devices['instances'].sum(), 1)
+        self.assertAlmostEqual(devices['charge_mah'].sum(), table['charge_mah'].sum())
+
+        segments = energy.dataset_segment_energy(ds, segment_m=10)
+        np.testing.assert_allclose(segments['end_distance'].max(), table['distance_km'].iloc[0] * 1000)
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+
+from sideseeing_tools import features
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests import helpers
+
+
+def make_instance(rate=100, seconds=10):
+    t = np.arange(0, seconds, 1 / rate)
+    accelerometer = helpers.make_sensor(t, 2 * np.sin(2 * np.pi * 5 * t), 1.0, np.random.default_rng(0).normal(size=len(t)))
+    light = helpers.make_sensor(t[::10], np.arange(len(t[::10]), dtype='float64')).drop(columns=['y', 'z'])
+    return helpers.make_instance(
+        sensors1={'tcs3720 ambient light sensor non-wakeup': light},
+        sensors3={'icm4x6xx accelerometer non-wakeup': accelerometer},
+    )
+
+
+class TestFeatures(unittest.TestCase):
+    def test_window_view_does_not_copy(self):
+        values = np.arange(20, dtype='float64').reshape(10, 2)
+        view = features.window_view(values, 4, step=2)
+        self.assertEqual(view.shape, (4, 2, 4))
+        self.assertTrue(np.shares_memory(view, values))
+        np.testing.assert_array_equal(view[1, 0], [4, 6, 8, 10])
+
+    def test_statistics_match_pandas(self):
+        instance = make_instance()
+        df = instance.sensors3['icm4x6xx accelerometer non-wakeup']
+        table = features.instance_features(instance, 'accelerometer', window=50, step=25)
+
+        rolling = df['z'].rolling(50)
+        np.testing.assert_allclose(table['z_mean'], rolling.mean().to_numpy()[49::25])
+        np.testing.assert_allclose(table['z_std'], rolling.std(ddof=0).to_numpy()[49::25])
+        np.testing.assert_allclose(table['z_max'], rolling.max().to_numpy()[49::25])
+        np.testing.assert_allclose(table['z_energy'], (df['z'] ** 2).rolling(50).sum().to_numpy()[49::25])
+
+        self.assertEqual(list(table.columns[:4]), features.KEY_COLUMNS)
+        np.testing.assert_allclose(table['start_time'], np.arange(len(table)) * 0.25)
+        np.testing.assert_allclose(table['end_time'] - table['start_time'], 0.49)
+
+    def test_slice_features(self):
+        values = np.column_stack([np.arange(10, dtype='float64'), np.ones(10)])
+        values[8, 1] = np.nan
+        result = features.slice_features(values, [0, 2, 5], [4, 9, 6], ['mean', 'std', 'min', 'max', 'jerk'], np.arange(10) / 2)
+
+        np.testing.assert_allclose(result[:, :5], [
+            [1.5, np.std([0, 1, 2, 3]), 0, 3, 2],
+            [5.0, np.std(np.arange(2, 9)), 2, 8, 2],
+            [5.0, 0, 5, 5, 0],
+        ])
+        np.testing.assert_allclose(result[[0, 2], 5:], [[1, 0, 1, 1, 0], [1, 0, 1, 1, 0]])
+        self.assertTrue(np.isnan(result[1, [5, 6, 9]]).all())
+
+        windows = features.window_view(values[:8], 4, 2)
+        np.testing.assert_allclose(
+            features.compute_features(windows, 2.0, features.STATISTICS),
+            features.slice_features(values, [0, 2, 4], [4, 6, 8], features.STATISTICS, np.arange(10) / 2),
+        )
+        with self.assertRaises(ValueError):
+            features.slice_features(values, [0], [4], ['band_power'])
+
+    def test_frequency_features(self):
+        table = features.instance_features(make_instance(), 'sensors3', window=100, step=100)
+
+        np.testing.assert_allclose(table['x_band_5_10hz'], 2.0, rtol=1e-6)
+        np.testing.assert_allclose(table['x_band_0_2hz'], 0.0, atol=1e-9)
+        np.testing.assert_allclose(table['x_rms'], np.sqrt(2), rtol=1e-6)
+        self.assertTrue((table['x_zero_crossings'].between(9, 10)).all())
+        self.assertTrue((table['y_zero_crossings'] == 0).all())
+
+    def test_feature_subset_and_mixed_sensors(self):
+        table = features.instance_features(make_instance(), window=20, step=10, features=['mean', 'band_power'], bands=[(0, 1)])
+
+        self.assertEqual(set(table['sensor']), {'tcs3720 ambient light sensor non-wakeup', 'icm4x6xx accelerometer non-wakeup'})
+        self.assertIn('x_band_0_1hz', table.columns)
+        self.assertNotIn('x_std', table.columns)
+        light = table[table['sensor'] == 'tcs3720 ambient light sensor non-wakeup']
+        self.assertTrue(light['y_mean'].isna().all())
+        self.assertEqual(light['x_mean'].iloc[0], 9.5)
+
+        with self.assertRaises(ValueError):
+            features.instance_features(make_instance(), features=['kurtosis'])
+
+    def test_dataset_features(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        table = features.dataset_features(ds, sensors=['accelerometer', 'gyroscope'])
+
+        self.assertEqual(set(table['instance']), {ds.instance.name})
+        self.assertTrue(table['sensor'].str.contains('accelerometer|gyroscope').all())
+        self.assertFalse(table.set_index(['instance', 'sensor', 'start_time']).index.has_duplicates)
+        self.assertFalse(table['x_band_0_2hz'].isna().any())
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import frames
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import at, make_gps, make_instance, make_sensor
+
+
+def make_recording():
+    t = np.arange(0, 10, 0.01)
+    consumption = pd.DataFrame({
+        'Datetime UTC': at([1, 5]),
+        'battery_microamperes': [100, 200],
+    })
+    return make_instance(
+        video=None, media_total_time=10.0,
+        sensors3={'accelerometer': make_sensor(t, x=t)},
+        geolocation_points=make_gps([2, 6], [-23.0, -23.4], -46.0),
+        consumption=consumption,
+    )
+
+
+class TestFrameTable(unittest.TestCase):
+    def setUp(self):
+        self.instance = make_recording()
+        self.frames = frames.FrameTable(self.instance, fps=10)
+
+    def test_table(self):
+        table = self.frames.table
+        self.assertEqual(len(table), 100)
+        self.assertEqual(table['Datetime UTC'].iloc[25], at(2.5))
+
+        self.assertTrue(np.isnan(table['latitude'].iloc[10]))
+        self.assertAlmostEqual(table['latitude'].iloc[40], -23.2)
+        self.assertTrue(np.isnan(table['latitude'].iloc[70]))
+
+        self.assertTrue(np.isnan(table['battery_microamperes'].iloc[5]))
+        self.assertEqual(table['battery_microamperes'].iloc[10], 100)
+        self.assertEqual(table['battery_microamperes'].iloc[55], 200)
+
+    def test_frame_to_sensor_window(self):
+        self.assertEqual(self.frames.sensor_rows(25, 'accelerometer'), (250, 260))
+
+        window = self.frames.sensor_window(25, 'accelerometer', before=1, after=1)
+        self.assertEqual(len(window), 30)
+        self.assertAlmostEqual(window['x'].iloc[0], 2.4)
+
+    def test_time_to_frame(self):
+        self.assertEqual(self.frames.frame_at(2.55), 25)
+        self.assertEqual(self.frames.frame_at(-1), 0)
+        self.assertEqual(self.frames.frame_at(99), 99)
+        self.assertEqual(self.frames.time_of(25), 2.5)
+
+        sensor_frames = self.frames.sensor_frames('accelerometer')
+        self.assertEqual(sensor_frames[255], 25)
+        self.assertEqual(sensor_frames[-1], 99)
+
+    def test_fixture_instance_without_video(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        instance = ds.instance
+
+        with self.assertLogs('sideseeing_tools.frames', level='WARNING'):
+            table = instance.frame_table()
+
+        self.assertIs(instance.frame_table(), table)
+        self.assertEqual(table.fps, frames.DEFAULT_FPS)
+        self.assertEqual(table.frame_count, int(instance.media_total_time * frames.DEFAULT_FPS))
+
+        sensor_name = 'icm4x6xx accelerometer non-wakeup'
+        frame = table.frame_at(10)
+        start, stop = table.sensor_rows(frame, sensor_name)
+        self.assertGreater(stop, start)
+        self.assertEqual(table.sensor_frames(sensor_name)[start], frame)
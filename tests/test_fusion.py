@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+
+from sideseeing_tools import fusion
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import make_instance, make_sensor
+
+
+RATE = 100
+
+GRAVITY = 9.8
+
+# The magnetic field points north and down.
+FIELD = np.array([0.0, 20.0, -40.0])
+
+
+def rotation_z(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    zero, one = np.zeros_like(angle), np.ones_like(angle)
+    return np.stack([np.stack([c, -s, zero], -1), np.stack([s, c, zero], -1), np.stack([zero, zero, one], -1)], 1)
+
+
+def rotation_x(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    zero, one = np.zeros_like(angle), np.ones_like(angle)
+    return np.stack([np.stack([one, zero, zero], -1), np.stack([zero, c, -s], -1), np.stack([zero, s, c], -1)], 1)
+
+
+def make_recording(seconds=30, yaw_rate=0.3, roll_rate=0.2):
+    '''
+    A sensor turning about the world up axis and tilting about its own x axis, with a 1 Hz
+    east-west linear acceleration of 1 m/s².
+    '''
+    t = np.arange(0, seconds, 1 / RATE)
+    # Sensor-to-world rotations: yaw in the world frame, then roll in the sensor frame.
+    roll = 0.3 * np.sin(roll_rate * t)
+    rotation = rotation_z(yaw_rate * t) @ rotation_x(roll)
+    linear = np.stack([np.sin(2 * np.pi * t), np.zeros_like(t), np.zeros_like(t)], axis=1)
+
+    to_sensor = np.transpose(rotation, (0, 2, 1))
+    accelerometer = np.einsum('kij,kj->ki', to_sensor, linear + [0, 0, GRAVITY])
+    magnetometer = np.einsum('kij,j->ki', to_sensor, FIELD)
+    # Angular velocity in the sensor frame: the world yaw rate seen from the sensor, plus the roll rate.
+    gyroscope = np.einsum('kij,j->ki', to_sensor, [0, 0, yaw_rate])
+    gyroscope[:, 0] += 0.3 * roll_rate * np.cos(roll_rate * t)
+    return t, accelerometer, gyroscope, magnetometer, linear, rotation
+
+
+def make_frame(t, values):
+    return make_sensor(t, *values.T)
+
+
+class TestFusion(unittest.TestCase):
+    def test_affine_scan_matches_the_recursion(self):
+        rng = np.random.default_rng(0)
+        matrices = rng.normal(size=(300, 3, 3)) * 0.3
+        offsets = rng.normal(size=(300, 3))
+        initial = rng.normal(size=3)
+
+        expected, state = [], initial
+        for m, b in zip(matrices, offsets):
+            state = m @ state + b
+            expected.append(state)
+
+        chunk = fusion.CHUNK_SAMPLES
+        try:
+            fusion.CHUNK_SAMPLES = 64
+            np.testing.assert_allclose(fusion.affine_scan(matrices, offsets, initial), expected, atol=1e-12)
+        finally:
+            fusion.CHUNK_SAMPLES = chunk
+
+    def test_gyroscope_propagation(self):
+        t, accelerometer, gyroscope, _, _, rotation = make_recording()
+        dt = np.diff(t, prepend=t[:1])
+        increments = fusion.rotation_increments((gyroscope + np.roll(gyroscope, 1, axis=0)) / 2, dt)
+
+        # With the gyroscope only, the first gravity direction follows the true orientation.
+        up = fusion.complementary_filter(dt, increments, accelerometer / np.linalg.norm(accelerometer[0]), np.inf)
+        np.testing.assert_allclose(up, rotation[:, 2, :], atol=1e-3)
+
+    def test_fuse(self):
+        t, accelerometer, gyroscope, magnetometer, linear, rotation = make_recording()
+        world, estimated = fusion.fuse(t, accelerometer, gyroscope, magnetometer, gravity=GRAVITY)
+
+        settled = t > 10
+        np.testing.assert_allclose(estimated[settled], rotation[settled], atol=0.05)
+        np.testing.assert_allclose(world[settled], linear[settled], atol=0.5)
+        self.assertLess(np.sqrt(np.mean((world[settled] - linear[settled]) ** 2)), 0.2)
+
+    def test_without_magnetometer(self):
+        t, accelerometer, gyroscope, _, linear, _ = make_recording()
+        world, _ = fusion.fuse(t, accelerometer, gyroscope, gravity=GRAVITY)
+
+        # The heading is relative to the start, so only the horizontal magnitude is comparable.
+        settled = t > 10
+        np.testing.assert_allclose(np.hypot(world[settled, 0], world[settled, 1]), np.abs(linear[settled, 0]), atol=0.5)
+        np.testing.assert_allclose(world[settled, 2], 0, atol=0.5)
+
+    def test_linear_acceleration(self):
+        t, accelerometer, gyroscope, magnetometer, _, _ = make_recording()
+        instance = make_instance(sensors3={
+            'icm4x6xx accelerometer non-wakeup': make_frame(t, accelerometer),
+            'icm4x6xx gyroscope non-wakeup': make_frame(t[::2], gyroscope[::2]),
+        })
+
+        table = fusion.linear_acceleration(instance, rate=50)
+        self.assertEqual(list(table.columns), ['time'] + fusion.WORLD_COLUMNS)
+        self.assertEqual(len(table), 50 * 30)
+
+        times, world, rotation = fusion.linear_acceleration(instance, as_array=True)
+        self.assertEqual(world.shape, (len(t), 3))
+        self.assertEqual(rotation.shape, (len(t), 3, 3))
+
+        instance.sensors3 = {}
+        with self.assertRaises(ValueError):
+            fusion.linear_acceleration(instance)
+
+    def test_fixture(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        table = ds.instance.linear_acceleration()
+
+        self.assertFalse(table[fusion.WORLD_COLUMNS].isna().any().any())
+        # The phone is carried, not accelerating on average.
+        self.assertTrue((table[fusion.WORLD_COLUMNS].mean().abs() < 0.5).all())
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from sideseeing_tools import geotag
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import START, at, make_gps, make_instance, make_sensor
+
+
+class TestGeotag(unittest.TestCase):
+    def setUp(self):
+        # Fixes at 0, 10 and 60 s: the 50 s interval is a gap.
+        gps = make_gps([0, 10, 60], [0.0, 1.0, 2.0], [10.0, 20.0, 30.0], accuracy=[4.0, 8.0, 4.0])
+        self.instance = make_instance(
+            media_total_time=70.0,
+            geolocation_points=gps,
+            sensors3={'accelerometer': make_sensor(np.arange(0, 70, 0.5), z=9.8)},
+        )
+
+    def test_interpolate(self):
+        times = np.array([-3.0, -10.0, 0.0, 2.5, 5.0, 10.0, 30.0, 62.0, 70.0])
+        values = geotag.interpolate(*geotag._fixes(self.instance.geolocation_points, START), times)
+        latitude, longitude, accuracy, fix_distance = values.T
+
+        np.testing.assert_allclose(latitude[[0, 2, 3, 4, 5, 7]], [0.0, 0.0, 0.25, 0.5, 1.0, 2.0])
+        np.testing.assert_allclose(longitude[[3, 4]], [12.5, 15.0])
+        self.assertTrue(np.isnan(values[[1, 6, 8]]).all())
+
+        # Accuracy: reported 6 m at the midpoint, plus 1 m/s for the 5 s to the nearest fix.
+        self.assertAlmostEqual(accuracy[4], np.hypot(6.0, 5.0))
+        self.assertAlmostEqual(accuracy[2], 4.0)
+        self.assertAlmostEqual(fix_distance[0], 3.0)
+
+        values = geotag.interpolate(*geotag._fixes(self.instance.geolocation_points, START), times, max_gap_s=60, max_edge_s=0)
+        self.assertAlmostEqual(values[6, 0], 1.4)
+        self.assertTrue(np.isnan(values[0]).all())
+
+    def test_antimeridian(self):
+        gps = make_gps([0, 10], [0.0, 0.0], [179.0, -179.0])
+        result = geotag.positions(gps, at([0, 5, 7.5]))
+
+        np.testing.assert_allclose(result['longitude'].abs(), [179.0, 180.0, 179.5])
+        self.assertTrue(result['accuracy'].isna().all())
+
+    def test_geotag_timeline_and_sensors(self):
+        result = geotag.geotag(self.instance, target=[0.0, 5.0, 30.0])
+        self.assertEqual(list(result.columns), ['time'] + geotag.GEOTAG_COLUMNS)
+        self.assertAlmostEqual(result['latitude'][1], 0.5)
+        self.assertTrue(np.isnan(result['latitude'][2]))
+
+        tagged = geotag.geotag_sensors(self.instance, 'accelerometer')
+        accelerometer = tagged['accelerometer']
+        self.assertEqual(len(accelerometer), 140)
+        self.assertEqual(accelerometer['latitude'].notna().sum(), 21 + 11)
+        self.assertEqual(geotag.geotag_sensors(self.instance, 'gyroscope'), {})
+
+    def test_fixture(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        instance = ds.instance
+
+        tagged = instance.geotag_timeline(target=10)
+        self.assertEqual(len(tagged), int(np.ceil(instance.media_total_time * 10)))
+        self.assertGreater(tagged['latitude'].notna().sum(), 0)
+        self.assertTrue((tagged['accuracy'].dropna() > 0).all())
+
+        drifting = instance.geotag_timeline(target=10, drift_mps=10)
+        known = tagged['accuracy'].notna()
+        self.assertTrue((drifting['accuracy'][known] >= tagged['accuracy'][known]).all())
+        self.assertTrue((drifting['accuracy'][known] > tagged['accuracy'][known]).any())
+
+        for name, table in geotag.geotag_sensors(instance, 'sensors3').items():
+            self.assertTrue(table.index.equals(instance.sensors3[name].index))
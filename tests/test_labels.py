@@ -0,0 +1,55 @@
+import unittest
+
+from types import SimpleNamespace
+
+from sideseeing_tools.labels import LabelIndex
+from sideseeing_tools.sideseeing import SideSeeingDS
+
+
+def label(*pairs):
+    return [{'category': c, 'tag': t} for c, t in pairs]
+
+
+class TestLabelIndex(unittest.TestCase):
+    def setUp(self):
+        taxonomy = label(
+            ('surface type', 'concrete'), ('surface type', 'asphalt'),
+            ('obstacles', 'pole'), ('obstacles', 'tree'),
+        )
+        labels = {
+            'a': label(('surface type', 'concrete'), ('obstacles', 'pole'), ('obstacles', 'tree')),
+            'b': label(('surface type', 'asphalt'), ('obstacles', 'pole')),
+            'c': label(('surface type', 'concrete'), ('other', 'pole')),
+            'd': None,
+        }
+        self.index = LabelIndex(labels, taxonomy)
+
+    def test_frequencies(self):
+        frequencies = self.index.frequencies()
+        self.assertEqual(frequencies[('surface type', 'concrete')], 2)
+        self.assertEqual(frequencies[('obstacles', 'pole')], 2)
+        self.assertEqual(frequencies[('other', 'pole')], 1)
+        self.assertEqual(self.index.unlabeled, ['d'])
+
+    def test_cooccurrence(self):
+        matrix = self.index.cooccurrence('surface type', 'obstacles')
+        self.assertEqual(matrix.columns.tolist(), ['concrete', 'asphalt'])
+        self.assertEqual(matrix.index.tolist(), ['pole', 'tree'])
+        self.assertEqual(matrix.loc['pole'].tolist(), [1, 1])
+        self.assertEqual(matrix.loc['tree'].tolist(), [1, 0])
+
+    def test_search(self):
+        self.assertEqual(self.index.search(all_of='obstacles,pole'), ['a', 'b'])
+        self.assertEqual(self.index.search(all_of='pole'), ['a', 'b', 'c'])
+        self.assertEqual(self.index.search(any_of=['tree', 'asphalt']), ['a', 'b'])
+        self.assertEqual(self.index.search(all_of='concrete', none_of='obstacles,tree'), ['c'])
+        self.assertEqual(self.index.search(all_of='missing'), [])
+
+    def test_fixture_dataset(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        index = LabelIndex.from_dataset(ds, taxonomy='fixtures/taxonomy.csv')
+
+        self.assertEqual(index.matrix.shape, (1, len(index.tags)))
+        self.assertEqual(index.frequencies()[('obstacles', 'pole')], 1)
+        self.assertEqual(index.frequencies()[('obstacles', 'bench')], 0)
+        self.assertEqual(index.search(all_of=['pothole', 'ramp']), ['instance-001'])
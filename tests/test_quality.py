@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from sideseeing_tools import constants, quality
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import START, at, make_gps, make_instance, make_sensor
+
+
+STOP = at(10)
+
+
+class TestStreamQuality(unittest.TestCase):
+    def test_regular_stream(self):
+        result = quality.stream_quality(at(np.arange(0, 10, 0.01)), START, STOP)
+
+        self.assertEqual(result['samples'], 1000)
+        self.assertAlmostEqual(result['rate'], 100, places=6)
+        self.assertAlmostEqual(result['interval_ms'], 10)
+        self.assertAlmostEqual(result['jitter_p99_ms'], 0, places=6)
+        self.assertEqual(result['gaps'], 0)
+        self.assertAlmostEqual(result['end_offset'], 0.01)
+        self.assertAlmostEqual(result['coverage'], 0.999)
+
+    def test_gaps_duplicates_and_coverage(self):
+        seconds = np.concatenate([np.arange(2, 4, 0.01), [3.99], np.arange(5, 8, 0.01)])
+        result = quality.stream_quality(at(seconds), START, STOP, gap_ms=100)
+
+        self.assertEqual(result['duplicates'], 1)
+        self.assertEqual(result['gaps'], 1)
+        self.assertAlmostEqual(result['max_gap_ms'], 1010)
+        self.assertAlmostEqual(result['gap_seconds'], 1.01)
+        self.assertAlmostEqual(result['start_offset'], 2)
+        self.assertAlmostEqual(result['coverage'], (7.99 - 2 - 1.01) / 10)
+
+        relative = quality.stream_quality(at(seconds), START, STOP)
+        self.assertEqual(relative['gaps'], 1)
+
+    def test_out_of_order_and_jitter(self):
+        seconds = np.arange(0, 1, 0.01)
+        events = (seconds * 1e9).astype('int64')
+        events[[10, 50]] = events[[50, 10]]
+        rng = np.random.default_rng(0)
+        jittered = seconds + rng.uniform(0, 0.002, len(seconds))
+
+        result = quality.stream_quality(at(jittered), START, STOP, event_ns=events)
+        self.assertEqual(result['out_of_order'], 2)
+        self.assertGreater(result['jitter_p95_ms'], 1)
+        self.assertLess(result['jitter_p95_ms'], 3)
+
+    def test_empty_stream(self):
+        result = quality.stream_quality(at([]), START, STOP)
+        self.assertEqual(result['samples'], 0)
+        self.assertEqual(result['coverage'], 0)
+        self.assertTrue(np.isnan(result['rate']))
+
+
+class TestDatasetQuality(unittest.TestCase):
+    def test_instance_and_gap_thresholds(self):
+        instance = make_instance(
+            media_stop_time=STOP,
+            sensors3={'accelerometer': make_sensor(np.arange(0, 10, 0.2))},
+            geolocation_points=make_gps([0, 5, 9], -23.0, -46.0),
+            consumption=None,
+        )
+        table = quality.instance_quality(instance, gap_ms={'geolocation_points': 1000, 'default': 100})
+
+        self.assertEqual(list(table.columns), quality.QUALITY_COLUMNS)
+        self.assertEqual(list(table['sensor']), ['accelerometer', 'geolocation_points'])
+        self.assertEqual(list(table['gaps']), [49, 2])
+        self.assertTrue(table['out_of_order'].isna().all())
+
+    def test_dataset_quality(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        table = quality.dataset_quality(ds)
+
+        sensors = sum(len(getattr(ds.instance, attr)) for attr in constants.SENSOR_ATTRIBUTES)
+        self.assertEqual(len(table), sensors + 2)
+        row = table.set_index('sensor').loc['icm4x6xx accelerometer non-wakeup']
+        self.assertEqual(row['samples'], len(ds.instance.sensors3['icm4x6xx accelerometer non-wakeup']))
+        self.assertEqual(row['out_of_order'], 0)
+        self.assertGreater(row['coverage'], 0.95)
+        self.assertTrue(table['coverage'].between(0, 1).all())
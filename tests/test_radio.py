@@ -0,0 +1,157 @@
+import os
+import tempfile
+import unittest
+
+from types import SimpleNamespace
+
+import pandas as pd
+
+from sideseeing_tools.radio import CellIndex, WifiIndex
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import at, make_gps, make_instance
+
+
+def make_fixes(fixes):
+    seconds, latitude, longitude = zip(*fixes)
+    return make_gps(seconds, latitude, longitude)
+
+
+def make_wifi_instance(name, scans, fixes):
+    '''
+    scans: list of (seconds, [(bssid, level), ...]); fixes: list of (seconds, lat, lon).
+    '''
+    wifi = pd.DataFrame([
+        {'Datetime UTC': at(t), 'SSID': f'net-{bssid[-2:]}', 'BSSID': bssid, 'level': str(level), 'frequency': '2412', 'standard': '11n'}
+        for t, networks in scans for bssid, level in networks
+    ])
+    return make_instance(name, wifi_networks=wifi, geolocation_points=make_fixes(fixes))
+
+
+class TestWifiIndex(unittest.TestCase):
+    def setUp(self):
+        a = make_wifi_instance('a', [
+            (0, [('aa:aa:aa:aa:aa:01', -40), ('aa:aa:aa:aa:aa:02', -70)]),
+            (20, [('aa:aa:aa:aa:aa:02', -45), ('aa:aa:aa:aa:aa:03', -60)]),
+            (60, [('aa:aa:aa:aa:aa:04', -50)]),
+        ], [(0, -23.0, -46.0), (20, -23.001, -46.0)])
+        b = make_wifi_instance('b', [
+            (5, [('AA:AA:AA:AA:AA:01', -80), ('aa:aa:aa:aa:aa:03', -65)]),
+        ], [(5, -23.0005, -46.0)])
+        self.index = WifiIndex.from_dataset(SimpleNamespace(iterator=[a, b]), tolerance_s=10)
+
+    def test_lookup(self):
+        seen = self.index.lookup('aa:aa:aa:aa:aa:01')
+        self.assertEqual(seen['instance'].tolist(), ['a', 'b'])
+        self.assertEqual(seen['level'].tolist(), [-40.0, -80.0])
+        self.assertEqual(seen['seconds'].tolist(), [0.0, 5.0])
+        self.assertTrue(self.index.lookup('ff:ff:ff:ff:ff:ff').empty)
+
+    def test_access_points(self):
+        aps = self.index.access_points()
+        self.assertEqual(len(aps), 4)
+        self.assertEqual(aps.loc['aa:aa:aa:aa:aa:01', 'instances'], 2)
+        self.assertEqual(aps.loc['aa:aa:aa:aa:aa:01', 'observations'], 2)
+        # The -40 dBm observation dominates the -80 dBm one.
+        self.assertAlmostEqual(aps.loc['aa:aa:aa:aa:aa:01', 'latitude'], -23.0, places=5)
+        # Seen 40 s away from the last GPS fix: no position.
+        self.assertTrue(pd.isna(aps.loc['aa:aa:aa:aa:aa:04', 'latitude']))
+
+    def test_locate(self):
+        best = self.index.locate({'aa:aa:aa:aa:aa:02': -47, 'aa:aa:aa:aa:aa:03': -61}, k=2)
+        self.assertEqual(best['instance'].tolist(), ['a', 'b'])
+        self.assertEqual(best['time'].iloc[0], at(20))
+        self.assertEqual(best['matches'].tolist(), [2, 1])
+        self.assertEqual(best['similarity'].iloc[0], 1.0)
+        self.assertAlmostEqual(best['latitude'].iloc[0], -23.001)
+
+        self.assertTrue(self.index.locate(['ff:ff:ff:ff:ff:ff']).empty)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'wifi.npz')
+            self.index.save(path)
+            loaded = WifiIndex.load(path)
+
+        self.assertEqual(loaded.size, self.index.size)
+        pd.testing.assert_frame_equal(loaded.access_points(), self.index.access_points(), check_dtype=False)
+        pd.testing.assert_frame_equal(
+            loaded.locate(['aa:aa:aa:aa:aa:01']), self.index.locate(['aa:aa:aa:aa:aa:01']), check_dtype=False,
+        )
+
+    def test_fixture_dataset(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        index = WifiIndex.from_dataset(ds)
+        self.assertEqual(index.size, len(ds.instance.wifi_networks))
+
+
+def make_cell_instance(name, rows, fixes):
+    '''
+    rows: list of (seconds, (mcc, mnc, lac, cid), ss); fixes: list of (seconds, lat, lon).
+    '''
+    cell = pd.DataFrame([
+        {
+            'Datetime UTC': at(t), 'registered': True, 'mcc': key[0], 'mnc': key[1], 'lac': key[2], 'cid': key[3],
+            'alpha_short': 'Claro', 'ss': ss, 'level': 3,
+        }
+        for t, key, ss in rows
+    ])
+    return make_instance(name, cell_networks=cell, geolocation_points=make_fixes(fixes))
+
+
+class TestCellIndex(unittest.TestCase):
+    def setUp(self):
+        serving = (724, 5, 3001, 101)
+        other = (724, 5, 3001, 102)
+        a = make_cell_instance('a', [
+            (0, serving, -60), (1, serving, -62), (30, other, -90),
+            (31, (724, 5, 2147483647, 2147483647), -100), (32, (724, 5, '', ''), -100),
+        ], [(0, -23.5400, -46.7070), (30, -23.5500, -46.7070)])
+        b = make_cell_instance('b', [(0, serving, -70)], [(0, -23.5401, -46.7071)])
+        self.index = CellIndex.from_dataset(SimpleNamespace(iterator=[a, b]), cell_size_m=200)
+
+    def test_invalid_identities_are_skipped(self):
+        self.assertEqual(self.index.size, 4)
+        self.assertEqual(len(self.index.identities), 2)
+
+    def test_cells_and_lookup(self):
+        cells = self.index.cells().set_index(['mcc', 'mnc', 'lac', 'cid'])
+        serving = cells.loc[(724, 5, 3001, 101)]
+        self.assertEqual(serving['observations'], 3)
+        self.assertEqual(serving['instances'], 2)
+        self.assertEqual(serving['max_ss'], -60)
+        self.assertEqual(serving['footprint_cells'], 1)
+        self.assertEqual(serving['operator'], 'Claro')
+
+        seen = self.index.lookup(724, 5, 3001, 101)
+        self.assertEqual(seen['instance'].tolist(), ['a', 'b', 'a'])
+        self.assertTrue(self.index.lookup(1, 1, 1, 1).empty)
+
+    def test_footprint_and_coverage(self):
+        footprint = self.index.footprint(724, 5, 3001, 101)
+        self.assertEqual(footprint['observations'].tolist(), [3])
+        self.assertAlmostEqual(footprint['latitude'].iloc[0], -23.54, places=2)
+
+        near = self.index.coverage(-23.5405, -46.7075, -23.5395, -46.7065)
+        self.assertEqual(near['cid'].tolist(), [101])
+        self.assertAlmostEqual(near['mean_ss'].iloc[0], -64.0)
+
+        both = self.index.coverage(-23.56, -46.71, -23.53, -46.70)
+        self.assertEqual(both['cid'].tolist(), [101, 102])
+        self.assertTrue(self.index.coverage(-22.0, -43.0, -21.9, -42.9).empty)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'cell.npz')
+            self.index.save(path)
+            loaded = CellIndex.load(path)
+
+        pd.testing.assert_frame_equal(loaded.cells(), self.index.cells(), check_dtype=False)
+        pd.testing.assert_frame_equal(
+            loaded.coverage(-23.56, -46.71, -23.53, -46.70), self.index.coverage(-23.56, -46.71, -23.53, -46.70),
+            check_dtype=False,
+        )
+
+    def test_fixture_dataset(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        index = CellIndex.from_dataset(ds)
+        self.assertLessEqual(index.size, len(ds.instance.cell_networks))
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from sideseeing_tools import resample
+from sideseeing_tools.sideseeing import SideSeeingDS
+
+
+class TestResample(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.times = [np.sort(rng.uniform(0, 10, n)) for n in (500, 800, 0)]
+        self.values = [rng.normal(size=(len(t), 3)) for t in self.times]
+        self.targets = np.arange(-1, 11, 0.05)
+
+    def test_batch_linear_matches_interp(self):
+        out = resample.resample_batch(self.times, self.values, self.targets, 'linear')
+        self.assertEqual(out.shape, (3, len(self.targets), 3))
+        self.assertTrue(np.isnan(out[2]).all())
+
+        for t, v, o in zip(self.times[:2], self.values[:2], out[:2]):
+            inside = (self.targets >= t[0]) & (self.targets <= t[-1])
+            expected = np.stack([np.interp(self.targets, t, v[:, k]) for k in range(3)], axis=1)
+            np.testing.assert_allclose(o[inside], expected[inside])
+            self.assertTrue(np.isnan(o[~inside]).all())
+
+    def test_batch_zoh_and_nearest(self):
+        zoh = resample.resample_batch(self.times, self.values, self.targets, 'zoh')
+        nearest = resample.resample_batch(self.times, self.values, self.targets, 'nearest')
+
+        t, v = self.times[0], self.values[0]
+        inside = (self.targets >= t[0]) & (self.targets <= t[-1])
+        previous = np.searchsorted(t, self.targets, side='right') - 1
+        np.testing.assert_allclose(zoh[0][inside], v[previous[inside]])
+
+        closest = np.abs(t[None, :] - self.targets[inside][:, None]).argmin(axis=1)
+        np.testing.assert_allclose(nearest[0][inside], v[closest])
+
+        with self.assertRaises(ValueError):
+            resample.resample_batch(self.times, self.values, self.targets, 'cubic')
+
+    def test_polyphase_removes_aliasing(self):
+        t = np.arange(0, 20, 1 / 200)
+        x = np.sin(2 * np.pi * 45 * t)
+
+        targets, picked = resample.resample(t, x, 20, method='linear')
+        _, filtered = resample.resample(t, x, 20, method='polyphase')
+        self.assertEqual(len(targets), 400)
+        self.assertGreater(np.sqrt(np.nanmean(picked ** 2)), 0.5)
+        self.assertLess(np.sqrt(np.nanmean(filtered[5:-5] ** 2)), 0.01)
+
+        slow = np.sin(2 * np.pi * 1 * t)
+        _, kept = resample.resample(t, slow, 20, method='polyphase')
+        np.testing.assert_allclose(kept[5:-5], np.sin(2 * np.pi * targets[5:-5]), atol=0.01)
+
+    def test_upsampling(self):
+        t = np.arange(0, 2, 0.1)
+        targets, x = resample.resample(t, 3 * t, 50)
+        self.assertEqual(len(targets), 96)
+        np.testing.assert_allclose(x, 3 * targets)
+
+    def test_resample_instance(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        instance = ds.instance
+
+        for method in resample.METHODS:
+            resampled = resample.resample_instance(instance, 50, method)
+            self.assertEqual(set(resampled['sensors3']), set(instance.sensors3))
+
+            df = resampled['sensors3']['icm4x6xx accelerometer non-wakeup']
+            self.assertEqual(list(df.columns), ['Datetime UTC', 'time', 'x', 'y', 'z'])
+            np.testing.assert_allclose(np.diff(df['time']), 0.02)
+            self.assertLessEqual(df['time'].iloc[-1], instance.media_total_time)
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import roughness, shared
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import START, at, make_instance, make_sensor, walk_north
+
+
+RATE = 100
+
+
+def make_accelerometer(seconds, gravity_axis=2):
+    # 9.8 m/s² of gravity; a 10 Hz vibration of 2 m/s² amplitude after 50 s, plus a 2 Hz gait on every axis.
+    t = np.arange(0, seconds, 1 / RATE)
+    values = 0.5 * np.sin(2 * np.pi * 2 * t)[:, None] * np.ones((1, 3))
+    values[:, gravity_axis] += 9.8 + np.where(t >= 50, 2 * np.sin(2 * np.pi * 10 * t), 0.0)
+    return make_sensor(t, values[:, 0], values[:, 1], values[:, 2])
+
+
+def make_walk(gravity_axis=2):
+    # Walking north at 1 m/s for 100 s, with a fix every 5 s.
+    seconds = np.arange(0, 101, 5.0)
+    return make_instance(
+        sensors3={
+            'icm4x6xx accelerometer non-wakeup': make_accelerometer(100, gravity_axis),
+            'icm4x6xx accelerometer wakeup': make_accelerometer(10, gravity_axis),
+        },
+        geolocation_points=walk_north(seconds, seconds, accuracy=3.0, gps_interval=5.0),
+    )
+
+
+class TestRoughness(unittest.TestCase):
+    def test_window_roughness(self):
+        df = make_accelerometer(100)
+        starts, ends, index = roughness.window_roughness(df, START, window=100, step=100)
+
+        self.assertEqual(len(index), 100)
+        np.testing.assert_allclose(starts[:3], [0, 1, 2])
+        # The gait is outside the band; a 2 m/s² sine has an RMS of sqrt(2).
+        np.testing.assert_allclose(index[:50], 0, atol=1e-6)
+        np.testing.assert_allclose(index[50:], np.sqrt(2), rtol=1e-6)
+
+    def test_orientation_does_not_matter(self):
+        _, _, upright = roughness.window_roughness(make_accelerometer(100, 2), START, window=100, step=100)
+        _, _, sideways = roughness.window_roughness(make_accelerometer(100, 0), START, window=100, step=100)
+        np.testing.assert_allclose(upright, sideways, atol=1e-9)
+
+    def test_instance_roughness(self):
+        table = roughness.instance_roughness(make_walk(), segment_m=10, window=100, step=100)
+
+        self.assertEqual(list(table.columns), roughness.ROUGHNESS_COLUMNS)
+        self.assertEqual(list(table['segment']), list(range(10)))
+        self.assertEqual(table['windows'].sum(), 100)
+        np.testing.assert_allclose(table['roughness'][:5], 0, atol=1e-6)
+        np.testing.assert_allclose(table['roughness'][5:], np.sqrt(2), rtol=1e-6)
+        self.assertTrue((table['end_latitude'] > table['start_latitude']).all())
+
+        self.assertTrue(roughness.instance_roughness(make_walk(), sensor='unknown').empty)
+
+    def test_gps_gaps_are_left_out(self):
+        instance = make_walk()
+        instance.geolocation_points = instance.geolocation_points[
+            (instance.geolocation_points['Datetime UTC'] < at(20))
+            | (instance.geolocation_points['Datetime UTC'] > at(70))
+        ]
+        table = roughness.instance_roughness(instance, segment_m=10, window=100, step=100, max_gap_s=10)
+
+        # Windows centered within the first 15 s or the last 25 s.
+        self.assertEqual(table['windows'].sum(), 15 + 25)
+
+    def test_shared_view(self):
+        instance = make_walk()
+        expected = roughness.instance_roughness(instance)
+
+        with shared.SharedInstance(instance) as published:
+            with shared.attach(published.handle) as view:
+                result = roughness.instance_roughness(view)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_dataset_roughness(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        table = roughness.dataset_roughness(ds, segment_m=10)
+
+        self.assertEqual(set(table['instance']), {ds.instance.name})
+        self.assertFalse(table['roughness'].isna().any())
+        self.assertTrue((table['roughness_max'] >= table['roughness']).all())
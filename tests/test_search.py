@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools.search import FEATURE_NAMES, SensorWindowIndex, pick_sensor, window_features
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import START, make_instance, make_sensor
+
+
+def make_rough_instance(name, rough_from, rough_to, seconds=20, rate=50, seed=0):
+    '''
+    A 50 Hz accelerometer stream that vibrates strongly between `rough_from` and `rough_to`.
+    '''
+    rng = np.random.default_rng(seed)
+    t = np.arange(seconds * rate) / rate
+    amplitude = np.where((t >= rough_from) & (t < rough_to), 4.0, 0.2)
+    df = make_sensor(
+        t,
+        amplitude * rng.standard_normal(len(t)),
+        amplitude * rng.standard_normal(len(t)),
+        9.8 + amplitude * rng.standard_normal(len(t)),
+    )
+    sensors3 = {
+        'icm4x6xx accelerometer wakeup': df,
+        'icm4x6xx accelerometer non-wakeup': df,
+        'icm4x6xx gyroscope non-wakeup': df.assign(x=0.0, y=0.0, z=0.0),
+    }
+    return make_instance(name, sensors3=sensors3)
+
+
+class TestWindowFeatures(unittest.TestCase):
+    def test_matches_naive_computation(self):
+        instance = make_rough_instance('a', 5, 10)
+        df = instance.sensors3['icm4x6xx accelerometer non-wakeup']
+        starts, ends, samples, features = window_features(df, START, window_s=2, step_s=1)
+
+        self.assertEqual(features.shape, (18, len(FEATURE_NAMES)))
+        self.assertEqual(samples.tolist(), [100] * 18)
+
+        t = (df['Datetime UTC'] - START).dt.total_seconds()
+        window = df[(t >= starts[3]) & (t < ends[3])]
+        magnitude = np.sqrt((window[['x', 'y', 'z']] ** 2).sum(axis=1))
+        expected = {
+            'x_mean': window['x'].mean(),
+            'y_std': window['y'].std(ddof=0),
+            'z_min': window['z'].min(),
+            'magnitude_max': magnitude.max(),
+            'x_jerk': window['x'].diff().abs().sum() / (t[window.index[-1]] - t[window.index[0]]),
+        }
+        for name, value in expected.items():
+            self.assertAlmostEqual(features[3, FEATURE_NAMES.index(name)], value, places=6)
+
+    def test_short_stream(self):
+        instance = make_rough_instance('a', 0, 0, seconds=1, rate=5)
+        starts, _, _, features = window_features(instance.sensors3['icm4x6xx accelerometer wakeup'], START)
+        self.assertEqual(len(starts), 0)
+        self.assertEqual(features.shape, (0, len(FEATURE_NAMES)))
+
+
+class TestSensorWindowIndex(unittest.TestCase):
+    def setUp(self):
+        self.dataset = SimpleNamespace(iterator=[
+            make_rough_instance('a', 5, 10, seed=1),
+            make_rough_instance('b', 12, 17, seed=2),
+        ])
+        self.index = SensorWindowIndex.from_dataset(self.dataset, sensor='accelerometer', window_s=2, step_s=1)
+
+    def test_pick_sensor(self):
+        instance = self.dataset.iterator[0]
+        self.assertEqual(pick_sensor(instance, 'accelerometer'), 'icm4x6xx accelerometer non-wakeup')
+        self.assertEqual(pick_sensor(instance, 'icm4x6xx accelerometer wakeup'), 'icm4x6xx accelerometer wakeup')
+        self.assertIsNone(pick_sensor(instance, 'magnetometer'))
+
+    def test_query_finds_similar_stretch_in_other_instance(self):
+        self.assertEqual(self.index.matrix.dtype, np.float32)
+        self.assertEqual(self.index.size, 36)
+
+        hits = self.index.query('a', 6.5, k=3)
+        self.assertEqual(hits['instance'].tolist(), ['b', 'b', 'b'])
+        self.assertTrue(12 <= hits['start_time'].iloc[0] and hits['end_time'].iloc[0] <= 17)
+        for start, end in zip(hits['start_time'], hits['end_time']):
+            self.assertTrue(start < 17 and end > 12)
+        self.assertTrue(hits['distance'].is_monotonic_increasing)
+
+        same = self.index.query('a', 6.5, k=1, exclude_same_instance=False)
+        self.assertEqual(same['instance'].tolist(), ['a'])
+        self.assertEqual(same['distance'].iloc[0], 0.0)
+
+    def test_quantized_search(self):
+        self.index.quantize(n_clusters=4)
+        queries = self.index.matrix[:5]
+
+        exact = self.index.knn(queries, k=3)
+        probed = self.index.knn(queries, k=3, n_probe=4)
+        np.testing.assert_array_equal(exact[1], probed[1])
+
+        approx = self.index.knn(queries, k=3, n_probe=1)
+        self.assertTrue((approx[1][:, 0] == np.arange(5)).all())
+
+    def test_windows_with_missing_values_are_left_out(self):
+        gappy = make_rough_instance('c', 5, 10, seed=3)
+        df = gappy.sensors3['icm4x6xx accelerometer non-wakeup'].copy()
+        df.loc[150, 'x'] = np.nan
+        gappy.sensors3['icm4x6xx accelerometer non-wakeup'] = df
+
+        dataset = SimpleNamespace(iterator=self.dataset.iterator + [gappy])
+        index = SensorWindowIndex.from_dataset(dataset, sensor='accelerometer', window_s=2, step_s=1)
+        self.assertEqual(index.size, 36 + 18 - 2)
+        self.assertTrue(np.isfinite(index.mean).all() and np.isfinite(index.matrix).all())
+        self.assertFalse(((index.windows['instance'] == 'c') & (index.windows['start_time'] == 2)).any())
+
+        index.quantize(n_clusters=4)
+        for n_probe in (None, 2):
+            hits = index.query('a', 6.5, k=3, n_probe=n_probe)
+            self.assertEqual(len(hits), 3)
+            self.assertTrue(np.isfinite(hits['distance']).all())
+
+    def test_parallel_build_and_persistence(self):
+        parallel = SensorWindowIndex.from_dataset(self.dataset, sensor='accelerometer', window_s=2, step_s=1, max_workers=2)
+        np.testing.assert_array_equal(parallel.matrix, self.index.matrix)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'windows.npz')
+            self.index.save(path)
+            loaded = SensorWindowIndex.load(path)
+
+        pd.testing.assert_frame_equal(loaded.query('b', 13, k=4), self.index.query('b', 13, k=4))
+
+    def test_fixture_dataset(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        index = SensorWindowIndex.from_dataset(ds, sensor='accelerometer', window_s=1, step_s=1, min_samples=5)
+        self.assertGreater(index.size, 0)
+        self.assertEqual(set(index.windows['sensor']), {'icm4x6xx accelerometer non-wakeup'})
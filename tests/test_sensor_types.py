@@ -0,0 +1,45 @@
+import unittest
+
+from sideseeing_tools import sensor_types
+from sideseeing_tools.sideseeing import SideSeeingDS
+
+
+class TestSensorTypes(unittest.TestCase):
+    def test_describe(self):
+        info = sensor_types.describe('qmc6308 Magnetometer-Uncalibrated Wakeup')
+        self.assertEqual(info.type, 'magnetometer')
+        self.assertTrue(info.wakeup)
+        self.assertFalse(info.calibrated)
+        self.assertEqual(info.unit, 'μT')
+
+        info = sensor_types.describe('icm4x6xx Accelerometer Non-wakeup')
+        self.assertEqual(info.type, 'accelerometer')
+        self.assertFalse(info.wakeup)
+        self.assertTrue(info.calibrated)
+
+    def test_composite_types_win_over_base_types(self):
+        self.assertEqual(sensor_types.sensor_type('linear_acceleration_wakeup'), 'linear_acceleration')
+        self.assertEqual(sensor_types.sensor_type('Geomagnetic Rotation Vector'), 'geomagnetic_rotation_vector')
+        self.assertEqual(sensor_types.sensor_type('Game Rotation Vector'), 'game_rotation_vector')
+        self.assertEqual(sensor_types.sensor_type('gravity  non-wakeup'), 'gravity')
+
+    def test_unknown(self):
+        info = sensor_types.describe('vendor hinge angle')
+        self.assertEqual(info.type, sensor_types.UNKNOWN_TYPE)
+        self.assertEqual(info.unit, '')
+
+    def test_dataset_bitmap(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+
+        self.assertTrue(ds.sensor_types.loc['instance-001', 'accelerometer'])
+        self.assertNotIn('pressure', ds.sensor_types.columns)
+        self.assertEqual(
+            ds.sensor_type_names['gyroscope'],
+            {
+                'icm4x6xx gyroscope non-wakeup', 'icm4x6xx gyroscope wakeup',
+                'icm4x6xx gyroscope-uncalibrated wakeup', 'icm4x6xx gyroscope-uncalibrated non-wakeup',
+            },
+        )
+
+        self.assertEqual(ds.query(types=['accelerometer', 'light']).names, ['instance-001'])
+        self.assertEqual(ds.query(types='pressure').size, 0)
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from multiprocessing import shared_memory
+
+from sideseeing_tools import shared
+from sideseeing_tools.sideseeing import SideSeeingDS
+
+
+def count_sensor_rows(instance):
+    return {name: len(df) for name, df in instance.sensors3.items()}
+
+
+class TestSharedInstance(unittest.TestCase):
+    def setUp(self):
+        self.dataset = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        self.instance = self.dataset.instances['instance-001']
+        self.sensor_name = 'icm4x6xx accelerometer non-wakeup'
+
+    def test_attach_rebuilds_dataframes(self):
+        with shared.SharedInstance(self.instance) as published:
+            with shared.attach(published.handle) as view:
+                original = self.instance.sensors3[self.sensor_name]
+                rebuilt = view.sensors3[self.sensor_name]
+
+                self.assertEqual(view.name, self.instance.name)
+                self.assertEqual(view.media_start_time, self.instance.media_start_time)
+                np.testing.assert_array_equal(rebuilt['x'].to_numpy(), original['x'].to_numpy())
+                np.testing.assert_array_equal(rebuilt['Time (s)'].to_numpy(), original['Time (s)'].to_numpy())
+                np.testing.assert_array_equal(
+                    rebuilt['Datetime UTC'].to_numpy(),
+                    original['Datetime UTC'].to_numpy().astype('datetime64[ns]'),
+                )
+                np.testing.assert_array_equal(
+                    view.geolocation_points['latitude'].to_numpy(),
+                    self.instance.geolocation_points['latitude'].to_numpy(),
+                )
+                self.assertEqual(set(view.sensors6.keys()), set(self.instance.sensors6.keys()))
+                del rebuilt
+
+    def test_attach_is_zero_copy(self):
+        with shared.SharedInstance(self.instance) as published:
+            with shared.attach(published.handle) as view:
+                values = view.values('sensors3', self.sensor_name)
+                column = view.sensors3[self.sensor_name]['y'].to_numpy()
+
+                self.assertEqual(values.shape, (len(self.instance.sensors3[self.sensor_name]), 4))
+                self.assertTrue(np.shares_memory(values, column))
+                self.assertFalse(values.flags.writeable)
+                del values, column
+
+    def test_close_unlinks_segment(self):
+        published = shared.SharedInstance(self.instance)
+        segment_name = published.handle.segment_name
+        published.close()
+        published.close()
+
+        self.assertTrue(published.closed)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=segment_name)
+
+    def test_map_shared_in_process_pool(self):
+        results = shared.map_shared(count_sensor_rows, [self.instance] * 3, max_workers=2)
+        expected = count_sensor_rows(self.instance)
+
+        self.assertEqual(results, [expected] * 3)
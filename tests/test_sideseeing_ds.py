@@ -1,3 +1,4 @@
+import datetime
 import os
 import unittest
 
@@ -37,3 +38,66 @@ class TestSideSeeingDS(unittest.TestCase):
 
         self.assertEqual(str(ds), "SSDS[name: TestDataset, instances: 1]")
         self.assertEqual(repr(ds), "SSDS[name: TestDataset, instances: 1]")
+
+    def test_sideseeingds_load_stats(self):
+        ds = SideSeeingDS(root_dir=self.root_dir, name="TestDataset")
+        stats = ds.load_stats.set_index('file_type')
+
+        self.assertEqual(set(stats['instance']), {'instance-001'})
+        self.assertIn('sensors3', stats.index)
+        self.assertEqual(stats.loc['gps', 'rows_parsed'], 6)
+        self.assertEqual(stats.loc['gps', 'bytes_read'], os.path.getsize(os.path.join(self.root_dir, 'instance-001', 'gps.csv')))
+        self.assertEqual(stats.loc['sensors3', 'rows_dropped'], 16)
+        self.assertEqual(stats.loc['wifi', 'rows_dropped'], stats.loc['wifi', 'rows_parsed'])
+        self.assertTrue((stats['total_time'] >= stats['read_time']).all())
+
+    def test_sideseeingds_progress_callback(self):
+        reports = []
+        ds = SideSeeingDS(root_dir=self.root_dir, name="TestDataset", progress_callback=reports.append)
+
+        self.assertEqual(len(reports), ds.size)
+        last = reports[-1]
+        self.assertEqual(last['operation'], 'load')
+        self.assertEqual(last['item'], 'instance-001')
+        self.assertEqual(last['items_done'], last['items_total'])
+        self.assertEqual(last['eta'], 0)
+        self.assertEqual(last['bytes'], ds.load_stats['bytes_read'].sum())
+        self.assertGreater(last['rows_per_second'], 0)
+
+    def test_sideseeingds_logs_instead_of_printing(self):
+        with self.assertLogs('sideseeing_tools.sideseeing', level='INFO') as logs:
+            SideSeeingDS(root_dir=self.root_dir, name="TestDataset")
+
+        self.assertEqual(logs.output, ['INFO:sideseeing_tools.sideseeing:Loading data.', 'INFO:sideseeing_tools.sideseeing:Done.'])
+
+    def test_sideseeingds_query(self):
+        ds = SideSeeingDS(root_dir=self.root_dir, name="TestDataset")
+
+        view = ds.query(
+            sensors=['icm4x6xx accelerometer non-wakeup', 'tcs3720 ambient light sensor non-wakeup'],
+            manufacturer='Motorola',
+            model='motorola edge 30 ultra',
+            android_version=33,
+            start_time=datetime.datetime(2024, 1, 6),
+            end_time=datetime.datetime(2024, 1, 7),
+            min_duration=60,
+            tags=['pothole', 'obstacles,pole'],
+            bbox=(-23.54, -46.71, -23.53, -46.70),
+        )
+        self.assertEqual(view.size, 1)
+        self.assertEqual([i.name for i in view.iterator], ['instance-001'])
+        self.assertIs(view.instances['instance-001'], ds.instances['instance-001'])
+        self.assertEqual(str(view), "SSDSView[name: TestDataset, instances: 1]")
+
+        self.assertEqual(ds.query(tags='obstacles,pothole').size, 0)
+        self.assertEqual(ds.query(tags=['Pothole', 'Obstacles, Pole']).size, 1)
+
+        instance = ds.instances['instance-001']
+        during = instance.media_start_time + datetime.timedelta(seconds=1)
+        self.assertEqual(ds.query(start_time=during, end_time=during).size, 1)
+        self.assertEqual(ds.query(start_time=instance.media_stop_time + datetime.timedelta(seconds=1)).size, 0)
+        self.assertEqual(ds.query(bbox=(0, 0, 1, 1)).size, 0)
+        self.assertEqual(ds.query(max_duration=60).size, 0)
+        self.assertEqual(ds.query(sensors='unknown sensor').size, 0)
+        self.assertEqual(view.query(manufacturer='samsung').size, 0)
+        self.assertEqual(ds.query(manufacturer='samsung').sensors['sensors3'], {})
@@ -362,4 +362,27 @@ class TestSideSeeingInstance(unittest.TestCase):
         start_frame = 30
         end_frame = 90
         frames = self.instance.extract_frames_positionspan(start_frame, end_frame, step=30, prefix='frame_')
-        self.assertGreater(len(frames), 0)
\ No newline at end of file
+        self.assertGreater(len(frames), 0)
+
+    def test_memory_usage_is_ok(self):
+        usage = self.instance.memory_usage()
+
+        self.assertEqual(set(usage['instance']), {self.instance.name})
+        self.assertEqual(
+            set(usage[usage['modality'] == 'sensors3']['sensor']),
+            set(self.instance.sensors3.keys())
+        )
+        self.assertTrue({'label', 'metadata', 'geolocation_points'}.issubset(set(usage['modality'])))
+        self.assertTrue((usage['bytes'] > 0).all())
+
+        accelerometer = usage[usage['sensor'] == 'icm4x6xx accelerometer non-wakeup'].iloc[0]
+        df = self.instance.sensors3['icm4x6xx accelerometer non-wakeup']
+        self.assertEqual(accelerometer['bytes'], df.memory_usage(deep=True).sum())
+        self.assertEqual(accelerometer['rows'], len(df))
+
+    def test_dataset_memory_usage_estimate_is_ok(self):
+        estimate = self.dataset.estimate_memory_usage().set_index('modality')
+        usage = self.dataset.memory_usage().groupby('modality')['bytes'].sum()
+
+        self.assertAlmostEqual(estimate.loc['sensors3', 'predicted_bytes'], usage['sensors3'], delta=1)
+        self.assertEqual(len(self.dataset.memory_usage()), len(self.instance.memory_usage()))
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import simplify
+from sideseeing_tools.sideseeing import SideSeeingDS, SideSeeingInstance
+from tests.helpers import METERS_PER_DEGREE, make_instance
+
+
+def make_track(x, y):
+    # Positions in meters east (x) and north (y) of (0, 0).
+    return pd.DataFrame({
+        'latitude': np.asarray(y, dtype='float64') / METERS_PER_DEGREE,
+        'longitude': np.asarray(x, dtype='float64') / METERS_PER_DEGREE,
+    })
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    heading = np.cumsum(rng.normal(0, 0.3, n))
+    return np.cumsum(np.cos(heading)), np.cumsum(np.sin(heading))
+
+
+def reference_douglas_peucker(x, y, tolerance, first, last, keep):
+    if last - first < 2:
+        return
+    distance = simplify._segment_distance(x[first + 1:last], y[first + 1:last], x[first], y[first], x[last], y[last])
+    farthest = int(np.argmax(distance))
+    if distance[farthest] > tolerance:
+        index = first + 1 + farthest
+        keep[index] = True
+        reference_douglas_peucker(x, y, tolerance, first, index, keep)
+        reference_douglas_peucker(x, y, tolerance, index, last, keep)
+
+
+class TestSimplify(unittest.TestCase):
+    def test_douglas_peucker_matches_recursive_version(self):
+        x, y = random_walk(500)
+        importance = simplify.douglas_peucker_importance(x, y)
+
+        for tolerance in [0.1, 0.5, 2.0, 10.0]:
+            keep = np.zeros(len(x), dtype=bool)
+            keep[[0, -1]] = True
+            reference_douglas_peucker(x, y, tolerance, 0, len(x) - 1, keep)
+            np.testing.assert_array_equal(importance > tolerance, keep)
+
+    def test_simplify_in_meters(self):
+        # Two straight legs meeting 10 m off the line between the ends.
+        x = np.arange(0, 101, 1.0)
+        y = 10 - np.abs(x - 50) / 5
+        gps = make_track(x, y)
+
+        self.assertEqual(len(simplify.simplify(gps, 5.0)), 3)
+        self.assertEqual(len(simplify.simplify(gps, 15.0)), 2)
+        self.assertEqual(list(simplify.simplify(gps, 5.0).index), [0, 50, 100])
+
+    def test_visvalingam(self):
+        x, y = random_walk(300, seed=1)
+        gps = make_track(x, y)
+        levels = simplify.levels_of_detail(gps, [0.5, 2.0, 10.0], method='visvalingam')
+
+        sizes = [len(levels[t]) for t in [0.5, 2.0, 10.0]]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertLess(sizes[-1], len(gps))
+        for level in levels.values():
+            self.assertEqual(level.index[0], 0)
+            self.assertEqual(level.index[-1], len(gps) - 1)
+
+        with self.assertRaises(ValueError):
+            simplify.importance(gps['latitude'], gps['longitude'], method='unknown')
+
+    def test_missing_coordinates_are_dropped(self):
+        gps = make_track(np.arange(10.0), np.zeros(10))
+        gps.loc[4, 'latitude'] = np.nan
+
+        result = simplify.simplify(gps, 0.0)
+        self.assertNotIn(4, result.index)
+        self.assertEqual(list(result.index[[0, -1]]), [0, 9])
+
+    def test_instance_simplified_track(self):
+        x, y = random_walk(200, seed=2)
+        instance = make_instance(geolocation_points=make_track(x, y))
+        simplified_track = SideSeeingInstance.simplified_track.__get__(instance)
+
+        coarse, fine = simplified_track(10.0), simplified_track(0.5)
+        self.assertLess(len(coarse), len(fine))
+        self.assertEqual(len(instance._track_importance), 1)
+
+        x, y = random_walk(200, seed=3)
+        instance.geolocation_points = make_track(x, y)
+        self.assertTrue(simplified_track(0.5).index.equals(simplify.simplify(instance.geolocation_points, 0.5).index))
+
+    def test_fixture(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        instance = ds.instance
+        track = instance.simplified_track(0.0)
+
+        self.assertEqual(track.index[0], instance.geolocation_points.index[0])
+        self.assertEqual(track.index[-1], instance.geolocation_points.index[-1])
+        self.assertLessEqual(len(instance.simplified_track(1000.0)), 2)
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools.sideseeing import SideSeeingDS
+from sideseeing_tools.spatial import GeoIndex
+from tests.helpers import make_gps, make_instance
+
+
+def make_walk(name, points):
+    # A fix every 10 s.
+    latitude, longitude = np.array(points).T
+    return make_instance(name, geolocation_points=make_gps(10 * np.arange(len(points)), latitude, longitude))
+
+
+class TestGeoIndex(unittest.TestCase):
+    def setUp(self):
+        # ~11 m between consecutive points along the latitude.
+        self.walk = make_walk('walk', [(-23.5400 + 0.0001 * i, -46.7070) for i in range(10)])
+        self.far = make_walk('far', [(-22.9000, -43.2000), (-22.9001, -43.2001)])
+        self.dataset = SimpleNamespace(iterator=[self.walk, self.far])
+
+    def test_query_radius_returns_time_spans(self):
+        index = GeoIndex.from_dataset(self.dataset, cell_size_m=20)
+        hits = index.query_radius(-23.5395, -46.7070, 25)
+
+        self.assertEqual(hits['instance'].tolist(), ['walk'])
+        self.assertEqual(hits['start_time'].iloc[0], 30.0)
+        self.assertEqual(hits['end_time'].iloc[0], 70.0)
+        self.assertEqual(hits['points'].iloc[0], 5)
+
+    def test_query_bbox_splits_separate_passes(self):
+        loop = make_walk('loop', [(-23.5400, -46.7070), (-23.5500, -46.7070), (-23.5400, -46.7070)])
+        index = GeoIndex.from_dataset(SimpleNamespace(iterator=[loop]), cell_size_m=50)
+        hits = index.query_bbox(-23.5401, -46.7071, -23.5399, -46.7069)
+
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(hits['start_time'].tolist(), [0.0, 20.0])
+
+    def test_incremental_update_and_persistence(self):
+        index = GeoIndex(cell_size_m=50)
+        index.add_instance(self.walk)
+        self.assertTrue(index.query_radius(-22.9, -43.2, 100).empty)
+
+        index.update(self.dataset)
+        self.assertEqual(index.size, 12)
+        self.assertEqual(index.query_radius(-22.9, -43.2, 100)['instance'].tolist(), ['far'])
+
+        index.add_instance(self.walk)
+        self.assertEqual(index.size, 12)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'geo.npz')
+            index.save(path)
+            loaded = GeoIndex.load(path)
+
+        pd.testing.assert_frame_equal(
+            loaded.query_bbox(-24, -47, -22, -43),
+            index.query_bbox(-24, -47, -22, -43),
+        )
+
+    def test_fixture_dataset(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        index = GeoIndex.from_dataset(ds)
+        hits = index.query_radius(-23.5395398, -46.7073554, 5)
+
+        self.assertEqual(hits['instance'].tolist(), ['instance-001'])
+        self.assertGreater(hits['end_time'].iloc[0], 0)
@@ -0,0 +1,89 @@
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import stats
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import at
+
+
+def make_stats(values, rate=10):
+    st = stats.StreamStats(['x', 'y'])
+    for ind, row in enumerate(values):
+        st.push(at(ind / rate), row)
+    return st
+
+
+class TestStreamStats(unittest.TestCase):
+    def test_welford_matches_numpy(self):
+        values = np.random.default_rng(0).normal(1e6, 3.0, size=(500, 2))
+        st = make_stats(values.tolist())
+
+        self.assertEqual(st.count, 500)
+        self.assertAlmostEqual(st.mean['x'], values[:, 0].mean(), places=6)
+        self.assertAlmostEqual(st.std['y'], values[:, 1].std(), places=6)
+        self.assertEqual(st.min['x'], values[:, 0].min())
+        self.assertEqual(st.max['y'], values[:, 1].max())
+        self.assertAlmostEqual(st.duration, 49.9)
+        self.assertAlmostEqual(st.rate, 10.0)
+
+    def test_skips_non_numeric_values(self):
+        st = make_stats([[1.0, ''], [3.0, None], [float('nan'), '4'], [5.0, 'abc']])
+
+        self.assertEqual(st.count, 4)
+        self.assertEqual(st.counts, [3, 1])
+        self.assertEqual(st.mean, {'x': 3.0, 'y': 4.0})
+
+        empty = stats.StreamStats(['x'])
+        self.assertTrue(math.isnan(empty.mean['x']))
+        self.assertTrue(math.isnan(empty.rate))
+
+    def test_merge(self):
+        values = np.random.default_rng(1).uniform(size=(300, 2))
+        merged = make_stats(values[:100].tolist()).merge(make_stats(values[100:].tolist()))
+
+        self.assertEqual(merged.count, 300)
+        self.assertAlmostEqual(merged.mean['x'], values[:, 0].mean())
+        self.assertAlmostEqual(merged.variance['y'], values[:, 1].var())
+        self.assertEqual(merged.max['x'], values[:, 0].max())
+
+
+class TestParseStats(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        cls.instance = cls.ds.instance
+
+    def test_instance_stats_match_loaded_data(self):
+        for name, df in self.instance.sensors3.items():
+            st = self.instance.stats[('sensors3', name)]
+            self.assertEqual(st.count, len(df))
+            self.assertEqual(pd.Timestamp(st.first), df['Datetime UTC'].min())
+            self.assertEqual(pd.Timestamp(st.last), df['Datetime UTC'].max())
+            for axis in ['x', 'y', 'z']:
+                self.assertAlmostEqual(st.mean[axis], df[axis].mean(), places=6)
+                self.assertAlmostEqual(st.std[axis], df[axis].std(ddof=0), places=6)
+
+        gps = self.instance.stats[('geolocation_points', 'geolocation_points')]
+        self.assertEqual(gps.count, len(self.instance.geolocation_points))
+        self.assertEqual(gps.min['latitude'], self.instance.geolocation_points['latitude'].min())
+
+        consumption = self.instance.stats[('consumption', 'consumption')]
+        self.assertEqual(consumption.max['battery_microamperes'], self.instance.consumption['battery_microamperes'].max())
+
+        self.assertEqual(self.instance.stats[('wifi_networks', 'wifi_networks')].count, len(self.instance.wifi_networks))
+
+    def test_dataset_tables(self):
+        table = self.ds.stats
+        self.assertEqual(list(table.columns), stats.STATS_COLUMNS)
+        self.assertEqual(len(table[table['modality'] == 'sensors3']), 3 * len(self.instance.sensors3))
+
+        overview = self.ds.overview()
+        row = overview[(overview['sensor'] == 'icm4x6xx accelerometer non-wakeup') & (overview['channel'] == 'x')].iloc[0]
+        self.assertEqual(row['instances'], 1)
+        self.assertEqual(row['rows'], len(self.instance.sensors3['icm4x6xx accelerometer non-wakeup']))
+        self.assertGreater(row['rate'], 50)
+
+        self.assertEqual(self.ds.catalog.loc[self.instance.name, 'max_longitude'], self.instance.geolocation_points['longitude'].max())
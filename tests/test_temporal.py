@@ -0,0 +1,97 @@
+import unittest
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools.sideseeing import SideSeeingDS
+from sideseeing_tools.temporal import TimeIntervalIndex
+from tests import helpers
+
+
+def at(minute, second=0):
+    return helpers.at(60 * minute + second)
+
+
+def make_instance(name, start, stop):
+    return helpers.make_instance(name, media_start_time=start, media_stop_time=stop)
+
+
+class TestTimeIntervalIndex(unittest.TestCase):
+    def setUp(self):
+        self.dataset = SimpleNamespace(iterator=[
+            make_instance('a', at(0), at(10)),
+            make_instance('b', at(5), at(6)),
+            make_instance('c', at(8), at(20)),
+            make_instance('d', at(30), at(31)),
+        ])
+        self.index = TimeIntervalIndex.from_dataset(self.dataset)
+
+    def test_query_point(self):
+        self.assertEqual(self.index.query_point(at(5, 30))['instance'].tolist(), ['a', 'b'])
+        self.assertEqual(self.index.query_point(at(10))['instance'].tolist(), ['a', 'c'])
+        self.assertTrue(self.index.query_point(at(25)).empty)
+
+    def test_query_range(self):
+        self.assertEqual(self.index.query_range(at(9), at(30))['instance'].tolist(), ['a', 'c', 'd'])
+        self.assertTrue(self.index.query_range(at(21), at(29)).empty)
+
+    def test_overlap_join_matches_pairwise_loop(self):
+        joined = self.index.overlap_join()
+        pairs = sorted(zip(joined['left_instance'], joined['right_instance']))
+        self.assertEqual(pairs, [('a', 'b'), ('a', 'c')])
+
+        row = joined[joined['right_instance'] == 'c'].iloc[0]
+        self.assertEqual(row['overlap_start'], pd.Timestamp(at(8)))
+        self.assertEqual(row['overlap_seconds'], 120.0)
+
+        self.assertEqual(len(self.index.overlap_join(min_overlap=61)), 1)
+
+    def test_overlap_join_with_other_index(self):
+        other = TimeIntervalIndex(pd.DataFrame({
+            'instance': ['x'], 'start': [at(30, 30)], 'stop': [at(40)],
+        }))
+        joined = self.index.overlap_join(other)
+        self.assertEqual(joined['left_instance'].tolist(), ['d'])
+        self.assertEqual(joined['overlap_seconds'].tolist(), [30.0])
+
+    def test_one_long_interval_among_short_ones(self):
+        rng = np.random.default_rng(0)
+        starts = rng.integers(0, 100000, 2000)
+        stops = starts + rng.integers(0, 60, 2000)
+        starts[0], stops[0] = 0, 100000
+        base = pd.Timestamp(at(0))
+        index = TimeIntervalIndex(pd.DataFrame({
+            'instance': [str(i) for i in range(2000)],
+            'start': base + pd.to_timedelta(starts, unit='s'),
+            'stop': base + pd.to_timedelta(stops, unit='s'),
+        }))
+
+        for a, b in [(500, 500), (1000, 1200), (99990, 200000), (-10, -1)]:
+            expected = sorted(str(i) for i in np.nonzero((starts <= b) & (stops >= a))[0])
+            found = index.query_range(base + pd.Timedelta(seconds=a), base + pd.Timedelta(seconds=b))
+            self.assertEqual(sorted(found['instance']), expected)
+
+        joined = index.overlap_join()
+        expected = sum(
+            int(((starts[i + 1:] <= stops[i]) & (stops[i + 1:] >= starts[i])).sum()) for i in range(2000)
+        )
+        self.assertEqual(len(joined), expected)
+        self.assertEqual((joined['left_instance'] == '0').sum() + (joined['right_instance'] == '0').sum(), 1999)
+
+    def test_coverage_from_dataset(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        index = TimeIntervalIndex.coverage_from_dataset(ds)
+
+        modalities = set(index.intervals['modality'])
+        self.assertIn('sensors3', modalities)
+        self.assertIn('geolocation_points', modalities)
+
+        instance = ds.instance
+        gps = index.intervals[index.intervals['modality'] == 'geolocation_points'].iloc[0]
+        hits = index.query_point(gps['start'])
+        self.assertIn('geolocation_points', hits['modality'].tolist())
+
+        media = TimeIntervalIndex.from_dataset(ds)
+        self.assertEqual(media.query_point(instance.media_start_time)['instance'].tolist(), [instance.name])
@@ -0,0 +1,87 @@
+import unittest
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from sideseeing_tools import trajectory
+from sideseeing_tools.sideseeing import SideSeeingDS
+from tests.helpers import LATITUDE, METERS_PER_DEGREE, at, make_instance, walk_north
+
+
+def make_track():
+    # 10 m/s for 10 s, stopped for 20 s, then 5 m/s for 10 s.
+    seconds = np.arange(41)
+    meters = np.concatenate([np.arange(0, 101, 10), np.full(20, 100), 100 + np.arange(5, 51, 5)])
+    return walk_north(seconds, meters)
+
+
+class TestTrajectory(unittest.TestCase):
+    def test_metrics(self):
+        gps = make_track()
+        before = gps.copy()
+        result = trajectory.metrics(gps)
+
+        pd.testing.assert_frame_equal(gps, before)
+        self.assertEqual(result['points'], 41)
+        self.assertAlmostEqual(result['distance_km'], 0.15)
+        self.assertEqual(result['duration'], 40)
+        self.assertEqual(result['stops'], 1)
+        self.assertAlmostEqual(result['stopped_time'], 20)
+        self.assertAlmostEqual(result['moving_time'], 20)
+        self.assertAlmostEqual(result['moving_speed'], 7.5)
+        self.assertAlmostEqual(result['max_speed'], 10)
+
+        self.assertEqual(trajectory.metrics(gps, min_stop_s=30)['stops'], 0)
+
+    def test_trajectory_and_stops(self):
+        track = trajectory.trajectory(make_track())
+
+        np.testing.assert_allclose(track['cumulative_distance'].iloc[[0, 10, 30, 40]], [0, 100, 100, 150])
+        np.testing.assert_allclose(track['speed'].iloc[[5, 35]], [10, 5])
+        self.assertEqual(track['stopped'].sum(), 20)
+        self.assertTrue(track['stopped'].iloc[11:31].all())
+        np.testing.assert_allclose(trajectory.segment_boundaries(track, 40), [0, 40, 80, 120, 150])
+
+        stops = trajectory.stops(make_track())
+        self.assertEqual(len(stops), 1)
+        self.assertEqual(stops['duration'].iloc[0], 20)
+        self.assertEqual(stops['start'].iloc[0], at(10))
+        self.assertAlmostEqual(stops['latitude'].iloc[0], LATITUDE + 100 / METERS_PER_DEGREE)
+
+    def test_missing_and_unsorted_fixes(self):
+        gps = walk_north([2, 0, 1, 3], [20, 0, 10, 30])
+        gps.loc[3, 'latitude'] = np.nan
+        result = trajectory.metrics(gps)
+        self.assertEqual(result['points'], 3)
+        self.assertAlmostEqual(result['distance_km'], 0.02)
+
+        self.assertEqual(trajectory.metrics(None)['distance_km'], 0)
+        self.assertEqual(len(trajectory.stops(walk_north([0], [0]))), 0)
+
+    def test_dataset_metrics(self):
+        instances = [
+            make_instance('a', geolocation_points=make_track()),
+            make_instance('b', geolocation_points=pd.DataFrame()),
+            make_instance('c', geolocation_points=walk_north([0, 10], [5000, 5100])),
+        ]
+        dataset = SimpleNamespace(iterator=iter(instances))
+        table = trajectory.dataset_metrics(dataset)
+
+        self.assertEqual(list(table.index), ['a', 'b', 'c'])
+        self.assertEqual(list(table.columns), trajectory.METRIC_COLUMNS)
+        self.assertAlmostEqual(table.loc['a', 'distance_km'], 0.15)
+        self.assertEqual(table.loc['b', 'points'], 0)
+        self.assertAlmostEqual(table.loc['c', 'distance_km'], 0.1)
+        self.assertAlmostEqual(table.loc['c', 'max_speed'], 10)
+        self.assertEqual(table.loc['a', 'stops'], 1)
+        self.assertEqual(table.loc['c', 'stops'], 0)
+
+    def test_fixture_distance(self):
+        ds = SideSeeingDS('fixtures/dataset', name="Test Dataset")
+        instance = ds.instance
+        table = trajectory.dataset_metrics(ds)
+
+        self.assertAlmostEqual(table.loc[instance.name, 'distance_km'], instance.calculate_sample_distance_traveled())
+        self.assertAlmostEqual(instance.calculate_sample_distance_traveled(), 0.02717043, places=6)
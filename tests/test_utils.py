@@ -1,6 +1,17 @@
 import unittest
 
-from src.sideseeing_tools.utils import parse_wcdma
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from src.sideseeing_tools.utils import (
+    calculate_haversine_distance,
+    haversine_distance,
+    parse_wcdma,
+    resample_instance_sensors,
+    resample_sensor_data,
+)
 
 
 class TestParseWcdma(unittest.TestCase):
@@ -515,4 +526,62 @@ class TestParseWcdma(unittest.TestCase):
             'timestamp': 1609459200000000000
         }
         
-        self.assertEqual(result, expected)
\ No newline at end of file
+        self.assertEqual(result, expected)
+
+
+def reference_resample(data, target_fps):
+    # The original per-second loop.
+    parts = []
+    for second in range(int(data['Time (s)'].max()) + 1):
+        selected = data[(data['Time (s)'] >= second) & (data['Time (s)'] < second + 1)]
+        indices = [int(x) for x in np.linspace(start=0, stop=len(selected) - 1, num=target_fps)]
+        parts.append(selected.iloc[indices])
+    return pd.concat(parts).reset_index(drop=True)
+
+
+class TestResampleSensorData(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        t = np.sort(np.concatenate([rng.uniform(0, 5, 300), np.arange(5) + 0.5]))
+        self.data = pd.DataFrame({'Time (s)': t - t[0], 'x': rng.normal(size=len(t))})
+
+    def test_matches_reference(self):
+        for fps in (1, 2, 29, 30, 60, 200):
+            pd.testing.assert_frame_equal(resample_sensor_data(self.data, fps), reference_resample(self.data, fps))
+
+    def test_repeats_rows_when_second_is_sparse(self):
+        data = pd.DataFrame({'Time (s)': [0.0, 0.5, 1.2], 'x': [1.0, 2.0, 3.0]})
+        resampled = resample_sensor_data(data, target_fps=4)
+        self.assertEqual(resampled['x'].tolist(), [1.0, 1.0, 1.0, 2.0, 3.0, 3.0, 3.0, 3.0])
+
+    def test_skips_empty_seconds(self):
+        data = pd.DataFrame({'Time (s)': [0.0, 0.5, 2.5], 'x': [1.0, 2.0, 3.0]})
+        resampled = resample_sensor_data(data, target_fps=2)
+        self.assertEqual(resampled['x'].tolist(), [1.0, 2.0, 3.0, 3.0])
+
+    def test_batch_mode(self):
+        instance = SimpleNamespace(
+            sensors1={'light': self.data.iloc[::3].reset_index(drop=True)},
+            sensors3={'accelerometer': self.data},
+            sensors6=None,
+        )
+        resampled = resample_instance_sensors(instance, target_fps=10)
+
+        self.assertEqual(resampled['sensors6'], {})
+        pd.testing.assert_frame_equal(resampled['sensors3']['accelerometer'], resample_sensor_data(self.data, 10))
+        pd.testing.assert_frame_equal(resampled['sensors1']['light'], resample_sensor_data(instance.sensors1['light'], 10))
+
+
+class TestHaversineDistance(unittest.TestCase):
+    def test_matches_scalar_version(self):
+        rng = np.random.default_rng(0)
+        lat1, lat2 = rng.uniform(-80, 80, (2, 50))
+        lon1, lon2 = rng.uniform(-180, 180, (2, 50))
+
+        expected = [calculate_haversine_distance(*args) for args in zip(lat1, lon1, lat2, lon2)]
+        np.testing.assert_allclose(haversine_distance(lat1, lon1, lat2, lon2), expected)
+
+    def test_radius_and_broadcasting(self):
+        distance = haversine_distance(0, 0, [0, 1], [1, 0], radius=6371000.0)
+        np.testing.assert_allclose(distance, [111194.93, 111194.93], atol=0.01)
+        self.assertEqual(haversine_distance(-23.5, -46.6, -23.5, -46.6), 0)